@@ -0,0 +1,65 @@
+"""
+Micro-benchmark of the creation of baking objects on configs holding large arbitrary waveforms.
+
+Compares the time to bake a short sequence with the layered local config of `Baking`, and with a deep copy of the
+config as local config, which it replaced. The deep copy is emulated by layering the local config above a copy of the
+config, so that only the cost of the copy differs.
+No OPX is needed: the baked waveforms are only added to the config.
+"""
+
+import copy
+import time
+
+import numpy as np
+
+from qualang_tools.bakery import baking
+from qualang_tools.bakery.bakery import Baking
+
+num_of_waveforms = [0, 10, 50, 200]
+waveform_length = 10_000
+num_of_bakings = 5
+
+
+def make_config(num_wf: int) -> dict:
+    config = {
+        "version": 1,
+        "controllers": {"con1": {"analog_outputs": {1: {"offset": 0.0}}}},
+        "elements": {
+            "qe1": {"singleInput": {"port": ("con1", 1)}, "intermediate_frequency": 0, "operations": {"x": "x_pulse"}}
+        },
+        "pulses": {"x_pulse": {"operation": "control", "length": 40, "waveforms": {"single": "x_wf"}}},
+        "waveforms": {"x_wf": {"type": "constant", "sample": 0.2}},
+    }
+    for i in range(num_wf):
+        config["waveforms"][f"arb_wf_{i}"] = {"type": "arbitrary", "samples": np.random.rand(waveform_length).tolist()}
+        config["pulses"][f"arb_pulse_{i}"] = {
+            "operation": "control",
+            "length": waveform_length,
+            "waveforms": {"single": f"arb_wf_{i}"},
+        }
+        config["elements"]["qe1"]["operations"][f"arb_{i}"] = f"arb_pulse_{i}"
+    return config
+
+
+def baking_latency(config: dict) -> float:
+    start = time.perf_counter()
+    for _ in range(num_of_bakings):
+        with baking(config) as b:
+            b.play("x", "qe1")
+            b.wait(20, "qe1")
+            b.play("x", "qe1", amp=0.5)
+    return (time.perf_counter() - start) / num_of_bakings
+
+
+layered_config = Baking._layered_config
+layered = {n: baking_latency(make_config(n)) for n in num_of_waveforms}
+
+Baking._layered_config = staticmethod(lambda config: layered_config(copy.deepcopy(config)))
+try:
+    deep_copy = {n: baking_latency(make_config(n)) for n in num_of_waveforms}
+finally:
+    Baking._layered_config = staticmethod(layered_config)
+
+print(f"{'arbitrary waveforms':>19} | {'deep copy [ms]':>14} | {'layered [ms]':>12}")
+for n in num_of_waveforms:
+    print(f"{n:>19} | {deep_copy[n] * 1e3:>14.3f} | {layered[n] * 1e3:>12.3f}")
@@ -0,0 +1,59 @@
+"""
+Micro-benchmark of the generation of random two-qubit RB sequences.
+
+Compares the per-sequence latency of `TwoQubitRb._gen_rb_sequence` with the hash indexes used to find the inverting
+symplectic and Pauli gates, and with the linear scans of the gate database they replaced.
+No OPX is needed: the gate generators are empty, so that nothing is baked.
+"""
+
+import random
+import time
+
+import numpy as np
+
+from qualang_tools.characterization.two_qubit_rb import TwoQubitRb
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb import gate_db
+
+depths = [1, 10, 100, 1000]
+num_of_sequences = 200
+
+
+def find_symplectic_gate_id_by_tableau_g_linear(tableau):
+    return next(i for i, x in enumerate(symplectic_tableaus) if np.array_equal(x.g, tableau.g))
+
+
+def find_pauli_gate_id_by_tableau_alpha_linear(tableau):
+    return gate_db._pauli_range[0] + next(
+        i for i, x in enumerate(pauli_tableaus) if np.array_equal(x.alpha, tableau.alpha)
+    )
+
+
+def sequence_latency(rb: TwoQubitRb, depth: int) -> float:
+    random.seed(0)
+    start = time.perf_counter()
+    for _ in range(num_of_sequences):
+        rb._gen_rb_sequence(depth)
+    return (time.perf_counter() - start) / num_of_sequences
+
+
+config = {"version": 1, "controllers": {}, "elements": {}, "pulses": {}, "waveforms": {}}
+rb = TwoQubitRb(config, lambda *args: None, {"CZ": lambda *args: None}, lambda: None, lambda: None)
+rb._gen_rb_sequence(1)  # builds the Clifford tables
+# The tableaus scanned by the linear lookups are built once, outside of the timed loops
+symplectic_tableaus = gate_db.tableaus[gate_db._symplectic_range[0] : gate_db._symplectic_range[1]]
+pauli_tableaus = gate_db.tableaus[gate_db._pauli_range[0] : gate_db._pauli_range[1]]
+
+indexed = {depth: sequence_latency(rb, depth) for depth in depths}
+
+# Instance attributes shadow the indexed lookups of the gate database
+gate_db.find_symplectic_gate_id_by_tableau_g = find_symplectic_gate_id_by_tableau_g_linear
+gate_db.find_pauli_gate_id_by_tableau_alpha = find_pauli_gate_id_by_tableau_alpha_linear
+try:
+    linear = {depth: sequence_latency(rb, depth) for depth in depths}
+finally:
+    del gate_db.find_symplectic_gate_id_by_tableau_g
+    del gate_db.find_pauli_gate_id_by_tableau_alpha
+
+print(f"{'depth':>6} | {'linear scan [ms]':>16} | {'hash index [ms]':>15}")
+for depth in depths:
+    print(f"{depth:>6} | {linear[depth] * 1e3:>16.3f} | {indexed[depth] * 1e3:>15.3f}")
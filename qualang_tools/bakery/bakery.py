@@ -3,12 +3,13 @@ Author: Arthur Strauss - Quantum Machines
 Created: 23/02/2021
 """
 
+import hashlib
+from collections import ChainMap
 from typing import List, Union, Tuple, Dict, Optional, Set
 from warnings import warn
 
 import numpy as np
 from qm import qua
-import copy
 from scipy.interpolate import interp1d
 
 
@@ -18,6 +19,7 @@ def baking(
     override=False,
     baking_index: int = None,
     sampling_rate: Union[int, float] = 1e9,
+    deduplicate_waveforms: bool = False,
 ):
     """
     Opens a context manager to synthesize samples for arbitrary waveforms. The input config is updated, unless a
@@ -40,10 +42,228 @@ def baking(
             cubic interpolation is done to provide a new waveform at the OPX sampling rate. If the sampling rate is
             lower, the sampling rate argument is added to the waveform in the config, causing the OPX to interpolate
             in real time.
+    :param deduplicate_waveforms: If True, the baked waveforms are named after a hash of their samples and a waveform
+            identical to one already baked into the same config is reused instead of being added again
+            (default set to False). Not available for overridable waveforms.
+            Statistics are available through get_waveform_registry(config).
 
 
     """
-    return Baking(config, padding_method, override, baking_index, sampling_rate)
+    return Baking(config, padding_method, override, baking_index, sampling_rate, deduplicate_waveforms)
+
+
+class WaveformRegistry:
+    """
+    Registry of the content-addressed baked waveforms of a config, shared by all the baking objects updating this
+    config with ``deduplicate_waveforms=True``. It keeps track of how many baked pulses use each waveform, so that a
+    shared waveform is only removed from the config once no baked pulse refers to it anymore.
+    Waveforms which were already in the config before being reused are pinned: their other users are unknown, so they
+    are never removed.
+    """
+
+    def __init__(self):
+        self._users: Dict[str, int] = {}
+        self._pinned: Set[str] = set()
+        self.saved_waveforms = 0
+        self.saved_bytes = 0
+
+    @staticmethod
+    def _waveform_name(waveform: Dict, samples: np.ndarray) -> str:
+        digest = hashlib.blake2b(samples.tobytes(), digest_size=12)
+        digest.update(str(waveform.get("sampling_rate")).encode())
+        return f"baked_wf_{digest.hexdigest()}"
+
+    def add(self, waveforms: Dict, waveform: Dict, samples: np.ndarray) -> str:
+        """
+        Adds a waveform to the waveforms of the config, unless an identical one is already present
+
+        :param waveforms: "waveforms" entry of the config
+        :param waveform: waveform to be added
+        :param samples: baked samples of the waveform as float64 array
+        :return: name of the waveform in the config
+        """
+        name = self._waveform_name(waveform, samples)
+        while name in waveforms and waveforms[name]["samples"] != waveform["samples"]:  # Hash collision
+            name += "_"
+        if name not in waveforms:
+            waveforms[name] = waveform
+            self._users[name] = 1
+        else:
+            if name in self._users:
+                self._users[name] += 1
+            else:
+                self._pinned.add(name)
+            self.saved_waveforms += 1
+            self.saved_bytes += samples.nbytes
+        return name
+
+    def release(self, waveforms: Dict, name: str) -> None:
+        """
+        Releases a waveform used by a deleted baked pulse, and removes it from the config if it is not used anymore
+
+        :param waveforms: "waveforms" entry of the config
+        :param name: name of the waveform in the config
+        """
+        if name not in self._users:
+            return
+        self._users[name] -= 1
+        if self._users[name] <= 0:
+            del self._users[name]
+            waveforms.pop(name, None)
+
+    def __len__(self) -> int:
+        return len(self._users) + len(self._pinned)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        :return: Number of registered waveforms, and number of waveforms and bytes (float64 samples) saved by reusing
+            existing waveforms
+        """
+        return {
+            "unique_waveforms": len(self),
+            "saved_waveforms": self.saved_waveforms,
+            "saved_bytes": self.saved_bytes,
+        }
+
+
+class _BakingIndex:
+    """
+    Index of the baked operations of a config, kept alongside the config and updated by the baking objects, so that
+    allocating a new baking index or retrieving a length constraint does not require scanning the whole config.
+    The config is only scanned once, when the index is created. Baked operations added to the config by other means
+    afterwards are not tracked.
+    """
+
+    def __init__(self, config: Dict):
+        # Kept to recognize the config, since a plain dict can not be weakly referenced and ids can be reused
+        self._elements = config["elements"]
+        self._op_elements: Dict[int, Set[str]] = {}
+        self._pulse_lengths: Dict[int, Dict[str, int]] = {}
+        self.next_index = 0
+        self.waveform_registry = WaveformRegistry()
+        for qe, element in config["elements"].items():
+            for op in element["operations"]:
+                if op.find("baked") != -1:
+                    self._op_elements.setdefault(int(op.split("_")[-1]), set()).add(qe)
+        for pulse, pulse_dict in config["pulses"].items():
+            _, sep, index = pulse.rpartition("_baked_pulse_")
+            if sep and index.isdigit():
+                self._pulse_lengths.setdefault(int(index), {})[pulse] = pulse_dict["length"]
+        if self._op_elements:
+            self.next_index = max(self._op_elements) + 1
+
+    def is_index_of(self, config: Dict) -> bool:
+        return self._elements is config["elements"]
+
+    def add_op(self, index: int, qe: str, length: int) -> None:
+        self._op_elements.setdefault(index, set()).add(qe)
+        self._pulse_lengths.setdefault(index, {})[f"{qe}_baked_pulse_{index}"] = length
+        self.next_index = max(self.next_index, index + 1)
+
+    def remove_op(self, index: int, qe: str) -> None:
+        self._pulse_lengths.get(index, {}).pop(f"{qe}_baked_pulse_{index}", None)
+        self._op_elements.get(index, set()).discard(qe)
+        if index in self._op_elements and not self._op_elements[index]:
+            del self._op_elements[index]
+            if index == self.next_index - 1:
+                self.next_index = max(self._op_elements, default=-1) + 1
+
+    def constraint_length(self, index: int) -> int:
+        return max(self._pulse_lengths.get(index, {}).values(), default=0)
+
+
+_MAX_INDEXED_CONFIGS = 32
+_baking_indices: Dict[int, _BakingIndex] = {}
+
+
+def _get_baking_index(config: Dict) -> _BakingIndex:
+    index = _baking_indices.pop(id(config), None)
+    if index is None or not index.is_index_of(config):
+        index = _BakingIndex(config)
+    _baking_indices[id(config)] = index  # Most recently used configs are kept at the end
+    if len(_baking_indices) > _MAX_INDEXED_CONFIGS:
+        # Indices owning deduplicated waveforms are kept, since their usage counts can not be rebuilt from the config
+        evictable = (key for key, idx in _baking_indices.items() if key != id(config) and not idx.waveform_registry)
+        key = next(evictable, None)
+        if key is not None:
+            del _baking_indices[key]
+    return index
+
+
+def get_waveform_registry(config: Dict) -> WaveformRegistry:
+    """
+    Returns the waveform registry shared by all the baking objects deduplicating their waveforms into config
+
+    :param config: config file
+    """
+    return _get_baking_index(config).waveform_registry
+
+
+class _SampleBuffer:
+    """
+    Growable float64 buffer storing the samples baked on one analog input of a quantum element.
+    Memory is over-allocated geometrically so that appending samples is amortized O(1), and all sample manipulations
+    (frame rotation, amplitude mixing, overlapping additions) can be done as vectorized NumPy operations on the view
+    returned by the ``array`` property.
+    """
+
+    _MIN_CAPACITY = 64
+
+    def __init__(self):
+        self._data = np.zeros(self._MIN_CAPACITY)
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        View on the samples currently stored in the buffer (writing to it modifies the buffer)
+        """
+        return self._data[: self._len]
+
+    def _reserve(self, length: int) -> None:
+        if length > len(self._data):
+            data = np.zeros(max(length, 2 * len(self._data)))
+            data[: self._len] = self._data[: self._len]
+            self._data = data
+
+    def append(self, values: np.ndarray) -> None:
+        new_len = self._len + len(values)
+        self._reserve(new_len)
+        self._data[self._len : new_len] = values
+        self._len = new_len
+
+    def append_zeros(self, duration: int) -> None:
+        new_len = self._len + duration
+        self._reserve(new_len)
+        self._data[self._len : new_len] = 0.0
+        self._len = new_len
+
+    def delete(self, start: int, stop: Optional[int] = None) -> None:
+        """
+        Delete samples with the same semantics as ``del samples[start:stop]`` on a Python list
+        """
+        start, stop, _ = slice(start, stop).indices(self._len)
+        if stop > start:
+            self._data[start : self._len - (stop - start)] = self._data[stop : self._len]
+            self._len -= stop - start
+
+    def set(self, values: np.ndarray) -> None:
+        self._len = 0
+        self.append(values)
+
+    def rotate(self, index: int) -> None:
+        """
+        Rotate the samples so that the buffer reads ``samples[index:] + samples[:index]``
+        """
+        samples = self.array
+        self.set(np.concatenate((samples[index:], samples[:index])))
+
+    def tolist(self) -> List[float]:
+        return self.array.tolist()
 
 
 class Baking:
@@ -54,6 +274,7 @@ class Baking:
         override: bool = False,
         baking_index: int = None,
         sampling_rate: Union[int, float] = 1e9,
+        deduplicate_waveforms: bool = False,
     ):
         self._config = config
         if baking_index is not None:
@@ -61,7 +282,7 @@ class Baking:
         else:
             self.update_config = True
         self._padding_method = padding_method
-        self._local_config = copy.deepcopy(config)
+        self._local_config = self._layered_config(config)
         self.sampling_rate = int(sampling_rate)
         (
             self._samples_dict,
@@ -75,6 +296,9 @@ class Baking:
             raise ValueError(
                 "Waveform can not be simultaneously overridable and compressed with lower than 1e9" "sampling rate"
             )
+        if deduplicate_waveforms and override:
+            raise ValueError("Overridable waveforms can not be deduplicated")
+        self._deduplicate_waveforms = deduplicate_waveforms
         self.length_constraint = self._retrieve_constraint_length(baking_index)
         self.override_waveforms_dict = {"waveforms": {}}
         self._out = True
@@ -106,16 +330,34 @@ class Baking:
     def config(self) -> Dict:
         return self._config
 
+    @property
+    def _index(self) -> _BakingIndex:
+        return _get_baking_index(self._config)
+
+    @property
+    def _waveform_registry(self) -> Optional[WaveformRegistry]:
+        return self._index.waveform_registry if self._deduplicate_waveforms else None
+
+    @staticmethod
+    def _layered_config(config: Dict) -> Dict:
+        """
+        Creates a local view of the config in which the operations, pulses and waveforms added with add_op (and
+        digital waveforms added with add_digital_waveform) are stored in an overlay above the shared config,
+        instead of copying it.
+        """
+        return {
+            "elements": {
+                qe: ChainMap({"operations": ChainMap({}, element["operations"])}, element)
+                for qe, element in config["elements"].items()
+            },
+            "pulses": ChainMap({}, config["pulses"]),
+            "waveforms": ChainMap({}, config["waveforms"]),
+            "digital_waveforms": ChainMap({}, config.get("digital_waveforms", {})),
+        }
+
     def _find_baking_index(self, baking_index: int = None) -> int:
         if baking_index is None:
-            max_index = [-1]
-            for qe in self._config["elements"].keys():
-                index = [-1]
-                for op in self._config["elements"][qe]["operations"]:
-                    if op.find("baked") != -1:
-                        index.append(int(op.split("_")[-1]))
-                max_index.append(max(index))
-            return max(max_index) + 1
+            return self._index.next_index
         else:
             return baking_index
 
@@ -131,52 +373,65 @@ class Baking:
                 "time_track": 0,  # Value used for negative waits, to know where to add the samples (negative int)
             }
             if any([key in self._local_config["elements"][qe] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
-                sample_dict[qe] = {"I": [], "Q": []}
+                sample_dict[qe] = {"I": _SampleBuffer(), "Q": _SampleBuffer()}
 
             elif "singleInput" in self._local_config["elements"][qe]:
-                sample_dict[qe] = {"single": []}
+                sample_dict[qe] = {"single": _SampleBuffer()}
             digit_samples_dict[qe] = []
 
         return sample_dict, qe_dict, digit_samples_dict
 
+    def _add_waveform(self, name: str, samples: List[float], samples_array: np.ndarray) -> str:
+        waveform = {
+            "type": "arbitrary",
+            "samples": samples,
+            "is_overridable": self.override,
+        }
+        if self.sampling_rate < int(1e9):
+            waveform["sampling_rate"] = self.sampling_rate
+        if self._waveform_registry is not None:
+            return self._waveform_registry.add(self._config["waveforms"], waveform, samples_array)
+        self._config["waveforms"][name] = waveform
+        return name
+
+    def _remove_waveforms(self, pulse: str) -> None:
+        for wf in self._config["pulses"][pulse]["waveforms"].values():
+            if self._waveform_registry is not None:
+                self._waveform_registry.release(self._config["waveforms"], wf)
+            else:
+                del self._config["waveforms"][wf]
+
     def _update_config(self, qe, qe_samples) -> None:
         # Generates new Op, pulse, and waveform for each qe to be added in the original config file
-        self._config["elements"][qe]["operations"][f"baked_Op_{self._ctr}"] = f"{qe}_baked_pulse_{self._ctr}"
+        pulse = f"{qe}_baked_pulse_{self._ctr}"
+        if self._waveform_registry is not None and pulse in self._config["pulses"]:
+            # Previous content of this baking object (when re-entering the context manager)
+            self._remove_waveforms(pulse)
+        self._config["elements"][qe]["operations"][f"baked_Op_{self._ctr}"] = pulse
+        self._index.add_op(self._ctr, qe, len(next(iter(qe_samples.values()))))
         if "I" in qe_samples:
-            self._config["pulses"][f"{qe}_baked_pulse_{self._ctr}"] = {
+            self._config["pulses"][pulse] = {
                 "operation": "control",
                 "length": len(qe_samples["I"]),
                 "waveforms": {
-                    "I": f"{qe}_baked_wf_I_{self._ctr}",
-                    "Q": f"{qe}_baked_wf_Q_{self._ctr}",
+                    "I": self._add_waveform(
+                        f"{qe}_baked_wf_I_{self._ctr}", qe_samples["I"], self._samples_dict[qe]["I"].array
+                    ),
+                    "Q": self._add_waveform(
+                        f"{qe}_baked_wf_Q_{self._ctr}", qe_samples["Q"], self._samples_dict[qe]["Q"].array
+                    ),
                 },
             }
-            self._config["waveforms"][f"{qe}_baked_wf_I_{self._ctr}"] = {
-                "type": "arbitrary",
-                "samples": qe_samples["I"],
-                "is_overridable": self.override,
-            }
-            self._config["waveforms"][f"{qe}_baked_wf_Q_{self._ctr}"] = {
-                "type": "arbitrary",
-                "samples": qe_samples["Q"],
-                "is_overridable": self.override,
-            }
-            if self.sampling_rate < int(1e9):
-                self._config["waveforms"][f"{qe}_baked_wf_I_{self._ctr}"]["sampling_rate"] = self.sampling_rate
-                self._config["waveforms"][f"{qe}_baked_wf_Q_{self._ctr}"]["sampling_rate"] = self.sampling_rate
         elif "single" in qe_samples:
-            self._config["pulses"][f"{qe}_baked_pulse_{self._ctr}"] = {
+            self._config["pulses"][pulse] = {
                 "operation": "control",
                 "length": len(qe_samples["single"]),
-                "waveforms": {"single": f"{qe}_baked_wf_{self._ctr}"},
-            }
-            self._config["waveforms"][f"{qe}_baked_wf_{self._ctr}"] = {
-                "type": "arbitrary",
-                "samples": qe_samples["single"],
-                "is_overridable": self.override,
+                "waveforms": {
+                    "single": self._add_waveform(
+                        f"{qe}_baked_wf_{self._ctr}", qe_samples["single"], self._samples_dict[qe]["single"].array
+                    )
+                },
             }
-            if self.sampling_rate < int(1e9):
-                self._config["waveforms"][f"{qe}_baked_wf_{self._ctr}"]["sampling_rate"] = self.sampling_rate
 
         if len(self._digital_samples_dict[qe]) != 0:
             self._config["pulses"][f"{qe}_baked_pulse_{self._ctr}"][
@@ -207,29 +462,15 @@ class Baking:
             if self._qe_dict[qe]["time"] > 0:  # Check if sample was added to the quantum element
                 # otherwise we do not add any Op
                 self._qe_set.add(qe)
-                qe_samples = self._samples_dict[qe]
+                qe_buffers = self._samples_dict[qe]
                 if self.sampling_rate > int(1e9):
-                    if any([key in elements[qe] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
-                        y1 = qe_samples["I"]
-                        y2 = qe_samples["Q"]
-                        dt = 1e9 / self.sampling_rate
-                        max_t = len(y1) * dt
-                        x = np.arange(0, max_t - dt / 2, dt)
-                        f1 = interp1d(x, y1, "cubic")
-                        f2 = interp1d(x, y2, "cubic")
-                        x_new = np.arange(0, int(max_t))
-                        self._qe_dict[qe]["time"] = int(max_t)
-                        qe_samples["I"] = list(f1(x_new))
-                        qe_samples["Q"] = list(f2(x_new))
-                    elif "singleInput" in elements[qe]:
-                        y = qe_samples["single"]
-                        dt = 1e9 / self.sampling_rate
-                        max_t = len(y) * dt
-                        x = np.arange(0, max_t - dt / 2, dt)
-                        f = interp1d(x, y, "cubic")
-                        x_new = np.arange(0, int(max_t))
-                        self._qe_dict[qe]["time"] = int(max_t)
-                        qe_samples["single"] = list(f(x_new))
+                    dt = 1e9 / self.sampling_rate
+                    max_t = len(next(iter(qe_buffers.values()))) * dt
+                    x = np.arange(0, max_t - dt / 2, dt)
+                    x_new = np.arange(0, int(max_t))
+                    for buffer in qe_buffers.values():
+                        buffer.set(interp1d(x, buffer.array, "cubic")(x_new))
+                    self._qe_dict[qe]["time"] = int(max_t)
 
                 if self.length_constraint is not None:
                     assert self._qe_dict[qe]["time"] <= self.length_constraint, (
@@ -246,10 +487,8 @@ class Baking:
                     self.wait(4 - self._qe_dict[qe]["time"] % 4, qe)
 
                 end_samples = 0
-                if any([key in elements[qe] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
-                    end_samples = len(qe_samples["I"]) - wait_duration
-                elif "singleInput" in elements[qe]:
-                    end_samples = len(qe_samples["single"]) - wait_duration
+                if qe_buffers:
+                    end_samples = len(next(iter(qe_buffers.values()))) - wait_duration
 
                 # Padding done according to desired method, can be either right, left, symmetric left or symmetric right
                 if self._padding_method == "right":
@@ -265,48 +504,21 @@ class Baking:
                         )
 
                 elif self._padding_method == "left":
-                    if any([key in elements[qe] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
-                        qe_samples["I"] = qe_samples["I"][end_samples:] + qe_samples["I"][0:end_samples]
-                        qe_samples["Q"] = qe_samples["Q"][end_samples:] + qe_samples["Q"][0:end_samples]
-                    elif "singleInput" in elements[qe]:
-                        qe_samples["single"] = qe_samples["single"][end_samples:] + qe_samples["single"][0:end_samples]
+                    for buffer in qe_buffers.values():
+                        buffer.rotate(end_samples)
 
                 elif self._padding_method == "symmetric_l" or (
                     self._padding_method == "symmetric_r" and wait_duration % 2 == 0
                 ):
-                    if any([key in elements[qe] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
-                        qe_samples["I"] = (
-                            qe_samples["I"][end_samples + wait_duration // 2 :]
-                            + qe_samples["I"][0 : end_samples + wait_duration // 2]
-                        )
-
-                        qe_samples["Q"] = (
-                            qe_samples["Q"][end_samples + wait_duration // 2 :]
-                            + qe_samples["Q"][0 : end_samples + wait_duration // 2]
-                        )
-
-                    elif "singleInput" in elements[qe]:
-                        qe_samples["single"] = (
-                            qe_samples["single"][end_samples + wait_duration // 2 :]
-                            + qe_samples["single"][0 : end_samples + wait_duration // 2]
-                        )
+                    for buffer in qe_buffers.values():
+                        buffer.rotate(end_samples + wait_duration // 2)
 
                 elif self._padding_method == "symmetric_r" and wait_duration % 2 != 0:
-                    if any([key in elements[qe] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
-                        qe_samples["I"] = (
-                            qe_samples["I"][end_samples + wait_duration // 2 + 1 :]
-                            + qe_samples["I"][0 : end_samples + wait_duration // 2 + 1]
-                        )
-                        qe_samples["Q"] = (
-                            qe_samples["Q"][end_samples + wait_duration // 2 + 1 :]
-                            + qe_samples["Q"][0 : end_samples + wait_duration // 2 + 1]
-                        )
-                    elif "singleInput" in elements[qe]:
-                        qe_samples["single"] = (
-                            qe_samples["single"][end_samples + wait_duration // 2 + 1 :]
-                            + qe_samples["single"][0 : end_samples + wait_duration // 2 + 1]
-                        )
+                    for buffer in qe_buffers.values():
+                        buffer.rotate(end_samples + wait_duration // 2 + 1)
 
+                # Python lists are only generated once the final samples are known, to be inserted in the config
+                qe_samples = {key: buffer.tolist() for key, buffer in qe_buffers.items()}
                 if self.update_config:
                     self._update_config(qe, qe_samples)
 
@@ -320,11 +532,11 @@ class Baking:
     def is_out(self):
         return self._out
 
-    def _get_samples(self, pulse: str) -> Union[List[float], List[List[float]]]:
+    def _get_samples(self, pulse: str) -> Union[np.ndarray, List[np.ndarray]]:
         """
         Returns samples associated with a pulse
         :param pulse:
-        :returns: Python list containing samples, [samples_I, samples_Q] in case of mixInputs
+        :returns: NumPy array containing samples, [samples_I, samples_Q] in case of mixInputs
         """
 
         try:
@@ -338,54 +550,54 @@ class Baking:
                 if "single" in self._local_config["pulses"][pulse]["waveforms"]:
                     wf = pulses[pulse]["waveforms"]["single"]
                     if waveforms[wf]["type"] == "constant":
-                        return [waveforms[wf]["sample"]] * len_t
+                        return np.full(len_t, waveforms[wf]["sample"])
                     else:
                         y = waveforms[wf]["samples"]
                         x = np.arange(0, len(y))
                         f = interp1d(x, y, "cubic", fill_value="extrapolate")
                         x_new = np.arange(0, orig_max_t, dt)
-                        return list(f(x_new))
+                        return f(x_new)
 
                 elif "I" in pulses[pulse]["waveforms"]:
                     wf_I = pulses[pulse]["waveforms"]["I"]
                     wf_Q = pulses[pulse]["waveforms"]["Q"]
                     if waveforms[wf_I]["type"] == "constant":
-                        samples_I = [waveforms[wf_I]["sample"]] * len_t
+                        samples_I = np.full(len_t, waveforms[wf_I]["sample"])
                     else:
                         y1 = waveforms[wf_I]["samples"]
                         x1 = np.arange(0, len(y1))
                         f1 = interp1d(x1, y1, "cubic", fill_value="extrapolate")
                         x_new1 = np.arange(0, orig_max_t, dt)
-                        samples_I = list(f1(x_new1))
+                        samples_I = f1(x_new1)
 
                     if waveforms[wf_Q]["type"] == "constant":
-                        samples_Q = [waveforms[wf_Q]["sample"]] * len_t
+                        samples_Q = np.full(len_t, waveforms[wf_Q]["sample"])
                     else:
                         y2 = waveforms[wf_Q]["samples"]
                         x2 = np.arange(0, len(y2))
                         f2 = interp1d(x2, y2, "cubic", fill_value="extrapolate")
                         x_new2 = np.arange(0, orig_max_t, dt)
-                        samples_Q = list(f2(x_new2))
+                        samples_Q = f2(x_new2)
                     return [samples_I, samples_Q]
 
             else:
                 if "single" in pulses[pulse]["waveforms"]:
                     wf = pulses[pulse]["waveforms"]["single"]
                     if waveforms[wf]["type"] == "constant":
-                        return [waveforms[wf]["sample"]] * pulses[pulse]["length"]
+                        return np.full(pulses[pulse]["length"], waveforms[wf]["sample"])
                     else:
-                        return list(waveforms[wf]["samples"])
+                        return np.asarray(waveforms[wf]["samples"])
                 elif "I" in pulses[pulse]["waveforms"]:
                     wf_I = pulses[pulse]["waveforms"]["I"]
                     wf_Q = pulses[pulse]["waveforms"]["Q"]
                     if waveforms[wf_I]["type"] == "constant":
-                        samples_I = [waveforms[wf_I]["sample"]] * pulses[pulse]["length"]
+                        samples_I = np.full(pulses[pulse]["length"], waveforms[wf_I]["sample"])
                     else:
-                        samples_I = list(waveforms[wf_I]["samples"])
+                        samples_I = np.asarray(waveforms[wf_I]["samples"])
                     if waveforms[wf_Q]["type"] == "constant":
-                        samples_Q = [waveforms[wf_Q]["sample"]] * pulses[pulse]["length"]
+                        samples_Q = np.full(pulses[pulse]["length"], waveforms[wf_Q]["sample"])
                     else:
-                        samples_Q = list(waveforms[wf_Q]["samples"])
+                        samples_Q = np.asarray(waveforms[wf_Q]["samples"])
                     return [samples_I, samples_Q]
 
         except KeyError:
@@ -421,7 +633,7 @@ class Baking:
 
     def _get_pulse_index(self, qe) -> int:
         index = 0
-        for pulse in self._local_config["pulses"]:
+        for pulse in self._local_config["pulses"].maps[0]:  # Pulses added locally with add_op
             if pulse.find(f"{qe}_baked_pulse_b{self._ctr}") != -1:
                 index += 1
         return index
@@ -483,7 +695,7 @@ class Baking:
                     if t_start_internal < ref_length:
                         self._update_qe_time(qe_internal, t_start_internal)
                         for i in input_type:
-                            del self._samples_dict[qe_internal][i][t_start_internal:]
+                            self._samples_dict[qe_internal][i].delete(t_start_internal)
                     else:
                         raise ValueError("Desired deletion exceeds current waveform length")
                 else:
@@ -498,7 +710,7 @@ class Baking:
 
                     self._update_qe_time(qe_internal, t_start_internal - t_stop_internal)
                     for i in input_type:
-                        del self._samples_dict[qe_internal][i][t_start_internal:t_stop_internal]
+                        self._samples_dict[qe_internal][i].delete(t_start_internal, t_stop_internal)
 
         if not self._out:
             if qe is not None:
@@ -530,12 +742,9 @@ class Baking:
                 if self._out:
                     if f"baked_Op_{self._ctr}" in self.config["elements"][q]["operations"]:
                         del self.config["elements"][q]["operations"][f"baked_Op_{self._ctr}"]
+                        self._remove_waveforms(f"{q}_baked_pulse_{self._ctr}")
                         del self.config["pulses"][f"{q}_baked_pulse_{self._ctr}"]
-                        if any([key in self.config["elements"][q] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
-                            del self.config["waveforms"][f"{q}_baked_wf_I_{self._ctr}"]
-                            del self.config["waveforms"][f"{q}_baked_wf_Q_{self._ctr}"]
-                        elif "singleInput" in self.config["elements"][q]:
-                            del self.config["waveforms"][f"{q}_baked_wf_{self._ctr}"]
+                        self._index.remove_op(self._ctr, q)
                         if "digital_waveforms" in self._config:
                             if f"{q}_baked_digital_wf_{self._ctr}" in self._config["digital_waveforms"]:
                                 del self.config["digital_waveforms"][f"{q}_baked_digital_wf_{self._ctr}"]
@@ -581,10 +790,7 @@ class Baking:
                 if not (qe in self._qe_set):
                     raise KeyError(f"{qe} is not in the set of quantum elements of the baking object ")
                 else:
-                    if any([key in self._config["elements"][qe] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
-                        return len(self._config["waveforms"][f"{qe}_baked_wf_I_{self._ctr}"]["samples"])
-                    else:
-                        return len(self._config["waveforms"][f"{qe}_baked_wf_{self._ctr}"]["samples"])
+                    return self._config["pulses"][f"{qe}_baked_pulse_{self._ctr}"]["length"]
             else:
                 return self.get_current_length(qe)
 
@@ -604,11 +810,7 @@ class Baking:
         :param name: name of the digital waveform
         :param digital_samples: samples used to generate digital_waveform
         """
-        if "digital_waveforms" in self._local_config:
-            self._local_config["digital_waveforms"][name] = {"samples": digital_samples}
-        else:
-            self._local_config["digital_waveforms"] = {}
-            self._local_config["digital_waveforms"][name] = {"samples": digital_samples}
+        self._local_config["digital_waveforms"][name] = {"samples": digital_samples}
 
     def add_Op(
         self,
@@ -701,6 +903,31 @@ class Baking:
         self._local_config["waveforms"].update(waveform)
         self._local_config["elements"][qe]["operations"].update(Op)
 
+    @staticmethod
+    def _as_single_samples(samples, qe: str) -> np.ndarray:
+        samples = np.asarray(samples)
+        assert samples.ndim == 1 and (
+            samples.dtype.kind in "biuf"
+        ), f"{qe} is a singleInput element, list of numbers (int or float) should be provided "
+        return samples
+
+    @staticmethod
+    def _mix_amplitude(I: np.ndarray, Q: np.ndarray, amp: Union[float, Tuple[float]]) -> Tuple[np.ndarray, np.ndarray]:
+        if type(amp) is float or type(amp) is int:
+            return amp * I, amp * Q
+        elif len(amp) != 4 or type(amp) is not tuple:
+            raise IndexError("Amplitudes provided must be stored in a tuple (v00, v01, v10, v11)")
+        else:
+            return amp[0] * I + amp[1] * Q, amp[2] * I + amp[3] * Q
+
+    @staticmethod
+    def _rotate_frame(
+        I: np.ndarray, Q: np.ndarray, freq: float, phi: float, t: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        phase = freq * t * 1e-9 + phi
+        cos, sin = np.cos(phase), np.sin(phase)
+        return cos * I - sin * Q, sin * I + cos * Q
+
     def play(self, Op: str, qe: str, amp: Union[float, Tuple[float]] = 1.0) -> None:
         """
         Add a pulse to the baked sequence
@@ -723,43 +950,23 @@ class Baking:
                         samples, list
                     ), f"{qe} is a mixInputs/RF_inputs element, two lists should be provided"
                     assert len(samples) == 2, f"{qe} is a mixInputs/RF_inputs element, two lists should be provided"
-                    assert type(samples[0] == list) and type(
-                        samples[1] == list
-                    ), f"{qe} is a mixInputs/RF_inputs element, two lists should be provided"
 
                     assert len(samples[0]) == len(samples[1]), (
                         f"Error : samples provided for I and Q do not have the same length. length I: {len(samples[0])}"
                         f", length Q: {len(samples[1])}"
                     )
 
-                    I = samples[0]
-                    Q = samples[1]
-                    I2 = [None] * len(I)
-                    Q2 = [None] * len(Q)
-                    I3 = [None] * len(I)
-                    Q3 = [None] * len(Q)
-
-                    for i in range(len(I)):
-                        if type(amp) is float or type(amp) is int:
-                            I2[i] = amp * I[i]
-                            Q2[i] = amp * Q[i]
-                        elif len(amp) != 4 or type(amp) is not tuple:
-                            raise IndexError("Amplitudes provided must be stored in a tuple (v00, v01, v10, v11)")
-                        else:
-                            I2[i] = amp[0] * I[i] + amp[1] * Q[i]
-                            Q2[i] = amp[2] * I[i] + amp[3] * Q[i]
-                        I3[i] = np.cos(freq * i * 1e-9 + phi) * I2[i] - np.sin(freq * i * 1e-9 + phi) * Q2[i]
-                        Q3[i] = np.sin(freq * i * 1e-9 + phi) * I2[i] + np.cos(freq * i * 1e-9 + phi) * Q2[i]
-                        self._samples_dict[qe]["I"].append(I3[i])
-                        self._samples_dict[qe]["Q"].append(Q3[i])
-                    self._update_qe_time(qe, len(I))
+                    I2, Q2 = self._mix_amplitude(np.asarray(samples[0]), np.asarray(samples[1]), amp)
+                    I3, Q3 = self._rotate_frame(I2, Q2, freq, phi, np.arange(len(I2)))
+                    self._samples_dict[qe]["I"].append(I3)
+                    self._samples_dict[qe]["Q"].append(Q3)
+                    self._update_qe_time(qe, len(I3))
 
                 elif "singleInput" in self._local_config["elements"][qe]:
-                    for i in range(len(samples)):
-                        assert isinstance(
-                            samples[i], (float, int)
-                        ), f"{qe} is a singleInput element, list of numbers (int or float) should be provided "
-                        self._samples_dict[qe]["single"].append(amp * np.cos(freq * i * 1e-9 + phi) * samples[i])
+                    samples = self._as_single_samples(samples, qe)
+                    self._samples_dict[qe]["single"].append(
+                        amp * np.cos(freq * np.arange(len(samples)) * 1e-9 + phi) * samples
+                    )
                     self._update_qe_time(qe, len(samples))
 
                 else:
@@ -808,72 +1015,42 @@ class Baking:
             try:
                 pulse = self._local_config["elements"][qe]["operations"][Op]
                 samples = self._get_samples(pulse)
-                new_samples = 0
                 if any([key in self._local_config["elements"][qe] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
                     assert isinstance(
                         samples, list
                     ), f"{qe} is a mixInputs/RF_inputs element, two lists should be provided"
                     assert len(samples) == 2, f"{qe} is a mixInputs/RF_inputs element, two lists should be provided"
-                    assert type(samples[0] == list) and type(samples[1] == list), (
-                        f"{qe} is a mixInputs/RF_inputs element, " f"two lists should be provided"
-                    )
 
                     assert len(samples[0]) == len(
                         samples[1]
                     ), "Error : samples provided for I and Q do not have the same length"
 
-                    I, Q = samples[0], samples[1]
-                    I2, Q2, I3, Q3 = (
-                        [None] * len(I),
-                        [None] * len(I),
-                        [None] * len(I),
-                        [None] * len(I),
+                    I2, Q2 = self._mix_amplitude(np.asarray(samples[0]), np.asarray(samples[1]), amp)
+                    # Samples overlapping the existing waveform are added to it, the remaining ones are appended
+                    buffer_I, buffer_Q = self._samples_dict[qe]["I"], self._samples_dict[qe]["Q"]
+                    n_overlap = min(len(I2), len(buffer_I) - t)
+                    I3, Q3 = self._rotate_frame(I2[:n_overlap], Q2[:n_overlap], freq, phi, t + np.arange(n_overlap))
+                    buffer_I.array[t : t + n_overlap] += I3
+                    buffer_Q.array[t : t + n_overlap] += Q3
+                    I3, Q3 = self._rotate_frame(
+                        I2[n_overlap:], Q2[n_overlap:], freq, phi, np.arange(n_overlap, len(I2))
                     )
-                    for i in range(len(I)):
-                        if type(amp) is float or type(amp) is int:
-                            I2[i] = amp * I[i]
-                            Q2[i] = amp * Q[i]
-                        else:
-                            if len(amp) != 4 or type(amp) is not tuple:
-                                raise IndexError("Amplitudes provided must be stored in a tuple (v00, v01, v10, v11)")
-                            else:
-                                I2[i] = amp[0] * I[i] + amp[1] * Q[i]
-                                Q2[i] = amp[2] * I[i] + amp[3] * Q[i]
-                        if t + i < len(self._samples_dict[qe]["I"]):
-                            I3[i] = (
-                                np.cos(freq * (t + i) * 1e-9 + phi) * I2[i]
-                                - np.sin(freq * (t + i) * 1e-9 + phi) * Q2[i]
-                            )
-                            Q3[i] = (
-                                np.sin(freq * (t + i) * 1e-9 + phi) * I2[i]
-                                + np.cos(freq * (t + i) * 1e-9 + phi) * Q2[i]
-                            )
-
-                            self._samples_dict[qe]["I"][t + i] += I3[i]
-                            self._samples_dict[qe]["Q"][t + i] += Q3[i]
-                        else:
-                            I3[i] = np.cos(freq * i * 1e-9 + phi) * I2[i] - np.sin(freq * i * 1e-9 + phi) * Q2[i]
-                            Q3[i] = np.sin(freq * i * 1e-9 + phi) * I2[i] + np.cos(freq * i * 1e-9 + phi) * Q2[i]
-
-                            self._samples_dict[qe]["I"].append(I3[i])
-                            self._samples_dict[qe]["Q"].append(Q3[i])
-                            new_samples += 1
+                    buffer_I.append(I3)
+                    buffer_Q.append(Q3)
+                    new_samples = len(I3)
 
                 elif "singleInput" in self._local_config["elements"][qe]:
                     if type(amp) is not float and type(amp) is not int:
                         raise IndexError("Amplitude must be a number")
 
-                    for i in range(len(samples)):
-                        assert (
-                            type(samples[i]) is float or type(samples[i]) is int
-                        ), f"{qe} is a singleInput element, list of numbers (int or float) should be provided "
-                        if t + i < len(self._samples_dict[qe]["single"]):
-                            self._samples_dict[qe]["single"][t + i] += (
-                                amp * np.cos(freq * (t + i) * 1e-9 + phi) * samples[i]
-                            )
-                        else:
-                            self._samples_dict[qe]["single"].append(amp * samples[i])
-                            new_samples += 1
+                    samples = self._as_single_samples(samples, qe)
+                    buffer = self._samples_dict[qe]["single"]
+                    n_overlap = min(len(samples), len(buffer) - t)
+                    buffer.array[t : t + n_overlap] += (
+                        amp * np.cos(freq * (t + np.arange(n_overlap)) * 1e-9 + phi) * samples[:n_overlap]
+                    )
+                    buffer.append(amp * samples[n_overlap:])
+                    new_samples = len(samples) - n_overlap
                 else:
                     raise ValueError("Element provided does not have any analog input")
 
@@ -938,12 +1115,12 @@ class Baking:
         :param duration: duration of ramping
         :param qe: quantum element
         """
-        ramp_sample = [amp * t for t in range(duration)]
+        ramp_sample = amp * np.arange(duration)
         if "singleInput" in self._local_config["elements"][qe]:
-            self._samples_dict[qe]["single"] += ramp_sample
+            self._samples_dict[qe]["single"].append(ramp_sample)
         elif any([key in self._local_config["elements"][qe] for key in ["mixInputs", "RF_inputs", "MWInput"]]):
-            self._samples_dict[qe]["Q"] += ramp_sample
-            self._samples_dict[qe]["I"] += [0] * duration
+            self._samples_dict[qe]["Q"].append(ramp_sample)
+            self._samples_dict[qe]["I"].append_zeros(duration)
         self._update_qe_time(qe, duration)
 
     def _update_qe_time(self, qe: str, dt: int) -> None:
@@ -970,11 +1147,11 @@ class Baking:
                             for key in ["mixInputs", "RF_inputs", "MWInput"]
                         ]
                     ):
-                        self._samples_dict[qe]["I"] += [0] * duration
-                        self._samples_dict[qe]["Q"] += [0] * duration
+                        self._samples_dict[qe]["I"].append_zeros(duration)
+                        self._samples_dict[qe]["Q"].append_zeros(duration)
 
                     elif "singleInput" in self._local_config["elements"][qe].keys():
-                        self._samples_dict[qe]["single"] += [0] * duration
+                        self._samples_dict[qe]["single"].append_zeros(duration)
 
                 self._update_qe_time(qe, duration)
 
@@ -1083,15 +1260,7 @@ class Baking:
 
     def _retrieve_constraint_length(self, baking_index: int = None) -> Optional[int]:
         if baking_index is not None:
-            max_length = 0
-            for pulse in self._local_config["pulses"]:
-                if (
-                    pulse.find(f"baked_pulse_{baking_index}") != -1
-                    and self._local_config["pulses"][pulse]["length"] > max_length
-                ):
-                    max_length = self._local_config["pulses"][pulse]["length"]
-
-            return max_length
+            return self._index.constraint_length(baking_index)
         else:
             return None
 
@@ -1,38 +1,137 @@
+from typing import List, Tuple
+
 import numpy as np
 from qm.qua import *
 
 from qualang_tools.bakery.bakery import baking
 from qualang_tools.bakery.randomized_benchmark_c1 import c1_ops, c1_table
 
+# Cayley table as an array (c1_composition[state, i] is the Clifford obtained by applying Clifford i after state), and
+# index of the Clifford reverting each Clifford back to the ground state
+c1_composition = np.asarray(c1_table, dtype=np.int64)
+c1_inverse = np.argmax(c1_composition == 0, axis=1)
+
 
 class RBOneQubit:
-    def __init__(self, config: dict, d_max: int, K: int, qubit: str):
+    def __init__(self, config: dict, d_max: int, K: int, qubit: str, shared_cliffords: bool = False, seed=None):
         """
         Class to retrieve easily baked RB sequences and their inverse operations
 
+        By default, each of the K sequences is baked into its own waveform, so that the size of the config grows with
+        K * d_max. With shared_cliffords=True, the 24 single-qubit Cliffords are instead baked once, all with the same
+        length, and the sequences are only stored as a (K, d_max) array of Clifford indices (clifford_sequences
+        attribute), with their reverting Cliffords (clifford_inverse_ops attribute), to be played in QUA from an array
+        or an input stream with play_sequence. The size of the config is then independent of K.
+
         :param config: Configuration file
         :param d_max: Maximum length of desired RB sequence
         :param K: Number of RB sequences
         :param qubit: Name of the quantum element designating the qubit
+        :param shared_cliffords: If True, bakes the 24 Cliffords once instead of baking every sequence
+            (default set to False). The sequences, inverse_ops, duration_trackers and baked_sequences attributes are
+            then empty lists.
+        :param seed: Seed of the NumPy random generator drawing the sequences with shared_cliffords=True
         """
         if not (qubit in config["elements"]):
             raise KeyError(f"Quantum element {qubit} is not in the config")
 
-        self.sequences = [RBSequence(config, d_max, qubit) for _ in range(K)]
+        self.qubit = qubit
+        self.shared_cliffords = shared_cliffords
+        if shared_cliffords:
+            self.baked_cliffords = generate_fixed_length_cliffords(config, qubit)
+            self.clifford_sequences, self.clifford_inverse_ops = generate_sequences(K, d_max, seed)
+            self.sequences = []
+        else:
+            self.baked_cliffords = None
+            self.clifford_sequences, self.clifford_inverse_ops = None, None
+            self.sequences = [RBSequence(config, d_max, qubit) for _ in range(K)]
         self.inverse_ops = [seq.revert_ops for seq in self.sequences]
         self.duration_trackers = [seq.duration_tracker for seq in self.sequences]
         self.baked_sequences = [seq.sequence for seq in self.sequences]
 
+    def get_sequence(self, k: int, depth: int) -> List[int]:
+        """
+        Returns the Clifford indices of the first depth Cliffords of the k-th sequence, followed by the index of the
+        Clifford reverting them (only available with shared_cliffords=True). This is the list to be loaded in a QUA
+        array or inserted in an input stream, and played with play_sequence.
+
+        :param k: Index of the sequence
+        :param depth: Number of random Cliffords (between 1 and d_max)
+        :return: List of depth + 1 Clifford indices
+        """
+        if not self.shared_cliffords:
+            raise RuntimeError("Clifford indices are only available with shared_cliffords=True")
+        return self.clifford_sequences[k, :depth].tolist() + [int(self.clifford_inverse_ops[k, depth - 1])]
+
+    def play_sequence(self, clifford_indices, length):
+        """
+        Plays the first length Cliffords of a QUA array of Clifford indices (e.g. as returned by get_sequence) with the
+        shared baked Cliffords. This method must be used within a QUA program.
+
+        :param clifford_indices: QUA int array (or input stream) of Clifford indices
+        :param length: Number of Cliffords to play (Python or QUA int)
+        """
+        if not self.shared_cliffords:
+            raise RuntimeError("play_sequence is only available with shared_cliffords=True")
+        i = declare(int)
+        with for_(i, 0, i < length, i + 1):
+            play_revert_op(clifford_indices[i], self.baked_cliffords)
+
+
+def _clifford_duration(config: dict, qubit: str, clifford: tuple) -> int:
+    operations = config["elements"][qubit]["operations"]
+    return sum(config["pulses"][operations[op]]["length"] for op in clifford)
+
+
+def generate_fixed_length_cliffords(config: dict, qubit: str) -> list:
+    """
+    Bakes the 24 single-qubit Cliffords once, padded with 0s to the duration of the longest one, so that any sequence
+    of d Cliffords lasts d times the same duration
+
+    :param config: Configuration file, updated with the 24 baked Cliffords
+    :param qubit: Name of the quantum element designating the qubit
+    :return: List of baking objects to play each Clifford (indexed as c1_ops)
+    """
+    length = max(_clifford_duration(config, qubit, clifford) for clifford in c1_ops)
+    baked_cliffords = [None] * len(c1_ops)
+    for i in range(len(c1_ops)):
+        with baking(config) as b:
+            for op in c1_ops[i]:
+                b.play(op, qubit)
+            b.wait(length - b.get_current_length(qubit), qubit)
+        baked_cliffords[i] = b
+    return baked_cliffords
+
+
+def generate_sequences(K: int, depth: int, seed=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws K random sequences of depth Cliffords, and the Clifford reverting every prefix of each sequence
+
+    The sequences are composed all at once, one step at a time, with the Cayley table.
+
+    :param K: Number of sequences
+    :param depth: Number of Cliffords per sequence
+    :param seed: Seed of the NumPy random generator, or the generator itself
+    :return: Indices (in c1_ops) of the Cliffords of the sequences, and index of the Clifford reverting the first d + 1
+        Cliffords of each sequence at [k, d], both as (K, depth) arrays
+    """
+    rng = np.random.default_rng(seed)
+    sequences = rng.integers(0, len(c1_ops), size=(K, depth))
+    states = np.empty_like(sequences)
+    state = np.zeros(K, dtype=sequences.dtype)
+    for d in range(depth):
+        state = c1_composition[state, sequences[:, d]]
+        states[:, d] = state
+    return sequences, c1_inverse[states]
+
 
 def find_revert_op(input_state_index: int):
-    """Looks in the Cayley table the operation needed to reset the state to ground state from input state_tracker
+    """Looks in the inverse table the operation needed to reset the state to ground state from input state_tracker
 
     :param input_state_index: Index of the current state tracker
     :return: index of the next Clifford to apply to invert RB sequence
     """
-    for i in range(len(c1_ops)):
-        if c1_table[input_state_index][i] == 0:
-            return i
+    return int(c1_inverse[input_state_index])
 
 
 def play_revert_op(index: int, baked_cliffords):
@@ -179,9 +278,9 @@ class RBSequence:
                     self.duration_tracker[d] += 1  # Add additional duration for each pulse played to build Clifford
 
                 if d == 0:  # Handle the case for qubit set to original/ground state
-                    self.state_tracker[d] = c1_table[self.state_init][i]
+                    self.state_tracker[d] = int(c1_composition[self.state_init, i])
                 else:  # Get the newly transformed state within th Cayley table based on previous step
-                    self.state_tracker[d] = c1_table[self.state_tracker[d - 1]][i]
+                    self.state_tracker[d] = int(c1_composition[self.state_tracker[d - 1], i])
                 self.revert_ops[d] = find_revert_op(self.state_tracker[d])
                 self.inverse_op_string[d] = c1_ops[self.revert_ops[d]]
         return b
@@ -1,6 +1,5 @@
 from abc import ABC, abstractmethod
 import dataclasses
-from time import sleep
 from typing import List, Any, Dict
 from functools import wraps
 from qm import QmJob
@@ -11,6 +10,8 @@ from qm import QuantumMachine
 from packaging.version import Version
 import qm
 
+from qualang_tools.results.wait_tools import Poller
+
 
 # TODO: Remove this if block when we drop support for qm < 1.2.2 (and move the import that is currently in the
 #  else block to the top)
@@ -31,6 +32,9 @@ else:
 
 __all__ = ["ProgramAddon", "callable_from_qua"]
 
+# The QUA program is paused until the arguments are fetched, so the polling interval is kept short (10 ms at most)
+_argument_poller = Poller(min_interval=0.001, max_interval=0.01)
+
 
 def _get_program_scope():
     # TODO: Remove this if block when we drop support for qm < 1.2.3 (and move the import that is currently in the
@@ -106,12 +110,18 @@ class QuaCallable:
     def _convert_to_value_arg(self, job: QmJob, arg):
         if not isinstance(arg, QuaCallableArgument):
             return arg
-        while True:
+        fetched = []
+
+        def is_new_value_saved() -> bool:
             value = job.result_handles.get(arg.tag).fetch_all()
             if value is not None and (arg.tag not in self._last_arg_fetch or self._last_arg_fetch[arg.tag] != value[1]):
                 self._last_arg_fetch[arg.tag] = value[1]
-                return value[0]
-            sleep(0.01)
+                fetched.append(value[0])
+                return True
+            return False
+
+        _argument_poller.wait_until(is_new_value_saved, name="callable_from_qua")
+        return fetched[0]
 
     def run(self, job: QmJob):
         args = [self._convert_to_value_arg(job, arg) for arg in self._args]
@@ -1,4 +1,4 @@
 from .two_qubit_rb import *
-from .two_qubit_rb.RBResult import RBResult
+from .two_qubit_rb.RBResult import RBResult, IncrementalRBFit
 
-__all__ = ["TwoQubitRb", "TwoQubitRbDebugger", "RBResult"]
+__all__ = ["TwoQubitRb", "TwoQubitRbDebugger", "RBResult", "IncrementalRBFit"]
@@ -1,19 +1,56 @@
 from ._cirq import import_cirq
+from .bake_cache import BakedOp, RBBakeCache, RBBakeCacheEntry, config_fragment_diff, merge_config_fragment
 from .gates import GateGenerator, gate_db
 from .verification.command_registry import CommandRegistry
 
 import copy
-import json
-from typing import Callable, Dict, Optional, List
+import hashlib
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional, List, Set
 
+import numpy as np
 from cirq import GateOperation
-from qm.qua import switch_, case_, declare, align, for_
+from qm.qua import switch_, case_, declare, align, for_, play, frame_rotation_2pi
 from qualang_tools.bakery.bakery import Baking, baking
 from tqdm import tqdm
 
 cirq = import_cirq()
 
 
+class _QeBakingState(NamedTuple):
+    """Samples and timing/frame state of an element at the end of the baking of a command."""
+
+    samples: Dict[str, np.ndarray]
+    info: dict
+    digital_samples: list
+
+
+# RBBaker of the worker processes baking commands in parallel
+_worker_baker: Optional["RBBaker"] = None
+
+
+def _init_worker(baker: "RBBaker"):
+    global _worker_baker
+    _worker_baker = baker
+
+
+def _collect_elements_worker(cmd_ids: range):
+    return _worker_baker._collect_elements_of(cmd_ids)
+
+
+def _baking_states_worker(cmd_ids: range, elements: Set[str]):
+    return _worker_baker._baking_states_of(cmd_ids, elements)
+
+
+def _mp_context():
+    # Forking lets the workers use gate generators which can not be pickled (e.g. defined in a notebook)
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
 class RBBaker:
     def __init__(
         self,
@@ -22,17 +59,41 @@ class RBBaker:
         two_qubit_gate_generators: Dict[str, Callable],
         interleaving_gate: Optional[List[cirq.GateOperation]] = None,
         command_registry: Optional[CommandRegistry] = None,
+        bake_cache: Optional[RBBakeCache] = None,
+        max_workers: Optional[int] = None,
     ):
         self._command_registry = command_registry
+        self._max_workers = max_workers
         self._config = copy.deepcopy(config)
         self._single_qubit_gate_generator = single_qubit_gate_generator
         self._two_qubit_gate_generators = two_qubit_gate_generators
         self._interleaving_gate = interleaving_gate
         self._symplectic_generator = GateGenerator(set(two_qubit_gate_generators.keys()))
-        self._all_elements = self._collect_all_elements()
+        self._bake_cache = bake_cache
+        self._bake_cache_key = None
+        self._cached_bake = None
+        if bake_cache is not None:
+            self._bake_cache_key = bake_cache.key(
+                config, single_qubit_gate_generator, two_qubit_gate_generators, interleaving_gate
+            )
+            self._cached_bake = bake_cache.load(self._bake_cache_key)
+        if self._cached_bake is not None:
+            self._all_elements = set(self._cached_bake.all_elements)
+            if self._command_registry is not None:
+                self._command_registry.load_commands(self._cached_bake.commands)
+        else:
+            self._all_elements = self._collect_all_elements()
         self._cmd_to_op = {}
         self._op_to_baking = {}
 
+    @property
+    def bake_cache_key(self) -> Optional[str]:
+        return self._bake_cache_key
+
+    @property
+    def loaded_from_cache(self) -> bool:
+        return self._cached_bake is not None
+
     @property
     def all_elements(self):
         return self._all_elements
@@ -64,23 +125,47 @@ class RBBaker:
         else:
             raise RuntimeError("unsupported gate")
 
-    def _collect_all_elements(self):
-        config = copy.deepcopy(self._config)
-        qes = set()
-        for cmd_id, command in enumerate(gate_db.commands):
+    def _num_of_commands(self) -> int:
+        return len(gate_db.commands) + (0 if self._interleaving_gate is None else 1)
+
+    def _map_commands(self, worker: Callable, method: Callable, *args) -> Iterator:
+        """
+        Yields the result of method for every command id, in order. With max_workers > 1, the commands are split in
+        batches which are processed by a pool of worker processes.
+        """
+        cmd_ids = range(self._num_of_commands())
+        if self._max_workers is None or self._max_workers <= 1:
+            yield from method(cmd_ids, *args)
+            return
+        batch_size = math.ceil(len(cmd_ids) / (4 * self._max_workers))
+        batches = [cmd_ids[i : i + batch_size] for i in range(0, len(cmd_ids), batch_size)]
+        with ProcessPoolExecutor(
+            self._max_workers, mp_context=_mp_context(), initializer=_init_worker, initargs=(self,)
+        ) as executor:
+            for results in executor.map(worker, batches, *[[arg] * len(batches) for arg in args]):
+                yield from results
+
+    def _collect_elements_of(self, cmd_ids: Iterable[int]) -> list:
+        results = []
+        for cmd_id in cmd_ids:
             if self._command_registry is not None:
                 self._command_registry.set_current_command_id(cmd_id)
-            with baking(config) as b:
+            with baking(self._config) as b:
                 self._update_baking_from_cmd_id(b, cmd_id)
-                qes.update(b.get_qe_set())
+                qes = b.get_qe_set()
                 b.update_config = False
-        if self._interleaving_gate is not None:
+            commands = {}
+            if self._command_registry is not None and cmd_id in self._command_registry.commands:
+                commands[cmd_id] = self._command_registry.commands[cmd_id]
+            results.append((qes, commands))
+        return results
+
+    def _collect_all_elements(self):
+        qes = set()
+        for cmd_qes, commands in self._map_commands(_collect_elements_worker, self._collect_elements_of):
+            qes.update(cmd_qes)
             if self._command_registry is not None:
-                self._command_registry.set_current_command_id(cmd_id + 1)
-            with baking(config) as b:
-                self._update_baking_from_gates(b, self._interleaving_gate)
-                qes.update(b.get_qe_set())
-                b.update_config = False
+                self._command_registry.record_commands(commands)
         if self._command_registry is not None:
             self._command_registry.finish()
         return qes
@@ -109,46 +194,136 @@ class RBBaker:
         gate_ops = self.gates_from_cmd_id(cmd_id)
         return self._update_baking_from_gates(b, gate_ops, elements)
 
+    def _baking_states_of(self, cmd_ids: Iterable[int], elements: Set[str]) -> list:
+        results = []
+        for cmd_id in cmd_ids:
+            with baking(self._config) as b:
+                self._update_baking_from_cmd_id(b, cmd_id, elements)
+                results.append(
+                    {
+                        qe: _QeBakingState(
+                            {key: buffer.array.copy() for key, buffer in b._samples_dict[qe].items()},
+                            dict(b._qe_dict[qe]),
+                            list(b._digital_samples_dict[qe]),
+                        )
+                        for qe in elements
+                    }
+                )
+                b.update_config = False
+        return results
+
     @staticmethod
-    def _unique_baker_identifier_for_qe(b: Baking, qe: str):
-        identifier = {"samples": b._samples_dict[qe], "info": b._qe_dict[qe]}
-        return json.dumps(identifier)
+    def _restore_baking_state(b: Baking, state: Dict[str, _QeBakingState]):
+        for qe, qe_state in state.items():
+            for key, samples in qe_state.samples.items():
+                b._samples_dict[qe][key].set(samples)
+            b._qe_dict[qe].update(qe_state.info)
+            b._digital_samples_dict[qe] = list(qe_state.digital_samples)
+
+    @staticmethod
+    def _unique_baker_identifier_for_qe(qe_state: _QeBakingState) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        for key in sorted(qe_state.samples):
+            samples = np.ascontiguousarray(qe_state.samples[key], dtype=np.float64)
+            h.update(f"{key}:{len(samples)}:".encode())
+            h.update(samples.tobytes())
+        h.update(repr(sorted(qe_state.info.items())).encode())
+        return h.digest()
+
+    @staticmethod
+    def _same_waveform(qe_state: _QeBakingState, other: _QeBakingState) -> bool:
+        return (
+            qe_state.info == other.info
+            and qe_state.samples.keys() == other.samples.keys()
+            and all(np.array_equal(samples, other.samples[key]) for key, samples in qe_state.samples.items())
+        )
+
+    @classmethod
+    def _find_op_id(cls, candidates: List[tuple], qe_state: _QeBakingState) -> Optional[int]:
+        """
+        Returns the id of the op among the candidates (sharing the identifier of qe_state) which was baked with the
+        same waveform as qe_state, or None if there is none.
+        """
+        for op_id, other in candidates:
+            if cls._same_waveform(qe_state, other):
+                return op_id
+        return None
 
     def _bake_all_ops(self, config: dict):
         waveform_id_per_qe = {qe: 0 for qe in self._all_elements}
-        waveform_to_baking = {qe: {} for qe in self._all_elements}
+        waveform_to_op = {qe: {} for qe in self._all_elements}
         cmd_to_op = {qe: {} for qe in self._all_elements}
         op_to_baking = {qe: [] for qe in self._all_elements}
-        num_of_commands = len(gate_db.commands) + (0 if self._interleaving_gate is None else 1)
-        for cmd_id in tqdm(range(num_of_commands), desc="Baking pulses which comprise Cliffords", unit="command"):
-            with baking(config) as b:
-                self._update_baking_from_cmd_id(b, cmd_id, self._all_elements)
-                any_qe_used = False
-                for qe in self._all_elements:
-                    key = self._unique_baker_identifier_for_qe(b, qe)
-                    if key not in waveform_to_baking[qe]:
-                        waveform_to_baking[qe][key] = waveform_id_per_qe[qe], b
-                        op_to_baking[qe].append(b)
-                        waveform_id_per_qe[qe] += 1
-                        any_qe_used = True
-                    cmd_to_op[qe][cmd_id] = waveform_to_baking[qe][key][0]
-                b.update_config = any_qe_used
+        # The commands are baked in a throwaway baking object (possibly in a worker process), and only the ones
+        # introducing new waveforms are replayed in a baking object updating the config, in command order.
+        states = self._map_commands(_baking_states_worker, self._baking_states_of, self._all_elements)
+        for cmd_id, state in tqdm(
+            enumerate(states),
+            total=self._num_of_commands(),
+            desc="Baking pulses which comprise Cliffords",
+            unit="command",
+        ):
+            new_qes = []
+            for qe in self._all_elements:
+                candidates = waveform_to_op[qe].setdefault(self._unique_baker_identifier_for_qe(state[qe]), [])
+                op_id = self._find_op_id(candidates, state[qe])
+                if op_id is None:
+                    op_id = waveform_id_per_qe[qe]
+                    candidates.append((op_id, state[qe]))
+                    waveform_id_per_qe[qe] += 1
+                    new_qes.append(qe)
+                cmd_to_op[qe][cmd_id] = op_id
+            if new_qes:
+                with baking(config) as b:
+                    self._restore_baking_state(b, state)
+                for qe in new_qes:
+                    op_to_baking[qe].append(BakedOp(f"baked_Op_{b.get_baking_index()}", float(state[qe].info["phase"])))
         return cmd_to_op, op_to_baking
 
     def bake(self) -> dict:
         config = copy.deepcopy(self._config)
+        if self._cached_bake is not None:
+            merge_config_fragment(config, self._cached_bake.config_fragment)
+            self._cmd_to_op, self._op_to_baking = self._cached_bake.cmd_to_op, self._cached_bake.op_to_baking
+            return config
         self._cmd_to_op, self._op_to_baking = self._bake_all_ops(config)
+        if self._bake_cache is not None:
+            entry = RBBakeCacheEntry(
+                all_elements=self._all_elements,
+                cmd_to_op=self._cmd_to_op,
+                op_to_baking=self._op_to_baking,
+                config_fragment=config_fragment_diff(self._config, config),
+                commands=self._command_registry.commands if self._command_registry is not None else {},
+            )
+            self._bake_cache.save(self._bake_cache_key, entry)
         return config
 
+    @property
+    def dedup_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Number of commands and of unique baked waveforms (i.e. of baked operations) per element.
+        """
+        return {
+            qe: {"commands": len(self._cmd_to_op[qe]), "unique_waveforms": len(self._op_to_baking[qe])}
+            for qe in sorted(self._cmd_to_op)
+        }
+
+    @property
+    def cmd_to_op(self) -> Dict[str, Dict[int, int]]:
+        """
+        Index of the baked operation played by every command on every element, as {element: {cmd_id: op_id}}. Empty
+        until the commands are baked.
+        """
+        return {qe: dict(ops) for qe, ops in self._cmd_to_op.items()}
+
     def decode(self, cmd_id, element):
         return self._cmd_to_op[element][cmd_id]
 
     @staticmethod
-    def _run_baking_for_qe(b: Baking, qe: str):
-        orig_get_qe_set = b.get_qe_set
-        b.get_qe_set = lambda: {qe}
-        b.run()
-        b.get_qe_set = orig_get_qe_set
+    def _run_baked_op(baked_op: BakedOp, qe: str):
+        play(baked_op.name, qe)
+        if baked_op.frame_rotation != 0:
+            frame_rotation_2pi(baked_op.frame_rotation / (2 * np.pi), qe)
 
     def run(self, op_list_per_qe: dict, length, unsafe=True):
         if set(op_list_per_qe.keys()) != self._all_elements:
@@ -159,7 +334,7 @@ class RBBaker:
             cmd_i = declare(int)
             with for_(cmd_i, 0, cmd_i < length, cmd_i + 1):
                 with switch_(op_list[cmd_i], unsafe=unsafe):
-                    for op_id, b in enumerate(self._op_to_baking[qe]):
+                    for op_id, baked_op in enumerate(self._op_to_baking[qe]):
                         with case_(op_id):
-                            self._run_baking_for_qe(b, qe)
+                            self._run_baked_op(baked_op, qe)
         align()
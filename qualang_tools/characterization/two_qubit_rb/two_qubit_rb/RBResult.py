@@ -1,8 +1,11 @@
 import dataclasses
+import warnings
+from typing import Optional, Sequence, Tuple
+
 import numpy as np
 import xarray as xr
 from matplotlib import pyplot as plt
-from scipy.optimize import curve_fit
+from scipy.optimize import OptimizeWarning, curve_fit
 
 
 @dataclasses.dataclass
@@ -14,26 +17,36 @@ class RBResult:
         circuit_depths (list[int]): List of circuit depths used in the RB experiment.
         num_repeats (int): Number of repeated sequences at each circuit depth.
         num_averages (int): Number of averages for each sequence.
-        state (np.ndarray): Measured states from the RB experiment.
+        state (np.ndarray): Measured states from the RB experiment, of shape (repeat, circuit_depth, average).
+        state_counts (np.ndarray): Number of times each two-qubit state was measured for every sequence, of shape
+            (repeat, circuit_depth, 4). Can be given instead of `state`, as all the analyses only depend on it.
     """
 
     circuit_depths: list[int]
     num_repeats: int
     num_averages: int
-    state: np.ndarray
+    state: Optional[np.ndarray] = None
+    state_counts: Optional[np.ndarray] = None
 
     def __post_init__(self):
         """
         Initializes the xarray Dataset to store the RB experiment data.
         """
-        self.data = xr.Dataset(
-            data_vars={"state": (["repeat", "circuit_depth", "average"], self.state)},
-            coords={
-                "repeat": range(self.num_repeats),
-                "circuit_depth": self.circuit_depths,
-                "average": range(self.num_averages),
-            },
-        )
+        if self.state is None and self.state_counts is None:
+            raise ValueError("Either state or state_counts must be given")
+        if self.state_counts is None:
+            self.state_counts = count_states(self.state)
+
+        data_vars = {"state_counts": (["repeat", "circuit_depth", "measured_state"], self.state_counts)}
+        coords = {"repeat": range(self.num_repeats), "circuit_depth": self.circuit_depths, "measured_state": range(4)}
+        if self.state is not None:
+            data_vars["state"] = (["repeat", "circuit_depth", "average"], self.state)
+            coords["average"] = range(self.num_averages)
+        self.data = xr.Dataset(data_vars=data_vars, coords=coords)
+
+    def _state_probability(self, state: int) -> xr.DataArray:
+        # probability to measure `state` for every sequence
+        return self.data.state_counts.sel(measured_state=state, drop=True) / self.num_averages
 
     def plot_hist(self, n_cols=3):
         """
@@ -48,7 +61,12 @@ class RBResult:
         plt.figure()
         for i, circuit_depth in enumerate(self.circuit_depths, start=1):
             ax = plt.subplot(n_rows, n_cols, i)
-            self.data.state.sel(circuit_depth=circuit_depth).plot.hist(ax=ax, xticks=range(4))
+            if self.state is not None:
+                self.data.state.sel(circuit_depth=circuit_depth).plot.hist(ax=ax, xticks=range(4))
+            else:
+                counts = self.data.state_counts.sel(circuit_depth=circuit_depth).sum("repeat")
+                ax.bar(range(4), counts, tick_label=range(4))
+                ax.set_title(f"circuit_depth = {circuit_depth}")
         plt.tight_layout()
 
     def plot(self):
@@ -56,21 +74,27 @@ class RBResult:
         Plots the raw recovery probability decay curve as a function of circuit depth.
         The curve is plotted using the averaged probability and without any fitting.
         """
-        recovery_probability = (self.data.state == 0).sum(("repeat", "average")) / (
-            self.num_repeats * self.num_averages
-        )
+        recovery_probability = self.get_decay_curve()
         recovery_probability.rename("Recovery Probability").plot.line()
 
-    def plot_with_fidelity(self):
+    def plot_with_fidelity(self, num_bootstrap_samples: int = 0):
         """
         Plots the RB fidelity as a function of circuit depth, including a fit to an exponential decay model.
         The fitted curve is overlaid with the raw data points, and error bars are included.
+
+        Args:
+            num_bootstrap_samples (int): If positive, the uncertainty of the fidelity is estimated by bootstrapping
+                the circuits with this number of samples (see `bootstrap_fit`) and displayed.
         """
         A, alpha, B = self.fit_exponential()
         fidelity = self.get_fidelity(alpha)
+        fidelity_text = f"2Q Clifford Fidelity = {fidelity * 100:.2f}%"
+        if num_bootstrap_samples > 0:
+            fidelity_error = np.std(self.get_fidelity(self.bootstrap_fit(num_bootstrap_samples)[:, 1]))
+            fidelity_text += f" ± {fidelity_error * 100:.2f}%"
 
         # Compute error bars
-        error_bars = (self.data == 0).mean(dim="average").std(dim="repeat").state.data
+        error_bars = self._state_probability(0).std(dim="repeat").data
 
         plt.figure()
         plt.errorbar(
@@ -96,7 +120,7 @@ class RBResult:
         plt.text(
             0.5,
             0.95,
-            f"2Q Clifford Fidelity = {fidelity * 100:.2f}%",
+            fidelity_text,
             horizontalalignment="center",
             verticalalignment="top",
             fontdict={"fontsize": "large", "fontweight": "bold"},
@@ -115,7 +139,7 @@ class RBResult:
         """
         plt.plot(
             self.circuit_depths,
-            (self.data.state == 0).mean(dim="average").mean(dim="repeat").data,
+            self._state_probability(0).mean(dim="repeat").data,
             label=r"$|00\rangle$",
             marker=".",
             color="c",
@@ -123,7 +147,7 @@ class RBResult:
         )
         plt.plot(
             self.circuit_depths,
-            (self.data.state == 1).mean(dim="average").mean(dim="repeat").data,
+            self._state_probability(1).mean(dim="repeat").data,
             label=r"$|01\rangle$",
             marker=".",
             color="b",
@@ -131,7 +155,7 @@ class RBResult:
         )
         plt.plot(
             self.circuit_depths,
-            (self.data.state == 2).mean(dim="average").mean(dim="repeat").data,
+            self._state_probability(2).mean(dim="repeat").data,
             label=r"$|10\rangle$",
             marker=".",
             color="y",
@@ -139,7 +163,7 @@ class RBResult:
         )
         plt.plot(
             self.circuit_depths,
-            (self.data.state == 3).mean(dim="average").mean(dim="repeat").data,
+            self._state_probability(3).mean(dim="repeat").data,
             label=r"$|11\rangle$",
             marker=".",
             color="r",
@@ -170,6 +194,33 @@ class RBResult:
 
         return A, alpha, B
 
+    def bootstrap_fit(self, num_samples: int = 1000, seed=None) -> np.ndarray:
+        """
+        Estimates the distribution of the fitted parameters by resampling, with replacement, the circuits of every
+        circuit depth.
+
+        All the resampled decay curves are computed at once, and fitted together by a linear least-squares fit of
+        log(p - B) as a function of the circuit depth, with the offset B fixed to the one of `fit_exponential`. This
+        takes milliseconds for thousands of samples, instead of a `curve_fit` call per sample.
+
+        Args:
+            num_samples (int): Number of bootstrap samples.
+            seed: Seed of the NumPy random generator used to resample the circuits.
+
+        Returns:
+            np.ndarray: Fitted parameters (A, alpha, B) of every sample, of shape (num_samples, 3).
+        """
+        _, _, B = self.fit_exponential()
+        recovery_probabilities = self._state_probability(0).transpose("repeat", "circuit_depth").data
+        num_repeats, num_depths = recovery_probabilities.shape
+
+        rng = np.random.default_rng(seed)
+        resampled_repeats = rng.integers(num_repeats, size=(num_samples, num_repeats, num_depths))
+        decay_curves = recovery_probabilities[resampled_repeats, np.arange(num_depths)].mean(axis=1)
+
+        A, alpha = _fit_log_decay(np.asarray(self.circuit_depths, dtype=float), decay_curves - B)
+        return np.stack([A, alpha, np.full(num_samples, B)], axis=-1)
+
     def get_fidelity(self, alpha):
         """
         Calculates the average fidelity per Clifford based on the decay constant.
@@ -194,7 +245,107 @@ class RBResult:
         Returns:
             np.ndarray: Decay curve representing the fidelity as a function of circuit depth.
         """
-        return (self.data.state == 0).sum(("repeat", "average")) / (self.num_repeats * self.num_averages)
+        return self._state_probability(0).mean(dim="repeat")
+
+
+def count_states(state: np.ndarray) -> np.ndarray:
+    """
+    Counts the measured two-qubit states of every sequence.
+
+    Args:
+        state (np.ndarray): Measured states, of shape (repeat, circuit_depth, average).
+
+    Returns:
+        np.ndarray: Number of times each state (0 to 3) was measured, of shape (repeat, circuit_depth, 4).
+    """
+    state = np.asarray(state)
+    return np.stack([np.count_nonzero(state == i, axis=-1) for i in range(4)], axis=-1)
+
+
+def _fit_log_decay(circuit_depths: np.ndarray, decays: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fits decays (of shape (num_curves, num_depths)) to A * alpha**x with a linear least-squares fit in log space,
+    ignoring non-positive points, and returns the arrays of A and alpha.
+    """
+    valid = decays > 0
+    weights = valid.astype(float)
+    log_decays = np.log(np.where(valid, decays, 1.0))
+    num_valid = np.maximum(weights.sum(axis=-1), 1)
+    mean_x = (weights * circuit_depths).sum(axis=-1) / num_valid
+    mean_y = (weights * log_decays).sum(axis=-1) / num_valid
+    dx = circuit_depths - mean_x[:, None]
+    variance_x = (weights * dx**2).sum(axis=-1)
+    slope = (weights * dx * (log_decays - mean_y[:, None])).sum(axis=-1) / np.where(variance_x > 0, variance_x, np.nan)
+    return np.exp(mean_y - slope * mean_x), np.exp(slope)
+
+
+class IncrementalRBFit:
+    """
+    Fit of the RB decay curve which is updated as the state counts of the circuits of each depth arrive, e.g. while the
+    experiment is running. Every fit is warm-started from the parameters of the previous one. A fit which does not
+    converge, or which does not describe a decay (A <= 0 or alpha outside of (0, 1)), e.g. on the sparse data of the
+    first updates, keeps the previous parameters and sets `last_fit_failed`.
+
+    Args:
+        p0 (Sequence[float]): Initial guess of the parameters (A, alpha, B) of the first fit.
+    """
+
+    def __init__(self, p0: Sequence[float] = (0.75, 0.9, 0.25)):
+        self._recovered: dict[int, int] = {}
+        self._shots: dict[int, int] = {}
+        self.params: Optional[Tuple[float, float, float]] = None
+        self.last_fit_failed = False
+        self.num_failed_fits = 0
+        self._p0 = tuple(p0)
+
+    def update(self, circuit_depth: int, state_counts: np.ndarray) -> Optional[Tuple[float, float, float]]:
+        """
+        Adds the state counts of circuits of the given depth and updates the fit.
+
+        Args:
+            circuit_depth (int): The circuit depth of the circuits.
+            state_counts (np.ndarray): Number of times each two-qubit state was measured, of shape (..., 4).
+
+        Returns:
+            The fitted parameters (A, alpha, B), or None while less than three circuit depths were measured or if the
+            fit did not converge.
+        """
+        state_counts = np.asarray(state_counts)
+        self._recovered[circuit_depth] = self._recovered.get(circuit_depth, 0) + int(state_counts[..., 0].sum())
+        self._shots[circuit_depth] = self._shots.get(circuit_depth, 0) + int(state_counts.sum())
+        if len(self._shots) < 3:
+            return None
+
+        circuit_depths, decay_curve = self.get_decay_curve()
+        p0 = self.params if self.params is not None else self._p0
+        try:
+            with warnings.catch_warnings():
+                # The covariance is not used, and can not be estimated from three depths only
+                warnings.simplefilter("ignore", OptimizeWarning)
+                popt, _ = curve_fit(rb_decay_curve, circuit_depths, decay_curve, p0=p0, maxfev=10000)
+        except (RuntimeError, OptimizeWarning):
+            popt = None
+        self.last_fit_failed = popt is None or not (np.all(np.isfinite(popt)) and popt[0] > 0 and 0 < popt[1] < 1)
+        if self.last_fit_failed:
+            self.num_failed_fits += 1
+            return None
+        self.params = tuple(popt)
+        return self.params
+
+    def get_decay_curve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            The measured circuit depths, sorted, and the probability to recover to |00> at each of them.
+        """
+        circuit_depths = np.array(sorted(self._shots))
+        return circuit_depths, np.array([self._recovered[d] / self._shots[d] for d in circuit_depths])
+
+    def get_fidelity(self) -> Optional[float]:
+        """Returns the average fidelity per Clifford of the current fit, or None if there is no fit yet."""
+        if self.params is None:
+            return None
+        d = 2**2  # two qubits, as in RBResult.get_fidelity
+        return 1 - (1 - self.params[1]) * (d - 1) / d
 
 
 def rb_decay_curve(x, A, alpha, B):
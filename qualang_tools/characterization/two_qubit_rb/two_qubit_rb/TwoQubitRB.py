@@ -1,9 +1,13 @@
 from ._cirq import import_cirq
 from .RBBaker import RBBaker
 from .RBResult import RBResult
+from . import clifford_tables
+from .bake_cache import RBBakeCache
 from .gates import GateGenerator, gate_db, tableau_from_cirq
+from .sequence_generation import SeedLike, compose_sequences, generate_sequences
 from .simple_tableau import SimpleTableau
-from .util import run_in_thread, pbar
+from .input_stream_feeder import FeederStats, InputStreamFeeder
+from .progress import ProgressSnapshot, RBProgress
 from .verification.command_registry import (
     CommandRegistry,
     decorate_single_qubit_generator_with_command_recording,
@@ -34,8 +38,10 @@ class TwoQubitRb:
         two_qubit_gate_generators: Dict[Literal["sqr_iSWAP", "CNOT", "CZ"], Callable[[Baking, int, int], None]],
         prep_func: Callable[[], None],
         measure_func: Callable[[], Tuple],
-        verify_generation: bool = False,
+        verify_generation: Union[bool, Literal["tableau", "unitary"]] = False,
         interleaving_gate: Optional[List[cirq.GateOperation]] = None,
+        bake_cache_dir: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
     ):
         """
         A class for running two qubit randomized benchmarking experiments.
@@ -74,9 +80,20 @@ class TwoQubitRb:
                 Callable[[], Tuple[_Expression, _Expression]]: A tuple containing the measured values of the two qubits as Qua expressions.
                 The expression must evaluate to a boolean value. False means |0>, True means |1>. The MSB is the first qubit.
 
-            verify_generation: A boolean indicating whether to verify the generated sequences. Not be used in production, as it is very slow.
+            verify_generation: Whether to verify that the generated sequences compose to the identity.
+                "tableau" composes the tableaus of the gates of every sequence, which is cheap enough to verify all the
+                sequences of an experiment. "unitary" (or True) additionally computes the unitary of the cirq circuit of
+                every sequence, as a reference check; it is very slow and should not be used in production.
 
             interleaving_gate: Interleaved gate represented as list of cirq GateOperation
+
+            bake_cache_dir: Optional directory of a persistent cache of the baked Clifford commands. When the config
+                subset used for baking, the gate generators and the interleaving gate match a cached entry, baking is
+                skipped entirely. Entries can be removed with `invalidate_bake_cache`.
+
+            max_workers: Optional number of worker processes used to bake the commands comprising the Cliffords in
+                parallel. The resulting config is identical to the one baked in the main process. Where processes can
+                not be forked (e.g. Windows), the gate generators must be picklable (i.e. defined at module level).
         """
         for i, qe in config["elements"].items():
             if "operations" not in qe:
@@ -91,17 +108,46 @@ class TwoQubitRb:
         two_qubit_gate_generators = decorate_two_qubit_gate_generator_with_command_recording(
             two_qubit_gate_generators, self._command_registry
         )
+        self._bake_cache = RBBakeCache(bake_cache_dir) if bake_cache_dir is not None else None
         self._rb_baker = RBBaker(
-            config, single_qubit_gate_generator, two_qubit_gate_generators, interleaving_gate, self._command_registry
+            config,
+            single_qubit_gate_generator,
+            two_qubit_gate_generators,
+            interleaving_gate,
+            self._command_registry,
+            bake_cache=self._bake_cache,
+            max_workers=max_workers,
         )
 
         self._interleaving_gate = interleaving_gate
         self._interleaving_tableau = tableau_from_cirq(interleaving_gate) if interleaving_gate is not None else None
+        self._interleaving_clifford = (
+            clifford_tables.clifford_id(self._interleaving_tableau) if interleaving_gate is not None else None
+        )
         self._config = self._rb_baker.bake()
         self._symplectic_generator = GateGenerator(set(two_qubit_gate_generators.keys()))
         self._prep_func = prep_func
         self._measure_func = measure_func
-        self._verify_generation = verify_generation
+        if verify_generation not in (False, True, "tableau", "unitary"):
+            raise ValueError(f"verify_generation must be a boolean, 'tableau' or 'unitary', got {verify_generation!r}")
+        self._verify_generation = "unitary" if verify_generation is True else verify_generation
+        self._input_stream_feeder: Optional[InputStreamFeeder] = None
+        self._progress: Optional[RBProgress] = None
+
+    def invalidate_bake_cache(self, all_entries: bool = False) -> int:
+        """
+        Removes the cached baking of this experiment from the bake cache, so that the next experiment built with the
+        same parameters is baked again.
+
+        Args:
+            all_entries: If True, removes all the entries in the cache directory.
+
+        Returns:
+            The number of removed entries.
+        """
+        if self._bake_cache is None:
+            return 0
+        return self._bake_cache.invalidate(None if all_entries else self._rb_baker.bake_cache_key)
 
     def convert_sequence_to_cirq(self, sequence: List[int]) -> List[cirq.GateOperation]:
         gates = []
@@ -124,37 +170,86 @@ class TwoQubitRb:
         if np.linalg.norm(fixed_phase_unitary - np.eye(4)) > 1e-12:
             raise RuntimeError("Verification of RB sequence failed")
 
+    def _verify_rb_sequence_tableau(self, gate_ids):
+        # Composes the gates from scratch, independently of the composition done while generating the sequence
+        clifford = clifford_tables.identity()
+        for gate_id in gate_ids:
+            if gate_id == gate_db.get_interleaving_gate():
+                clifford = clifford_tables.compose(clifford, self._interleaving_clifford)
+            else:
+                clifford = clifford_tables.compose(clifford, gate_db.get_clifford_id(gate_id))
+        if clifford != clifford_tables.identity():
+            raise RuntimeError("Verification of RB sequence failed")
+
     def _gen_rb_sequence(self, depth):
+        # The Cliffords are composed using their integer encoding, see `clifford_tables`
         gate_ids = []
-        tableau = SimpleTableau(np.eye(4), [0, 0, 0, 0])
+        clifford = clifford_tables.identity()
         for i in range(depth):
             symplectic = gate_db.rand_symplectic()
             pauli = gate_db.rand_pauli()
             gate_ids.append(symplectic)
             gate_ids.append(pauli)
 
-            tableau = tableau.then(gate_db.get_tableau(symplectic)).then(gate_db.get_tableau(pauli))
+            clifford = clifford_tables.compose(clifford, gate_db.get_clifford_id(symplectic))
+            clifford = clifford_tables.compose(clifford, gate_db.get_clifford_id(pauli))
 
-            if self._interleaving_tableau is not None:
+            if self._interleaving_clifford is not None:
                 gate_ids.append(gate_db.get_interleaving_gate())
-                tableau = tableau.then(self._interleaving_tableau)
+                clifford = clifford_tables.compose(clifford, self._interleaving_clifford)
 
-        inv_tableau = tableau.inverse()
+        inv_tableau = clifford_tables.clifford_tableau(clifford_tables.inverse(clifford))
         inv_id = gate_db.find_symplectic_gate_id_by_tableau_g(inv_tableau)
-        after_inv_tableau = tableau.then(gate_db.get_tableau(inv_id))
+        after_inv_clifford = clifford_tables.compose(clifford, gate_db.get_clifford_id(inv_id))
 
-        pauli = gate_db.find_pauli_gate_id_by_tableau_alpha(after_inv_tableau)
+        pauli = gate_db.find_pauli_gate_id_by_tableau_alpha(clifford_tables.clifford_tableau(after_inv_clifford))
 
         gate_ids.append(inv_id)
         gate_ids.append(pauli)
 
         if self._verify_generation:
-            final_tableau = after_inv_tableau.then(gate_db.get_tableau(pauli))
+            self._verify_rb_sequence_tableau(gate_ids)
+        if self._verify_generation == "unitary":
+            final_tableau = clifford_tables.clifford_tableau(
+                clifford_tables.compose(after_inv_clifford, gate_db.get_clifford_id(pauli))
+            )
             self._verify_rb_sequence(gate_ids, final_tableau)
 
         return gate_ids
 
-    def _gen_qua_program(self, sequence_depths: list[int], num_repeats: int, num_averages: int, unsafe: bool):
+    def generate_sequences(
+        self, depths: List[int], n_per_depth: int, seed: SeedLike = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generates a batch of random sequences of this experiment (including its interleaving gate, if any) at once,
+        e.g. for offline analysis or simulation. The sequences are fully determined by `seed`; to shard a large batch
+        across processes, give each process a child seed, e.g.
+        ``np.random.SeedSequence(seed).spawn(num_processes)[process_index]``.
+
+        Args:
+            depths (List[int]): The number of Cliffords per sequence (not including the inverse).
+            n_per_depth (int): The number of sequences per depth.
+            seed: Seed of the NumPy random generator (or the generator itself).
+
+        Returns:
+            The gate ids of the sequences (a row per sequence, the sequences of depths[0] first), padded with -1, and
+            the length of every sequence.
+        """
+        sequences, lengths = generate_sequences(depths, n_per_depth, seed, self._interleaving_clifford)
+        if self._verify_generation:
+            final_cliffords = compose_sequences(sequences, lengths, self._interleaving_clifford)
+            if np.any(final_cliffords != clifford_tables.identity()):
+                raise RuntimeError("Verification of RB sequence failed")
+        return sequences, lengths
+
+    def _gen_qua_program(
+        self,
+        sequence_depths: list[int],
+        num_repeats: int,
+        num_averages: int,
+        unsafe: bool,
+        save_state_counts: bool = False,
+    ):
         with program() as prog:
             sequence_depth = declare(int)
             repeat = declare(int)
@@ -169,6 +264,9 @@ class TwoQubitRb:
                 qe: declare_input_stream(int, name=f"{self._input_stream_name(qe)}_is", size=self._buffer_length)
                 for qe in self._rb_baker.all_elements
             }
+            if save_state_counts:
+                state_counts = declare(int, size=4)
+                i = declare(int)
 
             assign(progress, 0)
             with for_(repeat, 0, repeat < num_repeats, repeat + 1):
@@ -179,19 +277,44 @@ class TwoQubitRb:
                     for gate_is in gates_is.values():
                         advance_input_stream(gate_is)
                     assign(length, gates_len_is[0])
+                    if save_state_counts:
+                        with for_(i, 0, i < 4, i + 1):
+                            assign(state_counts[i], 0)
                     with for_(n_avg, 0, n_avg < num_averages, n_avg + 1):
                         self._prep_func()
                         self._rb_baker.run(gates_is, length, unsafe=unsafe)
                         out1, out2 = self._measure_func()
                         assign(state, (Cast.to_int(out2) << 1) + Cast.to_int(out1))
-                        save(state, state_os)
-
+                        if save_state_counts:
+                            assign(state_counts[state], state_counts[state] + 1)
+                        else:
+                            save(state, state_os)
+                    if save_state_counts:
+                        with for_(i, 0, i < 4, i + 1):
+                            save(state_counts[i], state_os)
+
+            result_shapes = self._result_shapes(sequence_depths, num_repeats, num_averages, save_state_counts)
             with stream_processing():
-                state_os.buffer(num_repeats, len(sequence_depths), num_averages).save("state")
+                if save_state_counts:
+                    state_os.buffer(*result_shapes["state_counts"]).save("state_counts")
+                else:
+                    state_os.buffer(*result_shapes["state"]).save("state")
                 progress_os.save("progress")
 
         return prog
 
+    @staticmethod
+    def _result_shapes(
+        sequence_depths: List[int], num_repeats: int, num_averages: int, save_state_counts: bool = False
+    ) -> Dict[str, Tuple[int, ...]]:
+        """
+        Names of the results saved by the stream processing of the program, with their buffer shape (empty for results
+        which are not buffered).
+        """
+        if save_state_counts:
+            return {"state_counts": (num_repeats, len(sequence_depths), 4), "progress": ()}
+        return {"state": (num_repeats, len(sequence_depths), num_averages), "progress": ()}
+
     def _input_stream_name(self, element: str):
         return element.replace(".", "__dot__")
 
@@ -201,27 +324,66 @@ class TwoQubitRb:
             RuntimeError("Buffer is too small")
         return seq + [0] * (self._buffer_length - len(seq))
 
-    @run_in_thread
+    def _gen_input_stream_sequences(self, sequence_depths: List[int], num_repeats: int):
+        for repeat in range(num_repeats):
+            for sequence_depth in sequence_depths:
+                sequence = self._gen_rb_sequence(sequence_depth)
+                if self._sequence_tracker is not None:
+                    self._sequence_tracker.make_sequence(sequence)
+                decoded = {qe: self._decode_sequence_for_element(qe, sequence) for qe in self._rb_baker.all_elements}
+                yield sequence, decoded
+
+    def _insert_input_stream_batch(
+        self,
+        job: RunningQmJob,
+        batch: List[Tuple[List[int], Dict[str, List[int]]]],
+        callback: Optional[Callable[[List[int]], None]] = None,
+    ):
+        # One insertion per stream for the whole batch: the program advances each stream by fixed-size chunks
+        job.insert_input_stream("__gates_len_is__", [len(sequence) for sequence, _ in batch])
+        for qe in self._rb_baker.all_elements:
+            job.insert_input_stream(
+                f"{self._input_stream_name(qe)}_is", [op for _, decoded in batch for op in decoded[qe]]
+            )
+        if callback is not None:
+            for sequence, _ in batch:
+                callback(sequence)
+
     def _insert_all_input_stream(
         self,
         job: RunningQmJob,
         sequence_depths: List[int],
         num_repeats: int,
         callback: Optional[Callable[[List[int]], None]] = None,
-    ):
-        for repeat in range(num_repeats):
-            for sequence_depth in sequence_depths:
-                sequence = self._gen_rb_sequence(sequence_depth)
-                if self._sequence_tracker is not None:
-                    self._sequence_tracker.make_sequence(sequence)
-                job.insert_input_stream("__gates_len_is__", len(sequence))
-                for qe in self._rb_baker.all_elements:
-                    job.insert_input_stream(
-                        f"{self._input_stream_name(qe)}_is", self._decode_sequence_for_element(qe, sequence)
-                    )
+        max_queue_size: int = 64,
+        batch_size: int = 1,
+        on_inserted: Optional[Callable[[int], None]] = None,
+    ) -> InputStreamFeeder:
+        self._input_stream_feeder = InputStreamFeeder(
+            self._gen_input_stream_sequences(sequence_depths, num_repeats),
+            lambda batch: self._insert_input_stream_batch(job, batch, callback),
+            max_queue_size=max_queue_size,
+            batch_size=batch_size,
+            on_inserted=on_inserted,
+        )
+        return self._input_stream_feeder.start()
 
-                if callback is not None:
-                    callback(sequence)
+    @property
+    def input_stream_stats(self) -> Optional[FeederStats]:
+        """
+        Counters of the generation and insertion of the sequences in the input streams during the last run (queue depth,
+        time during which the insertion waited for the generation and sequences inserted per second), or None if the
+        experiment was not run.
+        """
+        return self._input_stream_feeder.stats if self._input_stream_feeder is not None else None
+
+    @property
+    def progress(self) -> Optional[ProgressSnapshot]:
+        """
+        Progress of the current (or last) run: sequences started and inserted, sequences/s, shots/s and estimated time
+        to completion, or None if the experiment was not run.
+        """
+        return self._progress.snapshot() if self._progress is not None else None
 
     def run(
         self,
@@ -230,6 +392,10 @@ class TwoQubitRb:
         num_circuits_per_depth: int,
         num_shots_per_circuit: int,
         unsafe: bool = False,
+        input_stream_queue_size: int = 64,
+        input_stream_batch_size: int = 1,
+        progress_callback: Optional[Callable[[ProgressSnapshot], None]] = None,
+        save_state_counts: bool = False,
         **kwargs,
     ):
         """
@@ -246,20 +412,61 @@ class TwoQubitRb:
                            guarantees correct behaviour but can lead to gaps, or "unsafely",
                            which reduces gaps but can cause unwanted behaviour. Note: as of
                            QOP 3.2.3, there seems to be an issue with "unsafe" compilation.
+            input_stream_queue_size (int): The maximal number of sequences generated ahead of their insertion in the
+                           input streams.
+            input_stream_batch_size (int): The maximal number of generated sequences inserted in the input streams
+                           together. The counters of the generation and insertion are available from
+                           `input_stream_stats`.
+            progress_callback (Callable[[ProgressSnapshot], None]): Optional callable called with the progress of the
+                           experiment (sequences started and inserted, sequences/s, shots/s and estimated time to
+                           completion) every time it is updated, e.g. for logging. The progress is also available from
+                           `progress`.
+            save_state_counts (bool): If True, the number of times each two-qubit state is measured is counted for
+                           every circuit in real time, and only these counts are streamed back, instead of the state
+                           measured in every shot. This divides the volume of the results by num_shots_per_circuit / 4,
+                           and the resulting `RBResult` only holds `state_counts`.
 
         """
-        prog = self._gen_qua_program(circuit_depths, num_circuits_per_depth, num_shots_per_circuit, unsafe)
+        prog = self._gen_qua_program(
+            circuit_depths, num_circuits_per_depth, num_shots_per_circuit, unsafe, save_state_counts
+        )
 
         qm = qmm.open_qm(self._config)
         job = qm.execute(prog)
 
+        full_progress = len(circuit_depths) * num_circuits_per_depth
+        self._progress = RBProgress(
+            full_progress, num_shots_per_circuit, lambda: job.result_handles.get("progress").fetch_all()
+        )
+
         gen_sequence_callback = kwargs["gen_sequence_callback"] if "gen_sequence_callback" in kwargs else None
-        self._insert_all_input_stream(job, circuit_depths, num_circuits_per_depth, gen_sequence_callback)
+        feeder = self._insert_all_input_stream(
+            job,
+            circuit_depths,
+            num_circuits_per_depth,
+            gen_sequence_callback,
+            max_queue_size=input_stream_queue_size,
+            batch_size=input_stream_batch_size,
+            on_inserted=self._progress.on_inserted,
+        )
 
-        full_progress = len(circuit_depths) * num_circuits_per_depth
-        pbar(job.result_handles, full_progress, "progress")
+        self._progress.wait(
+            is_running=lambda: job.result_handles.is_processing() and not feeder.failed, callback=progress_callback
+        )
+        if feeder.failed:
+            # the program would wait forever for the remaining sequences
+            job.halt()
+            feeder.join()
         job.result_handles.wait_for_all_values()
-
+        feeder.join()
+
+        if save_state_counts:
+            return RBResult(
+                circuit_depths=circuit_depths,
+                num_repeats=num_circuits_per_depth,
+                num_averages=num_shots_per_circuit,
+                state_counts=job.result_handles.get("state_counts").fetch_all(),
+            )
         return RBResult(
             circuit_depths=circuit_depths,
             num_repeats=num_circuits_per_depth,
@@ -267,6 +474,13 @@ class TwoQubitRb:
             state=job.result_handles.get("state").fetch_all(),
         )
 
+    def get_baking_dedup_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns, for each element, the number of commands and the number of unique baked waveforms they were
+        deduplicated into (i.e. the number of cases of the switch statement playing the commands).
+        """
+        return self._rb_baker.dedup_stats
+
     def print_command_mapping(self):
         """
         Prints the mapping of Command ID index, which is understood by the
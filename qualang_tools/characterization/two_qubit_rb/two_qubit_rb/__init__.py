@@ -2,6 +2,7 @@ from .TwoQubitRB import TwoQubitRb
 from .TwoQubitRBDebugger import TwoQubitRbDebugger
 from .simple_tableau import SimpleTableau
 from .RBBaker import RBBaker
+from .bake_cache import RBBakeCache
 from .gates import gate_db
 
-__all__ = ["TwoQubitRb", "TwoQubitRbDebugger", "SimpleTableau", "RBBaker", "gate_db"]
+__all__ = ["TwoQubitRb", "TwoQubitRbDebugger", "SimpleTableau", "RBBaker", "RBBakeCache", "gate_db"]
@@ -0,0 +1,185 @@
+import dataclasses
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+# Bump when the content or the meaning of the cached entries changes
+_CACHE_FORMAT_VERSION = 1
+
+# Parts of the config read by the baking of the Clifford commands
+_BAKED_CONFIG_KEYS = ("elements", "pulses", "waveforms", "digital_waveforms")
+
+
+@dataclasses.dataclass
+class BakedOp:
+    """
+    Baked operation played by an element for a Clifford command, and frame rotation (in radians) applied on the element
+    after playing it.
+    """
+
+    name: str
+    frame_rotation: float
+
+
+@dataclasses.dataclass
+class RBBakeCacheEntry:
+    """
+    Result of baking all the Clifford commands for a given config, gate generators and interleaving gate.
+    """
+
+    all_elements: Set[str]
+    cmd_to_op: Dict[str, Dict[int, int]]
+    op_to_baking: Dict[str, List[BakedOp]]
+    config_fragment: Dict[str, dict]
+    commands: dict
+
+
+def _fingerprint_code(code: CodeType, h) -> None:
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _fingerprint_code(const, h)
+        else:
+            h.update(repr(const).encode())
+
+
+def _fingerprint_callable(fn: Callable, h) -> None:
+    fn = inspect.unwrap(fn)
+    h.update(f"{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', repr(fn))}".encode())
+    h.update(repr(getattr(fn, "version", None)).encode())
+    code = getattr(fn, "__code__", None)
+    if code is not None:
+        _fingerprint_code(code, h)
+        h.update(repr(fn.__defaults__).encode())
+
+
+def _json_default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return repr(obj)
+
+
+def config_fragment_diff(base_config: dict, config: dict) -> Dict[str, dict]:
+    """
+    Returns the operations, pulses, waveforms and digital waveforms present in config but not in base_config.
+    """
+    fragment = {"operations": {}}
+    for qe, element in config["elements"].items():
+        base_operations = base_config["elements"].get(qe, {}).get("operations", {})
+        new_operations = {op: pulse for op, pulse in element["operations"].items() if op not in base_operations}
+        if new_operations:
+            fragment["operations"][qe] = new_operations
+    for key in _BAKED_CONFIG_KEYS[1:]:
+        base_entries = base_config.get(key, {})
+        fragment[key] = {name: value for name, value in config.get(key, {}).items() if name not in base_entries}
+    return fragment
+
+
+def merge_config_fragment(config: dict, fragment: Dict[str, dict]) -> None:
+    """
+    Adds the content of a fragment returned by config_fragment_diff to config.
+    """
+    for qe, operations in fragment["operations"].items():
+        config["elements"][qe]["operations"].update(operations)
+    for key in _BAKED_CONFIG_KEYS[1:]:
+        if fragment[key]:
+            config.setdefault(key, {}).update(fragment[key])
+
+
+class RBBakeCache:
+    """
+    Persistent on-disk cache of the baked two-qubit Clifford commands.
+
+    Entries are keyed on a hash of the parts of the config used for baking, of the code of the gate generators and of
+    the interleaving gate. The code of the generators is hashed, but not the global variables they read: either
+    give them a ``version`` attribute which is changed with these values, or invalidate the cache explicitly.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self._cache_dir = Path(cache_dir)
+
+    @property
+    def cache_dir(self) -> Path:
+        return self._cache_dir
+
+    @staticmethod
+    def key(
+        config: dict,
+        single_qubit_gate_generator: Callable,
+        two_qubit_gate_generators: Dict[str, Callable],
+        interleaving_gate: Optional[list] = None,
+    ) -> str:
+        """
+        Computes the cache key for the baking of the Clifford commands.
+
+        Args:
+            config: QUA config in which the commands are baked.
+            single_qubit_gate_generator: The single qubit gate generator.
+            two_qubit_gate_generators: The two qubit gate generators.
+            interleaving_gate: The interleaving gate, as list of cirq GateOperation.
+        """
+        h = hashlib.sha256(f"v{_CACHE_FORMAT_VERSION}".encode())
+        config_subset = {key: config.get(key, {}) for key in _BAKED_CONFIG_KEYS}
+        h.update(json.dumps(config_subset, sort_keys=True, default=_json_default).encode())
+        _fingerprint_callable(single_qubit_gate_generator, h)
+        for name in sorted(two_qubit_gate_generators):
+            h.update(name.encode())
+            _fingerprint_callable(two_qubit_gate_generators[name], h)
+        h.update(repr(interleaving_gate).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._cache_dir / f"rb_bake_{key}.pkl"
+
+    def load(self, key: str) -> Optional[RBBakeCacheEntry]:
+        """
+        Returns the cached entry for key, or None if there is no (readable) entry for it.
+        """
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        return entry if isinstance(entry, RBBakeCacheEntry) else None
+
+    def save(self, key: str, entry: RBBakeCacheEntry) -> None:
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file first so that concurrent scripts never read a partially written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """
+        Removes the entry for key from the cache, or all the entries if no key is given.
+
+        Returns:
+            The number of removed entries.
+        """
+        paths: Tuple[Path, ...] = (
+            (self._path(key),) if key is not None else tuple(self._cache_dir.glob("rb_bake_*.pkl"))
+        )
+        removed = 0
+        for path in paths:
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
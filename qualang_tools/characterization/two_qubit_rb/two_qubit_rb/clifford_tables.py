@@ -0,0 +1,154 @@
+"""
+Integer encoding of the two-qubit Clifford group (up to a global phase) with precomputed composition and inverse tables.
+
+A Clifford is encoded as ``symplectic_index * 16 + alpha_bits``, where ``symplectic_index`` is the index of its
+symplectic matrix ``g`` among the 720 symplectic 4x4 binary matrices, and ``alpha_bits`` packs its phase vector
+``alpha`` (``alpha[k]`` is bit ``k``). Composing two Cliffords then costs a few table lookups instead of building and
+validating a new `SimpleTableau`.
+"""
+
+import functools
+from typing import NamedTuple
+
+import numpy as np
+
+from .simple_tableau import SimpleTableau, _lambda
+
+NUM_SYMPLECTICS = 720
+NUM_PHASES = 16
+NUM_CLIFFORDS = NUM_SYMPLECTICS * NUM_PHASES
+
+_BIT_WEIGHTS_G = (1 << np.arange(16, dtype=np.int64)).reshape(4, 4)
+_BIT_WEIGHTS_ALPHA = 1 << np.arange(4, dtype=np.int64)
+
+# beta lookup table of simple_tableau, with the Pauli (x, z) encoded as x + 2 * z
+_BETA_LUT = np.array([[0, 0, 0, 0], [0, 0, 3, 1], [0, 1, 0, 3], [0, 3, 1, 0]], dtype=np.uint8)
+
+
+class _Tables(NamedTuple):
+    symplectics: np.ndarray  # (720, 4, 4) symplectic matrices
+    symplectic_index: np.ndarray  # (65536,) index of the packed symplectic matrices, -1 for other matrices
+    product: np.ndarray  # (720, 720) index of g2 @ g1 for g1 followed by g2
+    phase_action: np.ndarray  # (720, 16) packed g1^T @ alpha2
+    phase_correction: np.ndarray  # (720, 720) packed b(g1, g2) / 2, see simple_tableau._calc_b_i
+    inverse: np.ndarray  # (11520,) encoded inverse of every Clifford
+
+
+def _pack_g(g: np.ndarray) -> np.ndarray:
+    return (g.astype(np.int64) * _BIT_WEIGHTS_G).sum(axis=(-2, -1))
+
+
+def _pack_alpha(alpha: np.ndarray) -> np.ndarray:
+    return (alpha.astype(np.int64) * _BIT_WEIGHTS_ALPHA).sum(axis=-1)
+
+
+def _unpack_alpha(alpha_bits: np.ndarray) -> np.ndarray:
+    return ((np.asarray(alpha_bits)[..., None] >> np.arange(4)) & 1).astype(np.uint8)
+
+
+def _pauli_codes(v: np.ndarray) -> np.ndarray:
+    # (..., 4) -> (..., 2) Pauli codes of both qubits
+    return v[..., ::2] + 2 * v[..., 1::2]
+
+
+def _phase_corrections(symplectics: np.ndarray) -> np.ndarray:
+    """Vectorized simple_tableau._calc_b_i for all pairs of symplectic matrices and all columns."""
+    g1 = symplectics[:, None, :, :]  # (720, 1, 4, 4)
+    g2 = symplectics[None, :, :, :]  # (1, 720, 4, 4)
+    b = np.zeros((NUM_SYMPLECTICS, NUM_SYMPLECTICS, 4), dtype=np.uint8)
+    for i in range(4):
+        col = g1[..., :, i]  # (720, 1, 4)
+        b_i = np.broadcast_to((col[..., 0] * col[..., 1] + col[..., 2] * col[..., 3]) % 4, b.shape[:2]).copy()
+        current = np.zeros(b.shape[:2] + (4,), dtype=np.uint8)
+        for j in range(4):
+            v = col[..., j, None] * g2[..., :, j]  # (720, 720, 4)
+            current_codes, v_codes = _pauli_codes(current), _pauli_codes(v)
+            b_i = (b_i + _BETA_LUT[current_codes, v_codes].sum(axis=-1)) % 4
+            current = (current + v) % 2
+        b[..., i] = b_i
+    if np.any(b % 2):
+        raise RuntimeError("inconsistent phase correction in Clifford tables")
+    return _pack_alpha(b // 2).astype(np.uint8)
+
+
+@functools.lru_cache(maxsize=None)
+def _tables() -> _Tables:
+    all_matrices = ((np.arange(1 << 16)[:, None] >> np.arange(16)) & 1).astype(np.uint8).reshape(-1, 4, 4)
+    lam = _lambda(2).astype(np.uint8)
+    is_symplectic = np.all((all_matrices @ lam @ all_matrices.transpose(0, 2, 1)) % 2 == lam, axis=(1, 2))
+    symplectics = all_matrices[is_symplectic]
+    if len(symplectics) != NUM_SYMPLECTICS:
+        raise RuntimeError(f"expected {NUM_SYMPLECTICS} symplectic matrices, found {len(symplectics)}")
+
+    symplectic_index = np.full(1 << 16, -1, dtype=np.int16)
+    symplectic_index[_pack_g(symplectics)] = np.arange(NUM_SYMPLECTICS)
+
+    products = symplectics[None, :, :, :] @ symplectics[:, None, :, :] % 2  # [i, j] = g_j @ g_i
+    product = symplectic_index[_pack_g(products)]
+
+    alphas = _unpack_alpha(np.arange(NUM_PHASES))  # (16, 4)
+    actions = symplectics.transpose(0, 2, 1)[:, None, :, :] @ alphas[None, :, :, None] % 2  # (720, 16, 4, 1)
+    phase_action = _pack_alpha(actions[..., 0]).astype(np.uint8)
+
+    phase_correction = _phase_corrections(symplectics)
+
+    # inverse of (s, a) is (s_inv, a_inv) with a ^ phase_action[s, a_inv] ^ phase_correction[s, s_inv] == 0
+    inverse_symplectic = symplectic_index[_pack_g(lam @ symplectics.transpose(0, 2, 1) @ lam % 2)]
+    inverse_action = np.empty((NUM_SYMPLECTICS, NUM_PHASES), dtype=np.int64)
+    inverse_action[np.arange(NUM_SYMPLECTICS)[:, None], phase_action] = np.arange(NUM_PHASES)
+    s = np.arange(NUM_CLIFFORDS) // NUM_PHASES
+    a = np.arange(NUM_CLIFFORDS) % NUM_PHASES
+    a_inv = inverse_action[s, a ^ phase_correction[s, inverse_symplectic[s]]]
+    inverse = (inverse_symplectic[s] * NUM_PHASES + a_inv).astype(np.int16)
+
+    return _Tables(symplectics, symplectic_index, product, phase_action, phase_correction, inverse)
+
+
+def clifford_id(tableau: SimpleTableau) -> int:
+    """Returns the integer encoding of a two-qubit `SimpleTableau`."""
+    if tableau.n != 2:
+        raise ValueError(f"only two-qubit tableaus can be encoded, got {tableau.n} qubits")
+    return int(_tables().symplectic_index[_pack_g(tableau.g)]) * NUM_PHASES + int(_pack_alpha(tableau.alpha))
+
+
+def clifford_ids(g: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """Vectorized `clifford_id` of the tableaus with symplectic matrices g (N x 4 x 4) and phases alpha (N x 4)."""
+    return _tables().symplectic_index[_pack_g(g)].astype(np.int64) * NUM_PHASES + _pack_alpha(alpha)
+
+
+def clifford_tableau(clifford: int) -> SimpleTableau:
+    """Returns the `SimpleTableau` of an encoded Clifford."""
+    s, a = divmod(clifford, NUM_PHASES)
+    return SimpleTableau(_tables().symplectics[s], _unpack_alpha(a))
+
+
+def compose(first: int, second: int) -> int:
+    """Encoded Clifford applying first and then second, i.e. the equivalent of ``first.then(second)``."""
+    tables = _tables()
+    s1, a1 = divmod(first, NUM_PHASES)
+    s2, a2 = divmod(second, NUM_PHASES)
+    s = tables.product[s1, s2]
+    return int(s) * NUM_PHASES + (a1 ^ int(tables.phase_action[s1, a2]) ^ int(tables.phase_correction[s1, s2]))
+
+
+def inverse(clifford: int) -> int:
+    """Encoded inverse of an encoded Clifford."""
+    return int(_tables().inverse[clifford])
+
+
+def compose_array(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Element-wise `compose` of arrays of encoded Cliffords."""
+    tables = _tables()
+    s1, a1 = np.divmod(first, NUM_PHASES)
+    s2, a2 = np.divmod(second, NUM_PHASES)
+    return tables.product[s1, s2] * NUM_PHASES + (a1 ^ tables.phase_action[s1, a2] ^ tables.phase_correction[s1, s2])
+
+
+def inverse_array(cliffords: np.ndarray) -> np.ndarray:
+    """Element-wise `inverse` of an array of encoded Cliffords."""
+    return _tables().inverse[cliffords]
+
+
+@functools.lru_cache(maxsize=None)
+def identity() -> int:
+    return clifford_id(SimpleTableau(np.eye(4), [0, 0, 0, 0]))
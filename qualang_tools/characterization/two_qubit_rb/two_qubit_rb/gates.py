@@ -1,12 +1,14 @@
 from ._cirq import import_cirq
+from . import clifford_tables
 from .simple_tableau import SimpleTableau
 
 import dataclasses
+import functools
 import os
 import pathlib
 import pickle
 import random
-from typing import Set, List
+from typing import Dict, List, NamedTuple, Set, Tuple
 
 import numpy as np
 
@@ -207,62 +209,162 @@ class GateCommand:
             raise RuntimeError("q should be 0 or 1")
 
 
-class _GateDatabase:
-    def __init__(self):
-        self._commands, self._tableaus, self._symplectic_range, self._pauli_range = self._gen_commands_and_tableaus()
+_COMPILATION_DIR = pathlib.Path(os.path.dirname(os.path.abspath(__file__)))
+_COMPILATION_NPZ_PATH = _COMPILATION_DIR / "symplectic_compilation_XZ.npz"
+_COMPILATION_PKL_PATH = _COMPILATION_DIR / "symplectic_compilation_XZ.pkl"
+
+# Command types of the compilation, as encoded in the first column of the "commands" array of the .npz
+_COMPILATION_COMMAND_TYPES = ["C1", "CNOT", "iSWAP", "SWAP"]
+
+
+def _compilation_arrays_from_pkl(pkl_path: pathlib.Path) -> Dict[str, np.ndarray]:
+    with open(pkl_path, "rb") as f:
+        compilation = pickle.load(f)
+    commands = np.full((len(compilation["commands"]), 5), -1, dtype=np.int8)
+    for i, command in enumerate(compilation["commands"]):
+        commands[i, 0] = _COMPILATION_COMMAND_TYPES.index(command[0].removesuffix("'s"))
+        commands[i, 1 : len(command)] = command[1:]
+    return {
+        "symplectics": np.asarray(compilation["symplectics"], dtype=np.uint8),
+        "phases": np.asarray(compilation["phases"], dtype=np.uint8),
+        "commands": commands,
+    }
 
-    @staticmethod
-    def _gen_commands_and_tableaus():
-        compilation_path = pathlib.Path(os.path.dirname(os.path.abspath(__file__))) / "symplectic_compilation_XZ.pkl"
-        with open(compilation_path, "rb") as f:
-            compilation = pickle.load(f)
-        symplectics = compilation["symplectics"]
-        phases = compilation["phases"]
-        commands = compilation["commands"]
 
+def save_compilation_npz(
+    pkl_path: pathlib.Path = _COMPILATION_PKL_PATH, npz_path: pathlib.Path = _COMPILATION_NPZ_PATH
+) -> None:
+    """
+    Generates the compact .npz representation of the symplectic compilation loaded by the gate database from the
+    original pickle. The arrays are stored uncompressed, so that they are loaded without decompression.
+    """
+    np.savez(npz_path, **_compilation_arrays_from_pkl(pkl_path))
+
+
+class _GateData(NamedTuple):
+    commands: List["GateCommand"]
+    g: np.ndarray  # (num_of_gates, 4, 4) symplectic matrices
+    alpha: np.ndarray  # (num_of_gates, 4) phases
+    symplectic_range: Tuple[int, int]
+    pauli_range: Tuple[int, int]
+    # Gate ids indexed by the bytes of the symplectic matrix g (symplectic gates) and of alpha (Pauli gates)
+    symplectic_id_by_g: Dict[bytes, int]
+    pauli_id_by_alpha: Dict[bytes, int]
+
+
+class _GateDatabase:
+    """
+    Database of the symplectic and Pauli gates comprising the two-qubit Cliffords.
+
+    The compilation is loaded on first use, and the `SimpleTableau` of a gate is only built when requested.
+    """
+
+    def __init__(self, compilation_path: pathlib.Path = _COMPILATION_NPZ_PATH):
+        self._compilation_path = compilation_path
+        self._tableaus: Dict[int, SimpleTableau] = {}
+        self._clifford_ids = None
+        self._clifford_ids_list = None
+
+    def _load_compilation(self) -> Dict[str, np.ndarray]:
+        if self._compilation_path.exists():
+            with np.load(self._compilation_path) as npz:
+                return {key: npz[key] for key in npz.files}
+        return _compilation_arrays_from_pkl(self._compilation_path.with_suffix(".pkl"))
+
+    @functools.cached_property
+    def _data(self) -> _GateData:
+        compilation = self._load_compilation()
         rb_commands = []
-        for command in commands:
-            if command[0] == "C1's":
-                rb_commands.append(GateCommand("C1", (command[1],), (command[2],)))
-            elif command[0] == "CNOT's":
-                rb_commands.append(GateCommand("CNOT", (command[1], command[3]), (command[2], command[4])))
-            elif command[0] == "iSWAP's":
-                rb_commands.append(GateCommand("iSWAP", (command[1], command[3]), (command[2], command[4])))
-            elif command[0] == "SWAP's":
-                rb_commands.append(GateCommand("SWAP", (command[1],), (command[2],)))
+        for command in compilation["commands"].tolist():
+            command_type = _COMPILATION_COMMAND_TYPES[command[0]]
+            if command_type in ("C1", "SWAP"):
+                rb_commands.append(GateCommand(command_type, (command[1],), (command[2],)))
+            else:
+                rb_commands.append(GateCommand(command_type, (command[1], command[3]), (command[2], command[4])))
 
         # Generate Paulis:
+        pauli_alphas = []
         for i1 in range(len(pauli)):
             for i2 in range(len(pauli)):
                 rb_commands.append(GateCommand("PAULI", (i1,), (i2,)))
+                pauli_alphas.append(pauli_phase[i1] + pauli_phase[i2])
+
+        num_of_symplectics = len(compilation["symplectics"])
+        g = np.concatenate(
+            [compilation["symplectics"], np.broadcast_to(np.eye(4, dtype=np.uint8), (len(pauli_alphas), 4, 4))]
+        )
+        alpha = np.concatenate([compilation["phases"], np.array(pauli_alphas, dtype=np.uint8)])
+
+        symplectic_range = (0, num_of_symplectics)
+        pauli_range = (num_of_symplectics, len(rb_commands))
+        return _GateData(
+            commands=rb_commands,
+            g=g,
+            alpha=alpha,
+            symplectic_range=symplectic_range,
+            pauli_range=pauli_range,
+            symplectic_id_by_g={g[i].tobytes(): i for i in range(*symplectic_range)},
+            pauli_id_by_alpha={alpha[i].tobytes(): i for i in range(*pauli_range)},
+        )
 
-        tableaus = []
-        for i in range(len(symplectics)):
-            tableaus.append(SimpleTableau(symplectics[i], phases[i]))
-
-        # Generate Paulis:
-        for i1 in range(len(pauli)):
-            for i2 in range(len(pauli)):
-                tableaus.append(SimpleTableau(np.eye(4), pauli_phase[i1] + pauli_phase[i2]))
+    @property
+    def _symplectic_range(self) -> Tuple[int, int]:
+        return self._data.symplectic_range
 
-        symplectic_range = (0, len(commands))
-        pauli_range = (len(commands), len(rb_commands))
-        return rb_commands, tableaus, symplectic_range, pauli_range
+    @property
+    def _pauli_range(self) -> Tuple[int, int]:
+        return self._data.pauli_range
 
     @property
     def commands(self):
-        return self._commands
+        return self._data.commands
 
-    @property
-    def tableaus(self):
-        return self._tableaus
+    @functools.cached_property
+    def tableaus(self) -> List[SimpleTableau]:
+        """The tableaus of all the gates, built once on first access."""
+        return [self.get_tableau(gate_id) for gate_id in range(len(self._data.commands))]
 
     def get_command(self, gate_id) -> GateCommand:
-        return self._commands[gate_id]
+        return self._data.commands[gate_id]
 
     def get_tableau(self, gate_id) -> SimpleTableau:
+        if gate_id not in self._tableaus:
+            self._tableaus[gate_id] = SimpleTableau(self._data.g[gate_id], self._data.alpha[gate_id])
         return self._tableaus[gate_id]
 
+    @property
+    def clifford_ids(self) -> np.ndarray:
+        """The Cliffords of all the gates, encoded as in `clifford_tables`."""
+        if self._clifford_ids is None:
+            self._clifford_ids = clifford_tables.clifford_ids(self._data.g, self._data.alpha)
+            self._clifford_ids_list = self._clifford_ids.tolist()
+        return self._clifford_ids
+
+    def get_clifford_id(self, gate_id) -> int:
+        """Returns the Clifford of a gate, encoded as in `clifford_tables`."""
+        if self._clifford_ids is None:
+            _ = self.clifford_ids
+        return self._clifford_ids_list[gate_id]
+
+    @functools.cached_property
+    def _gate_id_by_clifford_part(self) -> Tuple[np.ndarray, np.ndarray]:
+        clifford_ids = self.clifford_ids
+        symplectic_ids = np.arange(*self._symplectic_range)
+        pauli_ids = np.arange(*self._pauli_range)
+        symplectic_id_by_index = np.full(clifford_tables.NUM_SYMPLECTICS, -1, dtype=np.int16)
+        symplectic_id_by_index[clifford_ids[symplectic_ids] // clifford_tables.NUM_PHASES] = symplectic_ids
+        pauli_id_by_alpha = np.full(clifford_tables.NUM_PHASES, -1, dtype=np.int16)
+        pauli_id_by_alpha[clifford_ids[pauli_ids] % clifford_tables.NUM_PHASES] = pauli_ids
+        return symplectic_id_by_index, pauli_id_by_alpha
+
+    def find_symplectic_gate_ids_by_clifford_ids(self, clifford_ids: np.ndarray) -> np.ndarray:
+        """Vectorized `find_symplectic_gate_id_by_tableau_g` for encoded Cliffords."""
+        return self._gate_id_by_clifford_part[0][np.asarray(clifford_ids) // clifford_tables.NUM_PHASES]
+
+    def find_pauli_gate_ids_by_clifford_ids(self, clifford_ids: np.ndarray) -> np.ndarray:
+        """Vectorized `find_pauli_gate_id_by_tableau_alpha` for encoded Cliffords."""
+        return self._gate_id_by_clifford_part[1][np.asarray(clifford_ids) % clifford_tables.NUM_PHASES]
+
     def rand_symplectic(self):
         return random.randrange(*self._symplectic_range)
 
@@ -273,12 +375,10 @@ class _GateDatabase:
         return self._pauli_range[1]
 
     def find_symplectic_gate_id_by_tableau_g(self, tableau: SimpleTableau):
-        tableaus = self._tableaus[self._symplectic_range[0] : self._symplectic_range[1]]
-        return next(i for i, x in enumerate(tableaus) if np.array_equal(x.g, tableau.g))
+        return self._data.symplectic_id_by_g[tableau.g.tobytes()]
 
     def find_pauli_gate_id_by_tableau_alpha(self, tableau: SimpleTableau):
-        tableaus = self._tableaus[self._pauli_range[0] : self._pauli_range[1]]
-        return self._pauli_range[0] + next(i for i, x in enumerate(tableaus) if np.array_equal(x.alpha, tableau.alpha))
+        return self._data.pauli_id_by_alpha[tableau.alpha.tobytes()]
 
 
 gate_db = _GateDatabase()
@@ -0,0 +1,193 @@
+import dataclasses
+import queue
+import threading
+import time
+from typing import Callable, Generic, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Marks the end of the generated items in the queue
+_END = object()
+
+
+@dataclasses.dataclass
+class FeederStats:
+    """
+    Counters of an `InputStreamFeeder`, updated while it runs.
+
+    Attributes:
+        generated: Number of items generated (and queued) so far.
+        inserted: Number of items inserted so far.
+        batches: Number of batches inserted so far.
+        max_queue_depth: Largest number of generated items waiting to be inserted.
+        stall_time: Time (in seconds) spent by the inserter waiting for items to be generated, i.e. during which the
+            generation was the bottleneck.
+        insert_time: Time (in seconds) spent inserting items.
+    """
+
+    generated: int = 0
+    inserted: int = 0
+    batches: int = 0
+    max_queue_depth: int = 0
+    stall_time: float = 0.0
+    insert_time: float = 0.0
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    _queue_depth_sum: int = dataclasses.field(default=0, repr=False)
+
+    @property
+    def elapsed_time(self) -> float:
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time if self.end_time is not None else time.perf_counter()) - self.start_time
+
+    @property
+    def mean_queue_depth(self) -> float:
+        return self._queue_depth_sum / self.batches if self.batches else 0.0
+
+    @property
+    def sequences_per_second(self) -> float:
+        elapsed_time = self.elapsed_time
+        return self.inserted / elapsed_time if elapsed_time > 0 else 0.0
+
+
+class InputStreamFeeder(Generic[T]):
+    """
+    Producer/consumer feeder of input streams.
+
+    A generation thread iterates over `items` and puts them in a bounded queue, running ahead of an insertion thread
+    which takes up to `batch_size` items at a time from the queue and passes them to `insert_batch`. When the queue is
+    full, generation waits for the insertion to catch up.
+
+    Args:
+        items: Iterable (typically a generator) of the items to insert, iterated in the generation thread.
+        insert_batch: Callable inserting a list of items, called in the insertion thread.
+        max_queue_size: Maximal number of generated items waiting to be inserted.
+        batch_size: Maximal number of items inserted together.
+        on_inserted: Optional callable acknowledging the number of items of every inserted batch, called in the
+            insertion thread.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[T],
+        insert_batch: Callable[[List[T]], None],
+        max_queue_size: int = 64,
+        batch_size: int = 1,
+        on_inserted: Optional[Callable[[int], None]] = None,
+    ):
+        if max_queue_size < 1 or batch_size < 1:
+            raise ValueError("max_queue_size and batch_size must be positive")
+        self._items = items
+        self._insert_batch = insert_batch
+        self._batch_size = batch_size
+        self._on_inserted = on_inserted
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._stats = FeederStats()
+        self._threads = [
+            threading.Thread(target=self._generate, name="input-stream-generation", daemon=True),
+            threading.Thread(target=self._insert, name="input-stream-insertion", daemon=True),
+        ]
+
+    @property
+    def stats(self) -> FeederStats:
+        return self._stats
+
+    def start(self) -> "InputStreamFeeder[T]":
+        self._stats.start_time = time.perf_counter()
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stops generating and inserting items."""
+        self._stop.set()
+
+    @property
+    def failed(self) -> bool:
+        """Whether generating or inserting the items raised an error, which `join` raises."""
+        return self._error is not None
+
+    def is_alive(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def join(self, timeout: Optional[float] = None):
+        """
+        Waits for all the items to be inserted, and raises the error raised while generating or inserting them, if any.
+        """
+        for thread in self._threads:
+            thread.join(timeout)
+        if self._error is not None:
+            raise self._error
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _generate(self):
+        try:
+            for item in self._items:
+                if not self._put(item):
+                    return
+                self._stats.generated += 1
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(_END)
+
+    def _get(self):
+        while not self._stop.is_set():
+            try:
+                return self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return _END
+
+    def _insert(self):
+        try:
+            done = False
+            while not done:
+                start = time.perf_counter()
+                item = self._get()
+                self._stats.stall_time += time.perf_counter() - start
+                if item is _END:
+                    break
+
+                queue_depth = self._queue.qsize() + 1
+                self._stats.max_queue_depth = max(self._stats.max_queue_depth, queue_depth)
+                self._stats._queue_depth_sum += queue_depth
+
+                batch = [item]
+                while len(batch) < self._batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _END:
+                        done = True
+                        break
+                    batch.append(item)
+
+                start = time.perf_counter()
+                self._insert_batch(batch)
+                self._stats.insert_time += time.perf_counter() - start
+                self._stats.inserted += len(batch)
+                self._stats.batches += 1
+                if self._on_inserted is not None:
+                    self._on_inserted(len(batch))
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._stats.end_time = time.perf_counter()
+
+    def _fail(self, error: BaseException):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
@@ -0,0 +1,265 @@
+"""
+Offline stand-in for the OPX, to run (and benchmark) the whole two-qubit RB pipeline without any hardware.
+
+The job returned by `OfflineRBBackend` consumes the sequences inserted in the input streams by `TwoQubitRb.run`, decodes
+them back to commands, and simulates the measured states with a noisy tableau simulation: every command is followed by
+a random two-qubit Pauli error with probability `depolarizing_probability` (a depolarizing channel), and every measured
+qubit is flipped with probability `readout_error`. The results are saved under the stream names, and with the buffer
+shapes, of the stream processing of the program built by `TwoQubitRb`.
+"""
+
+import queue
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import clifford_tables
+from .gates import gate_db
+from .RBResult import RBResult
+
+if TYPE_CHECKING:
+    from .TwoQubitRB import TwoQubitRb
+
+_GATES_LEN_STREAM = "__gates_len_is__"
+
+# Alpha bits of the Pauli frame which flip the measurement of the first and second qubit (X errors on them)
+_QUBIT_FLIP_BITS = (1, 3)
+
+
+def simulate_noisy_sequence(
+    command_cliffords: np.ndarray,
+    num_shots: int,
+    depolarizing_probability: float,
+    readout_error: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Simulates the measured two-qubit states of `num_shots` shots of a sequence of Cliffords (encoded as in
+    `clifford_tables`) starting from |00>, with a depolarizing channel after every Clifford and readout errors.
+
+    Returns:
+        The measured states (0 to 3, the first qubit being the least significant bit) of every shot.
+    """
+    identity = clifford_tables.identity()
+    cliffords = np.full(num_shots, identity, dtype=np.int64)
+    for command_clifford in command_cliffords:
+        cliffords = clifford_tables.compose_array(cliffords, command_clifford)
+        errors = np.flatnonzero(rng.random(num_shots) < depolarizing_probability)
+        if len(errors):
+            paulis = identity + rng.integers(clifford_tables.NUM_PHASES, size=len(errors))
+            cliffords[errors] = clifford_tables.compose_array(cliffords[errors], paulis)
+
+    symplectics, pauli_frames = np.divmod(cliffords, clifford_tables.NUM_PHASES)
+    if np.any(symplectics != identity // clifford_tables.NUM_PHASES):
+        raise RuntimeError("The simulated sequence does not invert to the identity")
+    state = np.zeros(num_shots, dtype=np.int64)
+    for qubit, bit in enumerate(_QUBIT_FLIP_BITS):
+        flipped = ((pauli_frames >> bit) & 1).astype(bool) ^ (rng.random(num_shots) < readout_error)
+        state |= flipped.astype(np.int64) << qubit
+    return state
+
+
+class _OfflineResultFetcher:
+    def __init__(self, job: "OfflineRBJob", name: str):
+        self._job = job
+        self._name = name
+
+    def fetch_all(self):
+        return self._job._fetch(self._name)
+
+    def wait_for_all_values(self, timeout: Optional[float] = None) -> bool:
+        return self._job._done.wait(timeout)
+
+
+class _OfflineResultHandles:
+    def __init__(self, job: "OfflineRBJob"):
+        self._job = job
+
+    def get(self, name: str) -> _OfflineResultFetcher:
+        return _OfflineResultFetcher(self._job, name)
+
+    def is_processing(self) -> bool:
+        return not self._job._done.is_set()
+
+    def wait_for_all_values(self, timeout: Optional[float] = None) -> bool:
+        return self._job._done.wait(timeout)
+
+
+class OfflineRBJob:
+    """
+    Stand-in for the running job of a `TwoQubitRb` program, simulating the sequences as they are inserted in the input
+    streams in a separate thread (the "OPX"). Created by `OfflineRBBackend`.
+    """
+
+    def __init__(
+        self,
+        rb: "TwoQubitRb",
+        result_shapes: Dict[str, Tuple[int, ...]],
+        num_shots_per_circuit: int,
+        depolarizing_probability: float,
+        readout_error: float,
+        rng: np.random.Generator,
+    ):
+        elements = sorted(rb._rb_baker.all_elements)
+        if not elements:
+            raise RuntimeError("The sequences can not be decoded, as no element is played by the baked commands")
+        self._stream_elements = {f"{rb._input_stream_name(qe)}_is": qe for qe in elements}
+        self._command_by_ops = {}
+        for command_id in rb._rb_baker.cmd_to_op[elements[0]]:
+            ops = tuple(rb._rb_baker.decode(command_id, qe) for qe in elements)
+            self._command_by_ops.setdefault(ops, command_id)
+        self._elements = elements
+        self._buffer_length = rb._buffer_length
+        interleaving_clifford = rb._interleaving_clifford if rb._interleaving_clifford is not None else -1
+        self._command_cliffords = np.append(gate_db.clifford_ids, interleaving_clifford)
+
+        self._streams = result_shapes
+        self._num_shots = num_shots_per_circuit
+        self._depolarizing_probability = depolarizing_probability
+        self._readout_error = readout_error
+        self._rng = rng
+
+        buffer_shape = self._streams.get("state", self._streams.get("state_counts"))
+        self._num_sequences = int(np.prod(buffer_shape[:-1]))
+        self._states = np.zeros((self._num_sequences, num_shots_per_circuit), dtype=np.int64)
+        self._lengths: List[int] = []
+        self._inserted: Dict[str, List[List[int]]] = {stream: [] for stream in self._stream_elements}
+        self._num_queued = 0
+        self._num_started = 0
+        self._sequences = queue.Queue()
+        self._done = threading.Event()
+        self._halted = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.result_handles = _OfflineResultHandles(self)
+        threading.Thread(target=self._simulate_all, name="offline-rb-job", daemon=True).start()
+
+    def insert_input_stream(self, name: str, data):
+        # The values of several sequences can be inserted at once, as consecutive chunks of the size of the stream
+        if name == _GATES_LEN_STREAM:
+            self._lengths.extend(int(length) for length in np.atleast_1d(data))
+        else:
+            data = list(data)
+            for start in range(0, len(data), self._buffer_length):
+                self._inserted[name].append(data[start : start + self._buffer_length])
+        while self._num_queued < len(self._lengths) and all(
+            len(sequences) > self._num_queued for sequences in self._inserted.values()
+        ):
+            self._sequences.put(self._decode(self._num_queued))
+            self._num_queued += 1
+
+    def halt(self):
+        self._halted.set()
+        self._done.set()
+
+    def _decode(self, index: int) -> List[int]:
+        length = self._lengths[index]
+        ops_per_element = []
+        for stream in self._stream_elements:
+            ops_per_element.append(self._inserted[stream][index][:length])
+            self._inserted[stream][index] = None  # the padded buffers are not needed anymore
+        return [self._command_by_ops[ops] for ops in zip(*ops_per_element)]
+
+    def _simulate_all(self):
+        try:
+            for index in range(self._num_sequences):
+                while not self._halted.is_set():
+                    try:
+                        command_ids = self._sequences.get(timeout=0.1)
+                        break
+                    except queue.Empty:
+                        pass
+                else:
+                    return
+                self._num_started = index + 1
+                self._states[index] = simulate_noisy_sequence(
+                    self._command_cliffords[command_ids],
+                    self._num_shots,
+                    self._depolarizing_probability,
+                    self._readout_error,
+                    self._rng,
+                )
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    def _fetch(self, name: str):
+        if self._error is not None:
+            raise self._error
+        if name == "progress":
+            return self._num_started if self._num_started else None
+        if not self._done.is_set() or self._halted.is_set():
+            return None
+        shape = self._streams[name]
+        if name == "state_counts":
+            counts = [np.count_nonzero(self._states == i, axis=-1) for i in range(4)]
+            return np.stack(counts, axis=-1).reshape(shape)
+        return self._states.reshape(shape)
+
+
+class _OfflineQm:
+    def __init__(
+        self,
+        backend: "OfflineRBBackend",
+        rb: "TwoQubitRb",
+        result_shapes: Dict[str, Tuple[int, ...]],
+        num_shots_per_circuit: int,
+    ):
+        self._backend = backend
+        self._rb = rb
+        self._result_shapes = result_shapes
+        self._num_shots_per_circuit = num_shots_per_circuit
+
+    def execute(self, prog) -> OfflineRBJob:
+        self._backend.job = OfflineRBJob(
+            self._rb,
+            self._result_shapes,
+            self._num_shots_per_circuit,
+            self._backend.depolarizing_probability,
+            self._backend.readout_error,
+            self._backend.rng,
+        )
+        return self._backend.job
+
+
+class _OfflineQmm:
+    def __init__(self, qm: _OfflineQm):
+        self._qm = qm
+
+    def open_qm(self, config: dict) -> _OfflineQm:
+        return self._qm
+
+
+class OfflineRBBackend:
+    """
+    Runs `TwoQubitRb` experiments offline, on a noisy tableau simulation instead of an OPX (see the module docstring).
+
+    Args:
+        depolarizing_probability: Probability of a random two-qubit Pauli error after every command.
+        readout_error: Probability to flip the measured state of every qubit.
+        seed: Seed of the NumPy random generator of the simulated errors.
+    """
+
+    def __init__(self, depolarizing_probability: float = 0.0, readout_error: float = 0.0, seed=None):
+        self.depolarizing_probability = depolarizing_probability
+        self.readout_error = readout_error
+        self.rng = np.random.default_rng(seed)
+        self.job: Optional[OfflineRBJob] = None
+
+    def run(
+        self,
+        rb: "TwoQubitRb",
+        circuit_depths: List[int],
+        num_circuits_per_depth: int,
+        num_shots_per_circuit: int,
+        **kwargs,
+    ) -> RBResult:
+        """
+        Runs `rb.run` with the same arguments, on the simulation. The job of the last run is available as `job`.
+        """
+        result_shapes = rb._result_shapes(
+            circuit_depths, num_circuits_per_depth, num_shots_per_circuit, kwargs.get("save_state_counts", False)
+        )
+        qmm = _OfflineQmm(_OfflineQm(self, rb, result_shapes, num_shots_per_circuit))
+        return rb.run(qmm, circuit_depths, num_circuits_per_depth, num_shots_per_circuit, **kwargs)
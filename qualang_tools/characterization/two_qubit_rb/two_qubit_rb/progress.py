@@ -0,0 +1,153 @@
+import dataclasses
+import threading
+import time
+from typing import Callable, Optional
+
+from tqdm import tqdm
+
+
+@dataclasses.dataclass(frozen=True)
+class ProgressSnapshot:
+    """
+    Progress of an experiment at a given time.
+
+    Attributes:
+        total: Number of sequences of the experiment.
+        completed: Number of sequences started by the program, as last fetched from the server.
+        inserted: Number of sequences inserted in the input streams.
+        elapsed_time: Time (in seconds) since the start of the experiment.
+        sequences_per_second: Mean rate of the completed sequences.
+        shots_per_second: Mean rate of the completed shots.
+        eta: Estimated time (in seconds) to complete the remaining sequences, or None before any sequence completed.
+    """
+
+    total: int
+    completed: int
+    inserted: int
+    elapsed_time: float
+    sequences_per_second: float
+    shots_per_second: float
+    eta: Optional[float]
+
+
+class RBProgress:
+    """
+    Progress of a running experiment, fed by the acknowledgements of the input-stream insertion (`on_inserted`) and a
+    low-frequency fetch of the counter of started sequences saved by the program.
+
+    The counter is fetched at most every `min_fetch_interval` seconds. The interval is multiplied by `backoff` (up to
+    `max_fetch_interval`) after every fetch which does not show any progress, and reset when it does. The counter is not
+    fetched at all while the program waits for the next sequence to be inserted, as it can not make progress then.
+
+    Args:
+        total: Number of sequences of the experiment.
+        shots_per_sequence: Number of shots per sequence, used for the shots/s rate.
+        fetch_completed: Callable returning the counter of started sequences, or None if it is not available yet.
+        min_fetch_interval: Minimal time (in seconds) between two fetches of the counter.
+        max_fetch_interval: Maximal time (in seconds) between two fetches of the counter.
+        backoff: Factor of the fetch interval after a fetch which did not show any progress.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        shots_per_sequence: int = 1,
+        fetch_completed: Optional[Callable[[], Optional[int]]] = None,
+        min_fetch_interval: float = 0.5,
+        max_fetch_interval: float = 5.0,
+        backoff: float = 2.0,
+    ):
+        if not 0 < min_fetch_interval <= max_fetch_interval or backoff < 1:
+            raise ValueError("expected 0 < min_fetch_interval <= max_fetch_interval and backoff >= 1")
+        self._total = total
+        self._shots_per_sequence = shots_per_sequence
+        self._fetch_completed = fetch_completed
+        self._min_fetch_interval = min_fetch_interval
+        self._max_fetch_interval = max_fetch_interval
+        self._backoff = backoff
+
+        self._inserted = 0
+        self._completed = 0
+        self._inserted_event = threading.Event()
+        self._start_time = time.perf_counter()
+        self._end_time: Optional[float] = None
+        self._fetch_interval = min_fetch_interval
+        self._next_fetch_time = self._start_time
+        self.num_fetches = 0
+
+    def on_inserted(self, count: int = 1):
+        """Acknowledges the insertion of `count` sequences in the input streams. Thread-safe."""
+        self._inserted += count
+        self._inserted_event.set()
+
+    def fetch(self):
+        """Fetches the counter of started sequences, and adapts the interval until the next fetch."""
+        completed = self._fetch_completed() if self._fetch_completed is not None else None
+        self.num_fetches += 1
+        if completed is not None and completed > self._completed:
+            self._completed = min(int(completed), self._total)
+            self._fetch_interval = self._min_fetch_interval
+        else:
+            self._fetch_interval = min(self._fetch_interval * self._backoff, self._max_fetch_interval)
+        self._next_fetch_time = time.perf_counter() + self._fetch_interval
+        if self._completed >= self._total:
+            self._end_time = time.perf_counter()
+
+    def _can_progress(self) -> bool:
+        # The program increments the counter before waiting for the next sequence, hence up to `inserted + 1`
+        return self._completed <= self._inserted
+
+    def snapshot(self) -> ProgressSnapshot:
+        end_time = self._end_time if self._end_time is not None else time.perf_counter()
+        elapsed_time = end_time - self._start_time
+        completed = self._completed
+        rate = completed / elapsed_time if elapsed_time > 0 else 0.0
+        return ProgressSnapshot(
+            total=self._total,
+            completed=completed,
+            inserted=self._inserted,
+            elapsed_time=elapsed_time,
+            sequences_per_second=rate,
+            shots_per_second=rate * self._shots_per_sequence,
+            eta=(self._total - completed) / rate if rate > 0 else None,
+        )
+
+    def wait(
+        self,
+        is_running: Callable[[], bool] = lambda: True,
+        show_bar: bool = True,
+        callback: Optional[Callable[[ProgressSnapshot], None]] = None,
+    ) -> ProgressSnapshot:
+        """
+        Reports the progress until all the sequences are started or `is_running` returns False.
+
+        Args:
+            is_running: Callable returning whether the experiment is still running, checked at every update.
+            show_bar: Whether to display a tqdm progress bar.
+            callback: Callable called with a snapshot of the progress at every update, e.g. for logging.
+
+        Returns:
+            The last snapshot of the progress.
+        """
+        with tqdm(total=self._total, desc="progress", disable=not show_bar) as bar:
+            while True:
+                if self._can_progress() and time.perf_counter() >= self._next_fetch_time:
+                    self.fetch()
+
+                snapshot = self.snapshot()
+                bar.set_postfix(
+                    inserted=snapshot.inserted, shots_per_s=f"{snapshot.shots_per_second:.4g}", refresh=False
+                )
+                bar.update(snapshot.completed - bar.n)
+                if callback is not None:
+                    callback(snapshot)
+                if snapshot.completed >= self._total or not is_running():
+                    return snapshot
+
+                if self._can_progress():
+                    time.sleep(max(self._next_fetch_time - time.perf_counter(), 0))
+                else:
+                    # Woken up by the next insertion
+                    self._inserted_event.clear()
+                    if not self._can_progress():
+                        self._inserted_event.wait(self._max_fetch_interval)
@@ -0,0 +1,114 @@
+"""
+Vectorized generation of batches of random two-qubit RB sequences.
+
+All the random gates of a batch are drawn at once with a NumPy `Generator`, and the sequences are composed in lockstep
+(one Clifford of every sequence at a time) with the tables of `clifford_tables`, so that generating many sequences costs
+a few array operations per Clifford of the deepest sequence instead of Python operations per gate.
+"""
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import clifford_tables
+from .gates import gate_db
+
+PADDING_GATE_ID = -1
+
+SeedLike = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def generate_sequences(
+    depths: Sequence[int],
+    n_per_depth: int,
+    seed: SeedLike = None,
+    interleaving_clifford: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generates `n_per_depth` random RB sequences for every depth of `depths`.
+
+    The sequences have the same layout as the ones played by `TwoQubitRb`: a symplectic and a Pauli gate (followed by
+    the interleaving gate, if any) per Clifford, then the symplectic and Pauli gates inverting the whole sequence.
+
+    The sequences are fully determined by `seed`. To shard a large batch across processes, give each process its own
+    child seed, e.g. ``np.random.SeedSequence(seed).spawn(num_processes)[process_index]``.
+
+    Args:
+        depths: The number of Cliffords per sequence (not including the inverse).
+        n_per_depth: The number of sequences per depth.
+        seed: Seed of the NumPy random generator, or the generator itself.
+        interleaving_clifford: The interleaving gate, encoded as in `clifford_tables`, or None for standard RB.
+
+    Returns:
+        The gate ids of the sequences, padded with `PADDING_GATE_ID` (an int16 array with a row per sequence, the
+        `n_per_depth` sequences of ``depths[0]`` first), and the length of every sequence.
+    """
+    depths = np.asarray(depths, dtype=np.int64)
+    if np.any(depths < 0) or n_per_depth < 0:
+        raise ValueError("depths and n_per_depth must be non-negative")
+    rng = np.random.default_rng(seed)
+
+    sequence_depths = np.repeat(depths, n_per_depth)
+    num_sequences = len(sequence_depths)
+    max_depth = int(depths.max()) if num_sequences else 0
+    gates_per_clifford = 2 if interleaving_clifford is None else 3
+
+    symplectics = rng.integers(*gate_db._symplectic_range, size=(num_sequences, max_depth), dtype=np.int16)
+    paulis = rng.integers(*gate_db._pauli_range, size=(num_sequences, max_depth), dtype=np.int16)
+
+    # Composes the Cliffords of all the sequences in lockstep; with the sequences ordered by decreasing depth, the
+    # sequences that are still composing at a given step are a prefix of that order
+    gate_cliffords = gate_db.clifford_ids
+    order = np.argsort(-sequence_depths, kind="stable")
+    ordered_symplectics = symplectics[order]
+    ordered_paulis = paulis[order]
+    num_composing = np.searchsorted(-sequence_depths[order], -np.arange(max_depth), side="left")
+    cliffords = np.full(num_sequences, clifford_tables.identity(), dtype=np.int64)
+    for step in range(max_depth):
+        n = num_composing[step]
+        composed = clifford_tables.compose_array(cliffords[:n], gate_cliffords[ordered_symplectics[:n, step]])
+        composed = clifford_tables.compose_array(composed, gate_cliffords[ordered_paulis[:n, step]])
+        if interleaving_clifford is not None:
+            composed = clifford_tables.compose_array(composed, interleaving_clifford)
+        cliffords[:n] = composed
+    cliffords[order] = cliffords.copy()
+
+    inverse_ids = gate_db.find_symplectic_gate_ids_by_clifford_ids(clifford_tables.inverse_array(cliffords))
+    after_inverse = clifford_tables.compose_array(cliffords, gate_cliffords[inverse_ids])
+    final_paulis = gate_db.find_pauli_gate_ids_by_clifford_ids(after_inverse)
+
+    lengths = sequence_depths * gates_per_clifford + 2
+    sequences = np.full((num_sequences, max_depth * gates_per_clifford + 2), PADDING_GATE_ID, dtype=np.int16)
+    body = [symplectics, paulis]
+    if interleaving_clifford is not None:
+        body.append(np.full_like(symplectics, gate_db.get_interleaving_gate()))
+    sequences[:, : max_depth * gates_per_clifford] = np.stack(body, axis=-1).reshape(num_sequences, -1)
+    sequences[np.arange(sequences.shape[1]) >= lengths[:, None]] = PADDING_GATE_ID
+    rows = np.arange(num_sequences)
+    sequences[rows, lengths - 2] = inverse_ids
+    sequences[rows, lengths - 1] = final_paulis
+    return sequences, lengths
+
+
+def compose_sequences(
+    sequences: np.ndarray, lengths: np.ndarray, interleaving_clifford: Optional[int] = None
+) -> np.ndarray:
+    """
+    Composes the gates of padded sequences (as returned by `generate_sequences`), independently of how they were
+    generated.
+
+    Returns:
+        The Clifford applied by every sequence, encoded as in `clifford_tables`. It is the identity for valid RB
+        sequences.
+    """
+    sequences = np.asarray(sequences)
+    gate_cliffords = gate_db.clifford_ids
+    if interleaving_clifford is not None:
+        gate_cliffords = np.append(gate_cliffords[: gate_db.get_interleaving_gate()], interleaving_clifford)
+    cliffords = np.full(len(sequences), clifford_tables.identity(), dtype=np.int64)
+    for column in range(sequences.shape[1] if sequences.ndim == 2 else 0):
+        composing = column < np.asarray(lengths)
+        cliffords[composing] = clifford_tables.compose_array(
+            cliffords[composing], gate_cliffords[sequences[composing, column]]
+        )
+    return cliffords
@@ -1,3 +1,4 @@
+import functools
 from pathlib import Path
 from typing import Union, Callable, Literal
 
@@ -44,6 +45,21 @@ class CommandRegistry:
     def get_command_by_id(self, command_id: int):
         return self._commands[command_id]
 
+    @property
+    def commands(self) -> dict[int, Command]:
+        return self._commands
+
+    def record_commands(self, commands: dict[int, Command]):
+        """add commands recorded by another registry, e.g. in a worker process."""
+        if self.is_finished():
+            return
+        self._commands.update(commands)
+
+    def load_commands(self, commands: dict[int, Command]):
+        """set the recorded commands, e.g. from a previous recording, and disable any further recording."""
+        self._commands = dict(commands)
+        self.finish()
+
     def set_current_command_id(self, command_id: int):
         self._current_command_id = command_id
 
@@ -71,6 +87,37 @@ class CommandRegistry:
         return self._is_finished
 
 
+class _CommandRecordingGenerator:
+    """
+    Wraps a gate generator so that its calls are registered with a `CommandRegistry`.
+    Unlike a closure, the wrapper can be pickled (e.g. to bake commands in worker processes)
+    whenever the wrapped generator can.
+    """
+
+    def __init__(self, generator: Callable, command_registry: CommandRegistry):
+        functools.update_wrapper(self, generator)
+        self._command_registry = command_registry
+
+
+class _PhasedXZRecordingGenerator(_CommandRecordingGenerator):
+    def __call__(self, baker: Baking, q: int, x: float, z: float, a: float):
+        self._command_registry.register_phase_xz(q=q, x=x, z=z, a=a)
+        return self.__wrapped__(baker, q, x, z, a)
+
+
+class _CZRecordingGenerator(_CommandRecordingGenerator):
+    def __call__(self, *args):
+        self._command_registry.register_cz()
+        return self.__wrapped__(*args)
+
+
+class _CNOTRecordingGenerator(_CommandRecordingGenerator):
+    def __call__(self, *args):
+        control_qubit_index = args[1]
+        self._command_registry.register_cnot(q=control_qubit_index)
+        return self.__wrapped__(*args)
+
+
 PhasedXZGeneratorFunc = Callable[[Baking, int, float, float, float], None]
 SingleQubitGateGeneratorFunc = Union[PhasedXZGeneratorFunc]
 
@@ -83,12 +130,7 @@ def decorate_single_qubit_generator_with_command_recording(
     every function call an input parameters it receives and registers them
     with the provided `command_registry`.
     """
-
-    def decorated_generator(baker: Baking, q: int, x: float, z: float, a: float):
-        command_registry.register_phase_xz(q=q, x=x, z=z, a=a)
-        return single_qubit_gate_generator(baker, q, x, z, a)
-
-    return decorated_generator
+    return _PhasedXZRecordingGenerator(single_qubit_gate_generator, command_registry)
 
 
 CZGeneratorFunc = Callable[[Baking, int, int], None]
@@ -107,17 +149,10 @@ def decorate_two_qubit_gate_generator_with_command_recording(
     decorated_two_qubit_gate_generator = {}
     for gate_name, gate_generator in two_qubit_gate_generator.items():
         if gate_name == "CZ":
-
-            def decorated_generator(*args):
-                command_registry.register_cz()
-                return gate_generator(*args)
+            decorated_generator = _CZRecordingGenerator(gate_generator, command_registry)
 
         elif gate_name == "CNOT":
-
-            def decorated_generator(*args):
-                control_qubit_index = args[1]
-                command_registry.register_cnot(q=control_qubit_index)
-                return gate_generator(*args)
+            decorated_generator = _CNOTRecordingGenerator(gate_generator, command_registry)
 
         else:
             raise NotImplementedError(
@@ -7,61 +7,104 @@ from .command_registry import *
 
 class SequenceTracker:
     """
-    Tracks a randomly-generated sequence by recording both a list of qubit gates
-    corresponding to the sequence, and the raw command IDs which are used as
-    input to the input stream to map into baked pulses.
+    Tracks randomly-generated sequences by recording the raw command IDs which
+    are used as input to the input stream to map into baked pulses. The qubit
+    gates corresponding to a sequence are recovered from the command registry.
     """
 
     def __init__(self, command_registry: CommandRegistry):
         self.command_registry: CommandRegistry = command_registry
-        self._sequences_as_gates: list[Command] = []
-        self._sequences_as_command_ids: list[list[int]] = []
+        self._sequences_as_command_ids: list[np.ndarray] = []
 
     def make_sequence(self, command_ids: list[int]):
         """
-        Adds a new sequence to the tracker, recorded as both a list
-        of gates and command ids
+        Adds a new sequence to the tracker, recorded as an array of command ids
         """
-        self._record_sequence_as_list_of_command_ids(command_ids)
-        self._record_sequence_as_list_of_gates(command_ids)
+        self._sequences_as_command_ids.append(np.array(command_ids, dtype=np.int32))
 
-    def _record_sequence_as_list_of_command_ids(self, command_ids: list[int]):
-        self._sequences_as_command_ids.append([])
-        for command_id in command_ids:
-            self._sequences_as_command_ids[-1].append(command_id)
+    @property
+    def _sequences_as_gates(self) -> list[list[Gate]]:
+        return [self._command_ids_to_gates(command_ids) for command_ids in self._sequences_as_command_ids]
 
-    def _record_sequence_as_list_of_gates(self, command_ids: list[int]):
-        self._sequences_as_gates.append([])
+    def _command_ids_to_gates(self, command_ids: np.ndarray) -> list[Gate]:
+        gates = []
         for command_id in command_ids:
-            command = self.command_registry.get_command_by_id(command_id)
-            for gate in command:
-                self._sequences_as_gates[-1].append(gate)
+            gates.extend(self.command_registry.get_command_by_id(int(command_id)))
+        return gates
 
     def _serialize_sequences(self):
         result = ""
-        for i, sequence in enumerate(self._sequences_as_gates):
+        for i, command_ids in enumerate(self._sequences_as_command_ids):
             result += f"Sequence {i}:\n"
-            result += f"\tCommand IDs: {self._sequences_as_command_ids[i]}\n"
+            result += f"\tCommand IDs: {command_ids.tolist()}\n"
             result += "\tGates:\n"
-            for j, operation in enumerate(sequence):
+            for j, operation in enumerate(self._command_ids_to_gates(command_ids)):
                 result += f"\t\t{j}: {operation}\n"
             result += "\n"
         return result
 
+    def _command_unitaries(self) -> np.ndarray:
+        """
+        Unitaries of all the recorded commands, indexed by command id. The last one is the identity, used to pad
+        sequences.
+        """
+        commands = self.command_registry.commands
+        num_commands = max(commands.keys(), default=-1) + 1
+        unitaries = np.tile(np.eye(4, dtype=complex), (num_commands + 1, 1, 1))
+        for command_id, command in commands.items():
+            for gate in command:
+                unitaries[command_id] = gate.matrix() @ unitaries[command_id]
+        return unitaries
+
+    def calculate_resultant_states(self) -> np.ndarray:
+        """
+        Calculates the density matrices, of shape (num_sequences, 4, 4), resulting from the application of all the
+        tracked sequences to the multi-qubit ground-state.
+
+        The sequences are simulated together: sorted by decreasing length, the sequences that still have commands to
+        apply at a given step are a prefix of that order, and the next command of all of them is applied to their
+        state vectors with a single batched product.
+        """
+        unitaries = self._command_unitaries()
+        padding_id = len(unitaries) - 1
+        lengths = np.array([len(command_ids) for command_ids in self._sequences_as_command_ids], dtype=np.int64)
+        order = np.argsort(-lengths, kind="stable")
+        max_length = int(lengths.max()) if len(lengths) else 0
+
+        command_ids = np.full((max_length, len(lengths)), padding_id, dtype=np.int32)
+        for column, i in enumerate(order):
+            command_ids[: lengths[i], column] = self._sequences_as_command_ids[i]
+        num_applying = np.searchsorted(-lengths[order], -np.arange(max_length), side="left")
+
+        states = np.zeros((len(lengths), 4), dtype=complex)
+        states[:, 0] = 1
+        for step in range(max_length):
+            n = num_applying[step]
+            states[:n] = np.einsum("nij,nj->ni", unitaries[command_ids[step, :n]], states[:n])
+        states[order] = states.copy()
+        return states[:, :, None] * states[:, None, :].conj()
+
+    def find_failed_sequences(self) -> list[int]:
+        """
+        Returns the indices of the tracked sequences which do not recover the |00> state.
+        """
+        expected_state = np.zeros((4, 4))
+        expected_state[0, 0] = 1
+        recovered = np.isclose(self.calculate_resultant_states(), expected_state).all(axis=(1, 2))
+        return np.flatnonzero(~recovered).tolist()
+
     def verify_sequences(self):
         """
         Checks that the application of all gates in a sequence to the |00>
         state correctly recovers to the |00> state at the end.
         """
-        for i, sequence in enumerate(self._sequences_as_gates):
-            ideal_state = self.calculate_resultant_state(sequence)
-            expected_state = np.kron(np.array([1, 0]), np.array([1, 0]))  # should recover to |00>
-            expected_state = np.outer(expected_state, expected_state.conj())
-            assert np.allclose(
-                ideal_state, expected_state
-            ), f"expected to recover to at {expected_state}, got {ideal_state}"
-
-        print(f"Verification passed for all {len(self._sequences_as_gates)} sequence(s).")
+        failed = self.find_failed_sequences()
+        assert not failed, (
+            f"{len(failed)} of {len(self._sequences_as_command_ids)} sequence(s) failed to recover to |00>: "
+            f"sequence(s) {failed}"
+        )
+
+        print(f"Verification passed for all {len(self._sequences_as_command_ids)} sequence(s).")
 
     def calculate_resultant_state(self, sequence: List[Gate]) -> np.ndarray:
         """
@@ -1,3 +1,4 @@
+import functools
 import time
 from typing import Dict, Optional
 
@@ -12,6 +13,7 @@ from qm.qua import program
 from qm import QuantumMachinesManager
 from qualang_tools.results import wait_until_job_is_paused
 from qualang_tools.results import fetching_tool
+from qualang_tools.results.concurrent_fetcher import run_concurrently
 from qualang_tools.plot import interrupt_on_close
 import matplotlib.pyplot as plt
 import numpy as np
@@ -308,14 +310,14 @@ class OPX(Instrument):
             return None
         else:
             output = {}
+            fetched = self._fetch_results_concurrently()
             for i in range(len(self.results["types"])):
                 # Get data and convert to Volt
                 out = None
                 # demodulated or integrated data
-                self.result_handles.get(self.results["names"][i]).wait_for_values(self.counter)
                 if self.results["types"][i] == "IQ":
                     out = (
-                        -(self.result_handles.get(self.results["names"][i]).fetch(self.counter - 1)["value"])
+                        -(fetched[self.results["names"][i]]["value"])
                         * 4096
                         / (self.readout_pulse_length() * self.readout_sampling_rate())
                         * self.demod_factor
@@ -323,11 +325,7 @@ class OPX(Instrument):
                     )
                 # raw adc traces
                 elif self.results["types"][i] == "adc":
-                    out = (
-                        -(self.result_handles.get(self.results["names"][i]).fetch(self.counter - 1)["value"])
-                        / 4096
-                        * self.results["scale_factor"][i]
-                    )
+                    out = -(fetched[self.results["names"][i]]["value"]) / 4096 * self.results["scale_factor"][i]
                 # Reshape data
                 if len(self.results["buffers"][i]) == 2:
                     output[self.results["names"][i]] = out.reshape(
@@ -347,6 +345,22 @@ class OPX(Instrument):
                     output["Phi"] = np.angle(output["I"] + 1j * output["Q"]) * 180 / np.pi
             return output
 
+    def _fetch_results_concurrently(self) -> Dict:
+        """
+        Waits for and fetches the current value of all the results, with all the results fetched concurrently.
+
+        :return: dict containing the raw fetched results.
+        """
+
+        def fetch(name):
+            handle = self.result_handles.get(name)
+            handle.wait_for_values(self.counter)
+            return handle.fetch(self.counter - 1)
+
+        calls = {name: functools.partial(fetch, name) for name in self.results["names"]}
+        fetched, _ = run_concurrently(calls)
+        return fetched
+
     def _extend_result(self, gene, count, averaging_buffer):
         """
         Recursive function to get relevant information from the stream processing to construct the result Parameter.
@@ -1,21 +1,27 @@
 import logging
 from contextlib import contextmanager
-from time import sleep, time
-from typing import Generator
+from typing import Generator, Optional
 
 from qm import QuantumMachinesManager, QuantumMachine, QopCaps
 from qm.logging_utils import set_logging_level
 
+from qualang_tools.results.wait_tools import Poller, default_poller
+
 msg = "cannot be used because it isn't shareable in other QM."
 msg_opx1000 = "Resources already locked"
 
+# open_qm pushes the config to the server, so busy QOPs are polled less often than the (cheap) states of running jobs
+open_qm_poller = Poller(min_interval=0.2, max_interval=2.0)
+
 
 @contextmanager
-def qm_session(qmm: QuantumMachinesManager, config: dict, timeout: int = 100) -> Generator[QuantumMachine, None, None]:
+def qm_session(
+    qmm: QuantumMachinesManager, config: dict, timeout: int = 100, poller: Optional[Poller] = None
+) -> Generator[QuantumMachine, None, None]:
     """
     This context manager allows a user to _try_ to
     open a quantum machine, and if it is not possible since its resources are currently in use,
-    wait for them to free up. This is done by repeatedly polling the QM manager.
+    wait for them to free up. This is done by repeatedly polling the QM manager, with exponential backoff.
 
     Once they are freed, execution will start automatically.
     Once the context manager code block is exited, the QM will close automatically, freeing it up
@@ -24,20 +30,23 @@ def qm_session(qmm: QuantumMachinesManager, config: dict, timeout: int = 100) ->
     :param qmm: A QM manager from which to open QM
     :param config: a QUA config that will be supplied to `open_qm`
     :param timeout: time in seconds to wait for resources to free up before raising exception
+    :param poller: Poller used to poll the QM manager and the running jobs. Default is open_qm_poller (every 0.2s at
+        first, then backing off to every 2s) to open the QM, and the default_poller of the results tools for the jobs.
 
     """
     if not timeout > 0:
         raise ValueError(f"{timeout=} must be positive")
+    open_poller = open_qm_poller if poller is None else poller
+    jobs_poller = default_poller if poller is None else poller
 
     qm_log = logging.getLogger("qm.api.frontend_api")  # formerly "qm" & qm.api.frontend_api
-    is_busy = True
+    opened = []
     printed = False
-    t0 = time()
-    elapsed_time = 0
-    while is_busy and elapsed_time < timeout:
-        try:
-            qm = qmm.open_qm(config, close_other_machines=False)
 
+    def try_open_qm() -> bool:
+        nonlocal printed
+        try:
+            opened.append(qmm.open_qm(config, close_other_machines=False))
         except Exception as e:
             if (qmm.capabilities.supports(QopCaps.qop3) and msg_opx1000 in str(e)) or (
                 ~qmm.capabilities.supports(QopCaps.qop3) and msg in str(e)
@@ -47,27 +56,24 @@ def qm_session(qmm: QuantumMachinesManager, config: dict, timeout: int = 100) ->
                     set_logging_level("CRITICAL")
 
                     printed = True
-                sleep(0.2)
-                elapsed_time = time() - t0
+                return False
             else:
                 raise Exception from e
-        else:
-            is_busy = False
-            set_logging_level("INFO")
-            qm_log.info("Opening QM")
+        set_logging_level("INFO")
+        qm_log.info("Opening QM")
+        return True
 
-    if is_busy and elapsed_time >= timeout:
+    if not open_poller.wait_until(try_open_qm, timeout, name="qm_session"):
         qm_log.warning(f"While waiting for QOP to free, reached timeout: {timeout}s")
         raise TimeoutError(f"While waiting for QOP to free, reached timeout: {timeout}s")
+    qm = opened[0]
     try:
         yield qm
 
         if qmm.capabilities.supports(QopCaps.qop3):
-            while qm.get_jobs(status=["Running"]):
-                sleep(0.2)
+            jobs_poller.wait_until(lambda: not qm.get_jobs(status=["Running"]), name="qm_session_jobs")
         else:
-            while qm.get_running_job() is not None:
-                sleep(0.2)
+            jobs_poller.wait_until(lambda: qm.get_running_job() is None, name="qm_session_jobs")
     except KeyboardInterrupt:
         pass
     finally:
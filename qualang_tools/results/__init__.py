@@ -1,6 +1,9 @@
 from qualang_tools.results.results import fetching_tool
 from qualang_tools.results.results import progress_counter
 from qualang_tools.results.results import wait_until_job_is_paused
+from qualang_tools.results.concurrent_fetcher import ConcurrentFetcher, FetchSnapshot
+from qualang_tools.results.prefetching_fetcher import PrefetchingFetcher
+from qualang_tools.results.wait_tools import Poller, default_poller, wait_until, wait_for_any, wait_for_all
 
 from qualang_tools.results.data_handler import DataHandler, data_processors
 from qualang_tools.results.qua_iterables_processing.qua_iterable_postprocess import fetch_xarray_data
@@ -9,6 +12,14 @@ __all__ = [
     "fetching_tool",
     "progress_counter",
     "wait_until_job_is_paused",
+    "ConcurrentFetcher",
+    "FetchSnapshot",
+    "PrefetchingFetcher",
+    "Poller",
+    "default_poller",
+    "wait_until",
+    "wait_for_any",
+    "wait_for_all",
     "DataHandler",
     "data_processors",
     "fetch_xarray_data",
@@ -0,0 +1,155 @@
+"""Tools to fetch the results of several streams, and of several jobs, concurrently.
+
+Content:
+    - run_concurrently: runs blocking calls (e.g. fetches) in a thread pool and measures their latency.
+    - ConcurrentFetcher: fetches named results of one or several running jobs concurrently.
+    - FetchSnapshot: results of one ConcurrentFetcher.fetch_all() call, with the latency of every fetch.
+"""
+
+import dataclasses
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple, Union
+
+
+def run_concurrently(
+    calls: Mapping[Hashable, Callable[[], Any]], executor: Optional[Executor] = None
+) -> Tuple[Dict[Hashable, Any], Dict[Hashable, float]]:
+    """
+    Runs blocking calls concurrently in a thread pool, and waits for all of them.
+    **Example**: results, latencies = run_concurrently({"I": handles.get("I").fetch_all, "Q": handles.get("Q").fetch_all})
+
+    :param calls: dictionary of the callables to run, without argument.
+    :param executor: executor running the calls. If None, a thread pool is created for this call only.
+    :return: dictionaries of the value returned by every call and of its duration in seconds. If a call raised an
+        exception, it is raised once all the calls are done.
+    """
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=max(len(calls), 1)) as executor:
+            return run_concurrently(calls, executor)
+
+    def timed(call):
+        start = time.perf_counter()
+        value = call()
+        return value, time.perf_counter() - start
+
+    futures = {key: executor.submit(timed, call) for key, call in calls.items()}
+    wait(futures.values())
+    results, latencies = {}, {}
+    for key, future in futures.items():
+        results[key], latencies[key] = future.result()
+    return results, latencies
+
+
+@dataclasses.dataclass
+class FetchSnapshot:
+    """
+    Results of one ConcurrentFetcher.fetch_all() call. All the fetches were issued at start_time, and the snapshot is
+    only returned once all of them are done.
+
+    :param results: fetched results, as a dictionary {job key: {result name: value}}.
+    :param latencies: duration in seconds of every fetch, as a dictionary {(job key, result name): latency}.
+    :param start_time: time (time.time()) at which the fetches were issued.
+    :param duration: time in seconds to fetch all the results.
+    """
+
+    results: Dict[Hashable, Dict[str, Any]]
+    latencies: Dict[Tuple[Hashable, str], float]
+    start_time: float
+    duration: float
+
+    def __getitem__(self, job_key: Hashable) -> Dict[str, Any]:
+        return self.results[job_key]
+
+
+class ConcurrentFetcher:
+    def __init__(
+        self,
+        jobs,
+        data_list: Union[List[str], Mapping[Hashable, List[str]]],
+        max_workers: Optional[int] = None,
+    ):
+        """
+        API to fetch named results of one or several running jobs (e.g. jobs of several quantum machines) with all the
+        fetches issued concurrently, so that the refresh latency is the one of the slowest fetch instead of the sum of
+        all of them.
+        **Example**: fetcher = ConcurrentFetcher({"qm1": job1, "qm2": job2}, data_list=["I", "Q"])
+
+        :param jobs: a ``QmJob``, a list of jobs (keyed by their index in the results) or a dictionary of jobs.
+        :param data_list: a list of the result names to fetch from all the jobs, or a dictionary of the result names to
+            fetch from each job.
+        :param max_workers: maximum number of fetches running at the same time. Default is the total number of fetches.
+        """
+        if isinstance(jobs, Mapping):
+            self.jobs = dict(jobs)
+        elif isinstance(jobs, (list, tuple)):
+            self.jobs = dict(enumerate(jobs))
+        else:
+            self.jobs = {0: jobs}
+        if isinstance(data_list, Mapping):
+            self.data_lists = {key: list(data_list[key]) for key in self.jobs}
+        else:
+            self.data_lists = {key: list(data_list) for key in self.jobs}
+        if not any(self.data_lists.values()):
+            raise Exception("The provided data list is empty.")
+        num_fetches = sum(len(names) for names in self.data_lists.values())
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or num_fetches)
+        self._latency_stats: Dict[Tuple[Hashable, str], Dict[str, float]] = {}
+
+    def fetch_all(self) -> FetchSnapshot:
+        """
+        Fetches all the named results of all the jobs concurrently, and waits for all of them.
+        **Example**: snapshot = fetcher.fetch_all(); I1, Q1 = snapshot["qm1"]["I"], snapshot["qm1"]["Q"]
+
+        :return: a FetchSnapshot of the results and latencies.
+        """
+        calls = {}
+        for key, job in self.jobs.items():
+            handles = job.result_handles
+            for name in self.data_lists[key]:
+                calls[(key, name)] = handles.get(name).fetch_all
+        start_time = time.time()
+        start = time.perf_counter()
+        values, latencies = run_concurrently(calls, self._executor)
+        duration = time.perf_counter() - start
+
+        results = {key: {} for key in self.jobs}
+        for (key, name), value in values.items():
+            results[key][name] = value
+        self._update_latency_stats(latencies)
+        return FetchSnapshot(results, latencies, start_time, duration)
+
+    def is_processing(self) -> bool:
+        """
+        Returns True while at least one of the jobs is processing. The jobs are checked concurrently.
+        """
+        calls = {key: job.result_handles.is_processing for key, job in self.jobs.items()}
+        processing, _ = run_concurrently(calls, self._executor)
+        return any(processing.values())
+
+    def _update_latency_stats(self, latencies: Mapping[Tuple[Hashable, str], float]) -> None:
+        for key, latency in latencies.items():
+            stats = self._latency_stats.setdefault(key, {"count": 0, "mean": 0.0, "max": 0.0, "last": 0.0})
+            stats["count"] += 1
+            stats["mean"] += (latency - stats["mean"]) / stats["count"]
+            stats["max"] = max(stats["max"], latency)
+            stats["last"] = latency
+
+    @property
+    def latency_stats(self) -> Dict[Tuple[Hashable, str], Dict[str, float]]:
+        """
+        Number of fetches, and mean, maximum and last latency in seconds, of every (job key, result name).
+        """
+        return {key: dict(stats) for key, stats in self._latency_stats.items()}
+
+    def close(self) -> None:
+        """
+        Shuts down the thread pool of the fetcher.
+        """
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
@@ -0,0 +1,159 @@
+"""Background prefetching of the results of a running job, for live plotting loops.
+
+Content:
+    - PrefetchingFetcher: keeps fetching the results of a fetching_tool (or of any object with fetch_all() and
+      is_processing() methods) in a background thread, so that fetch_all() returns the latest results immediately.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+def _has_changed(previous, current) -> bool:
+    if isinstance(current, (list, tuple)) and isinstance(previous, (list, tuple)):
+        return len(previous) != len(current) or any(_has_changed(p, c) for p, c in zip(previous, current))
+    if isinstance(current, dict) and isinstance(previous, dict):
+        return previous.keys() != current.keys() or any(_has_changed(previous[k], current[k]) for k in current)
+    if hasattr(current, "results") and hasattr(previous, "results"):  # e.g. FetchSnapshot
+        return _has_changed(previous.results, current.results)
+    if isinstance(current, np.ndarray) or isinstance(previous, np.ndarray):
+        if np.shape(previous) != np.shape(current):
+            return True
+        return not np.array_equal(previous, current)
+    return previous is not current and previous != current
+
+
+class PrefetchingFetcher:
+    def __init__(
+        self,
+        fetcher,
+        min_interval: float = 0.05,
+        max_interval: float = 1.0,
+        backoff: float = 2.0,
+    ):
+        """
+        Keeps fetching the results of a fetcher in a background thread, so that fetching and plotting overlap in live
+        plotting loops: fetch_all() returns the latest complete results immediately, while the next ones are being
+        fetched.
+        **Example**: my_results = PrefetchingFetcher(fetching_tool(job, data_list=["I", "Q"], mode="live"))
+
+        The results are fetched at most every min_interval seconds. When the fetched results did not change, the
+        interval is multiplied by backoff, up to max_interval, and it is reset to min_interval as soon as they change.
+        The results are double-buffered: the background thread fetches into one buffer while the other holds the
+        latest complete results, and the buffers are swapped once the fetch is complete.
+
+        :param fetcher: a ``fetching_tool`` in 'live' mode, or any object with fetch_all() and is_processing() methods
+            (e.g. a ``ConcurrentFetcher``).
+        :param min_interval: minimal time in seconds between the start of two fetches. Default is 0.05.
+        :param max_interval: maximal time in seconds between the start of two fetches when the results do not change.
+            Default is 1.
+        :param backoff: factor of the interval after a fetch which did not change the results. Default is 2.
+        """
+        if not 0 <= min_interval <= max_interval or backoff < 1:
+            raise ValueError("expected 0 <= min_interval <= max_interval and backoff >= 1")
+        self.fetcher = fetcher
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+
+        self._buffers = [None, None]
+        self._front = 0  # Index of the buffer holding the latest complete results
+        self._lock = threading.Lock()
+        self._first_fetch = threading.Event()
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._last_returned = False
+        self._last_fetch_time = 0.0
+        self._num_fetches = 0
+        self._num_unchanged_fetches = 0
+        self._fetch_duration = 0.0
+        self._thread = threading.Thread(target=self._run, name="prefetching-fetcher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                processing = self.fetcher.is_processing()
+                back = 1 - self._front
+                self._buffers[back] = self.fetcher.fetch_all()
+                duration = time.perf_counter() - start
+                if self._num_fetches and not _has_changed(self._buffers[self._front], self._buffers[back]):
+                    self._num_unchanged_fetches += 1
+                    self.interval = min(self.interval * self.backoff, self.max_interval)
+                else:
+                    with self._lock:
+                        self._front = back
+                    self.interval = self.min_interval
+                self._num_fetches += 1
+                self._fetch_duration = duration
+                self._last_fetch_time = time.time()
+                self._first_fetch.set()
+                if not processing:
+                    return
+                self._stop.wait(max(self.interval - duration, 0))
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._first_fetch.set()
+
+    def fetch_all(self, timeout: Optional[float] = None) -> Any:
+        """
+        Returns the latest complete results, as returned by the fetch_all() method of the fetcher, without waiting for
+        a new fetch. Only the first call waits for the first results to be fetched.
+
+        :param timeout: maximal time in seconds to wait for the first results. Default is None (no timeout).
+        :return: the latest results.
+        """
+        if not self._first_fetch.wait(timeout):
+            raise TimeoutError(f"Timeout ({timeout}s) was reached before the first results were fetched.")
+        if self._error is not None:
+            raise self._error
+        with self._lock:
+            return self._buffers[self._front]
+
+    def is_processing(self) -> bool:
+        """
+        Returns True while the results are being prefetched, and also once after the job is done and the final results
+        were fetched. Can be used for live plotting.
+        **Example**: while my_results.is_processing():
+        """
+        if self._error is not None:
+            raise self._error
+        if self._thread.is_alive():
+            return True
+        if not self._last_returned:
+            self._last_returned = True
+            return True
+        return False
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        Number of fetches (and of fetches which did not change the results), duration of the last fetch, current
+        interval between fetches and age in seconds of the latest fetch.
+        """
+        return {
+            "num_fetches": self._num_fetches,
+            "num_unchanged_fetches": self._num_unchanged_fetches,
+            "fetch_duration": self._fetch_duration,
+            "interval": self.interval,
+            "age": time.time() - self._last_fetch_time if self._num_fetches else float("nan"),
+        }
+
+    def stop(self) -> None:
+        """
+        Stops the background fetching. The latest results are still available from fetch_all().
+        """
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.stop()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import reduce
 from typing import TYPE_CHECKING, Optional, Sequence, Union
 from itertools import product
 import numpy as np
@@ -66,55 +67,79 @@ def _clean_result_value(
     return np.array(value)
 
 
-def _find_stream_name_from_full_stream_name(result_name, native_columns, stream_name_separator):
-    for native_names in product(*native_columns):
-        suffix = stream_name_separator + stream_name_separator.join(str(n) for n in native_names)
-        if result_name.endswith(suffix):
-            stream_name = result_name[: -len(suffix)]
+def _build_suffix_index(native_columns) -> dict[tuple[str, ...], tuple[int, ...]]:
+    """Map the stream-name suffix parts of every native grid point (its native values as strings) to its coordinates.
 
-            return stream_name, native_names
+    Built once per fetch, so that the stream name and grid point of each result are found with a single lookup instead
+    of trying every grid point. The grid points are kept in iteration order.
+    """
+    return {
+        tuple(str(n) for n in native_names): tuple(coords)
+        for native_names, coords in zip(
+            product(*native_columns), product(*(range(len(column)) for column in native_columns))
+        )
+    }
+
+
+def _find_stream_name_from_full_stream_name(
+    result_name, suffix_index, num_native, stream_name_separator, split_suffix=True
+):
+    # Fast path, only valid when no native value contains the separator: split the native values off the end of the name
+    if split_suffix:
+        parts = result_name.rsplit(stream_name_separator, num_native)
+        if len(parts) == num_native + 1:
+            coords = suffix_index.get(tuple(parts[1:]))
+            if coords is not None:
+                return parts[0], coords
+
+    for native_names, coords in suffix_index.items():
+        suffix = stream_name_separator + stream_name_separator.join(native_names)
+        if result_name.endswith(suffix):
+            return result_name[: -len(suffix)], coords
 
     raise ValueError(f"No native iterator match found in '{result_name}'")
 
 
 def _extract_stream_data_with_native_iterables(results, qua_iterables, native_itr, stream_name_separator):
     native_columns = [_itr_column_indices(itr) for itr in native_itr]
-    stream_data = {}
+    suffix_index = _build_suffix_index(native_columns)
+    split_suffix = not any(stream_name_separator in name for native_names in suffix_index for name in native_names)
     stream_with_native_itr = {}
     for res_name, value in results.items():
-        clean_value = _clean_result_value(value)
-        stream_name, native_names = _find_stream_name_from_full_stream_name(
-            res_name, native_columns, stream_name_separator
+        stream_name, coords = _find_stream_name_from_full_stream_name(
+            res_name, suffix_index, len(native_itr), stream_name_separator, split_suffix
         )
-        d = stream_with_native_itr.setdefault(stream_name, {})
-        d[native_names] = clean_value
+        stream_with_native_itr.setdefault(stream_name, []).append((coords, _clean_result_value(value)))
 
     # Assemble native iterator results into nd-arrays with correct axis ordering
     native_shape = tuple(len(col) for col in native_columns)
-
+    stream_data = {}
     for stream_name, combos in stream_with_native_itr.items():
-        sorted_keys = list(product(*native_columns))
-        arrays = [combos[key] for key in sorted_keys]
-        stacked = np.array(arrays)
+        if len(combos) != len(suffix_index):
+            raise ValueError(
+                f"Expected {len(suffix_index)} native iterator streams for '{stream_name}', got {len(combos)}"
+            )
 
-        # Reshape flat combo dimension into native grid: (*native_dims, *non_native_dims)
+        # Non-averaged dims of the stream, in their original iteration position: native ones from the stream names,
+        # QUA ones from the buffer of each stream
         non_avg_itr = [itr for itr in qua_iterables if not itr.is_stream_averaged(stream_name)]
-        non_native_shape = arrays[0].shape
-        expected_non_native_shape = tuple([itr.buffer_size for itr in non_avg_itr if itr.is_qua_iterable])
-
-        if len(expected_non_native_shape) > 0:
-            if tuple(non_native_shape) != tuple(expected_non_native_shape):
-                raise ValueError(f"Expected qua iterators shape {expected_non_native_shape} got {non_native_shape}")
-            result = stacked.reshape(*native_shape, *non_native_shape)
-        else:
-            # Drop the trailing unit dimension added by np.array(arrays) when each element is a scalar
-            result = stacked.reshape(*native_shape)
-
-        # Transpose so each dim sits at its original iteration position (among non-averaged only)
-        # Current order after reshape: all native first, then non-native non-averaged
-        current_order = native_itr + [itr for itr in non_avg_itr if itr.is_qua_iterable]
-        perm = [current_order.index(itr) for itr in non_avg_itr]
-        stream_data[stream_name] = np.transpose(result, perm)
+        non_native_itr = [itr for itr in non_avg_itr if itr.is_qua_iterable]
+        non_native_shape = tuple(itr.buffer_size for itr in non_native_itr)
+        for _, value in combos:
+            if value.shape != non_native_shape and not (non_native_shape == () and value.size == 1):
+                raise ValueError(f"Expected qua iterators shape {non_native_shape} got {value.shape}")
+
+        # Each stream is written directly in the final array, through a view ordered as (*native, *non_native)
+        shape_by_itr = dict(zip(native_itr, native_shape))
+        shape_by_itr.update(zip(non_native_itr, non_native_shape))
+        # Reduced pairwise, since NumPy 1.x limits np.result_type to 32 arguments
+        dtype = reduce(np.result_type, (value.dtype for _, value in combos))
+        result = np.empty(tuple(shape_by_itr[itr] for itr in non_avg_itr), dtype=dtype)
+        current_order = native_itr + non_native_itr
+        view = np.transpose(result, [non_avg_itr.index(itr) for itr in current_order])
+        for coords, value in combos:
+            view[coords] = value.reshape(non_native_shape)
+        stream_data[stream_name] = result
 
     return stream_data
 
@@ -8,11 +8,22 @@ Content:
 import numpy as np
 import time
 from qm.jobs.running_qm_job import RunningQmJob
+from typing import Optional
 from warnings import warn
 
+from qualang_tools.results.wait_tools import Poller, default_poller
+
+try:
+    from qm import SingleStreamMultipleResultFetcher as _SaveAllResultFetcher
+except ImportError:
+    try:
+        from qm import MultipleNamedJobResult as _SaveAllResultFetcher
+    except ImportError:  # All the streams are then fetched in full in incremental mode
+        _SaveAllResultFetcher = ()
+
 
 class fetching_tool:
-    def __init__(self, job, data_list, mode="wait_for_all"):
+    def __init__(self, job, data_list, mode="wait_for_all", incremental=False):
         """
         API to easily fetch data from the stream processing.
         **Example**: my_results = fetching_tool(job=my_job, data_list=["I", "Q"], mode="live")
@@ -20,13 +31,17 @@ class fetching_tool:
         :param job: a ``QmJob`` object (see QM Job API) corresponding to the current execution.
         :param data_list: a list of the result names saved in the stream processing.
         :param mode: current acquisition mode among ['live', 'wait_for_all'], default is 'wait_for_all'. 'live' will fetch data one by one for all named results for live plotting purposes. 'wait_for_all' will wait until all values were processed for all named results.
+        :param incremental: only in 'live' mode. If True, the results saved with save_all() are fetched incrementally: only the values saved since the previous call to fetch_all() are fetched, and appended to a preallocated buffer. The other results (saved with save(), e.g. averaged streams) are still fetched in full. Default is False.
         """
         if not data_list:
             raise Exception("The provided data list is empty.")
         if mode not in ["live", "wait_for_all"]:
             raise Exception(f"Mode '{mode}' is not supported. Supported modes are ['live', 'wait_for_all']")
+        if incremental and mode != "live":
+            raise Exception("The incremental fetching is only supported in 'live' mode.")
         self.data_list = data_list
         self.mode = mode
+        self.incremental = incremental
         self.results = []
         self.res_handles = job.result_handles
         if mode == "live":
@@ -39,6 +54,12 @@ class fetching_tool:
             self._b_cont = False
             self._b_last = True
             self.start_time = 0
+        if incremental:
+            # Number of values fetched so far and buffer holding them, for the results fetched incrementally
+            self._fetched_counts = {
+                data: 0 for data in self.data_list if isinstance(self.res_handles.get(data), _SaveAllResultFetcher)
+            }
+            self._buffers = {data: None for data in self._fetched_counts}
 
     def is_processing(self):
         """
@@ -83,11 +104,43 @@ class fetching_tool:
         if self.mode == "wait_for_all":
             results = self.res_handles.fetch_results(wait_until_done=True, stream_names=self.data_list)
             self.results = [results.get(data) for data in self.data_list]
+        elif self.mode == "live" and self.incremental:
+            items = {
+                data: slice(self._fetched_counts[data], None) if data in self._fetched_counts else slice(None)
+                for data in self.data_list
+            }
+            results = self.res_handles.fetch_results(wait_until_done=False, stream_names=items)
+            self.results = [
+                self._append(data, results.get(data)) if data in self._fetched_counts else results.get(data)
+                for data in self.data_list
+            ]
         elif self.mode == "live":
             results = self.res_handles.fetch_results(wait_until_done=False, stream_names=self.data_list)
             self.results = [results.get(data) for data in self.data_list]
         return self.results
 
+    def _append(self, data, new_values):
+        """
+        Appends the values newly fetched for a result to its buffer, and returns all the values fetched so far.
+        The buffer is allocated for the expected number of values of the result if it is known, and grown geometrically
+        otherwise.
+        """
+        count = self._fetched_counts[data]
+        buffer = self._buffers[data]
+        if new_values is None or len(new_values) == 0:
+            return None if buffer is None else buffer[:count]
+        new_values = np.asarray(new_values)
+        new_count = count + len(new_values)
+        if buffer is None or new_count > len(buffer):
+            capacity = max(getattr(self.res_handles.get(data), "expected_count", 0) or 0, new_count, 2 * count)
+            new_buffer = np.empty((capacity,) + new_values.shape[1:], dtype=new_values.dtype)
+            if buffer is not None:
+                new_buffer[:count] = buffer[:count]
+            buffer = self._buffers[data] = new_buffer
+        buffer[count:new_count] = new_values
+        self._fetched_counts[data] = new_count
+        return buffer[:new_count]
+
 
 def progress_counter(iteration, total, progress_bar=True, percent=True, start_time=None):
     """Displays progress bar and prints remaining computation time.
@@ -115,7 +168,9 @@ def progress_counter(iteration, total, progress_bar=True, percent=True, start_ti
         print("")
 
 
-def wait_until_job_is_paused(running_job: RunningQmJob, timeout: int = 30, strict_timeout: bool = True):
+def wait_until_job_is_paused(
+    running_job: RunningQmJob, timeout: int = 30, strict_timeout: bool = True, poller: Optional[Poller] = None
+):
     """
     Waits until the OPX FPGA reaches a "pause" statement.
     Used when the OPX sequence needs to be synchronized with an external parameter sweep and to ensure that the OPX
@@ -125,14 +180,11 @@ def wait_until_job_is_paused(running_job: RunningQmJob, timeout: int = 30, stric
     :param running_job: the QM running job object.
     :param timeout: duration in seconds after which the console will be freed even if the pause statement has not been reached to prevent from being stuck here forever.
     :param strict_timeout: will throw and exception is set to True, otherwise it will just a print a warning.
+    :param poller: Poller polling the job state, with exponential backoff. Default is the default Poller of wait_tools.
     :return: True when the pause statement has been reached.
     """
-    start = time.time()
-    delay = 0
-    while (not running_job.is_paused()) and (delay < timeout):
-        time.sleep(0.1)
-        delay = time.time() - start
-    if delay > timeout:
+    poller = default_poller if poller is None else poller
+    if not poller.wait_until(running_job.is_paused, timeout, name="wait_until_job_is_paused"):
         if strict_timeout:
             raise TimeoutError(f"Timeout ({timeout}s) was reached, consider extending it if it was not intended.")
         else:
@@ -0,0 +1,217 @@
+"""Adaptive polling of the state of running jobs, e.g. to wait until a job is paused or done.
+
+Content:
+    - Poller: waits until one or several conditions are met, polling them with exponential backoff and jitter.
+    - WaitStats: number of polls issued and time waited by a Poller.
+    - wait_until, wait_for_any, wait_for_all: waits with the default Poller, shared by all the tools of the package.
+    - job_is_paused, job_is_done: conditions on a running job.
+"""
+
+import dataclasses
+import random
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple, Union
+
+Conditions = Union[Mapping[Hashable, Callable[[], bool]], Sequence[Callable[[], bool]]]
+
+
+@dataclasses.dataclass
+class WaitStats:
+    """
+    Statistics of the waits of a Poller.
+
+    :param waits: number of waits.
+    :param polls: number of polls of the conditions (a poll of n conditions counts n times).
+    :param timeouts: number of waits which reached their timeout.
+    :param waited_time: total time in seconds spent waiting.
+    """
+
+    waits: int = 0
+    polls: int = 0
+    timeouts: int = 0
+    waited_time: float = 0.0
+
+
+class Poller:
+    def __init__(
+        self,
+        min_interval: float = 0.01,
+        max_interval: float = 1.0,
+        backoff: float = 1.5,
+        jitter: float = 0.1,
+        seed=None,
+    ):
+        """
+        Waits until conditions are met by polling them, first every min_interval seconds, then with an interval
+        multiplied by backoff after every poll, up to max_interval. A condition which gets met right after a poll is
+        thus detected after min_interval seconds at best (short waits), and after max_interval seconds at worst (long
+        waits). Each interval is randomized by +/- jitter (relative), so that several clients polling the same server
+        do not synchronize.
+        **Example**: Poller(min_interval=0.05, max_interval=2).wait_until(job.is_paused, timeout=30)
+
+        :param min_interval: first interval in seconds between two polls (latency target of short waits). Default is 0.01.
+        :param max_interval: maximal interval in seconds between two polls (latency target of long waits). Default is 1.
+        :param backoff: factor of the interval after every poll. Default is 1.5.
+        :param jitter: relative randomization of the intervals, between 0 and 1. Default is 0.1.
+        :param seed: seed of the random generator of the jitter.
+        """
+        if not 0 < min_interval <= max_interval or backoff < 1 or not 0 <= jitter < 1:
+            raise ValueError("expected 0 < min_interval <= max_interval, backoff >= 1 and 0 <= jitter < 1")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._stats: Dict[str, WaitStats] = {}
+        self._lock = threading.Lock()
+
+    def _poll(self, poll_once: Callable[[], Tuple[bool, int]], timeout: Optional[float], name: str) -> bool:
+        # poll_once polls the conditions and returns whether the wait is over and the number of conditions polled
+        start = time.perf_counter()
+        interval = self.min_interval
+        polls = 0
+        timed_out = False
+        try:
+            while True:
+                met, num_polled = poll_once()
+                polls += num_polled
+                if met:
+                    return True
+                remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+                if remaining is not None and remaining <= 0:
+                    timed_out = True
+                    return False
+                delay = interval * (1 + self.jitter * self._random.uniform(-1, 1))
+                time.sleep(delay if remaining is None else min(delay, remaining))
+                interval = min(interval * self.backoff, self.max_interval)
+        finally:
+            with self._lock:
+                stats = self._stats.setdefault(name, WaitStats())
+                stats.waits += 1
+                stats.polls += polls
+                stats.timeouts += timed_out
+                stats.waited_time += time.perf_counter() - start
+
+    def wait_until(
+        self, condition: Callable[[], bool], timeout: Optional[float] = None, name: str = "wait_until"
+    ) -> bool:
+        """
+        Waits until a condition is met.
+
+        :param condition: callable returning True once the condition is met.
+        :param timeout: maximal time in seconds to wait. Default is None (no timeout).
+        :param name: name under which the wait is counted in the statistics.
+        :return: True if the condition was met, False if the timeout was reached.
+        """
+        return self._poll(lambda: (bool(condition()), 1), timeout, name)
+
+    def wait_for_any(self, conditions: Conditions, timeout: Optional[float] = None, name: str = "wait_for_any") -> List:
+        """
+        Waits until at least one of several conditions is met, e.g. until the first of several jobs is done.
+
+        :param conditions: list or dictionary of callables returning True once their condition is met.
+        :param timeout: maximal time in seconds to wait. Default is None (no timeout).
+        :param name: name under which the wait is counted in the statistics.
+        :return: the indices (or keys) of the conditions met at the last poll, or an empty list if the timeout was
+            reached.
+        """
+        conditions = _as_dict(conditions)
+        met = []
+
+        def poll_once():
+            met[:] = [key for key, condition in conditions.items() if condition()]
+            return bool(met), len(conditions)
+
+        self._poll(poll_once, timeout, name)
+        return met
+
+    def wait_for_all(self, conditions: Conditions, timeout: Optional[float] = None, name: str = "wait_for_all") -> bool:
+        """
+        Waits until all of several conditions are met, e.g. until all of several jobs are done. A condition is only
+        polled until it is met for the first time.
+
+        :param conditions: list or dictionary of callables returning True once their condition is met.
+        :param timeout: maximal time in seconds to wait. Default is None (no timeout).
+        :param name: name under which the wait is counted in the statistics.
+        :return: True if all the conditions were met, False if the timeout was reached.
+        """
+        pending = _as_dict(conditions)
+
+        def poll_once():
+            num_polled = len(pending)
+            for key in [key for key, condition in pending.items() if condition()]:
+                del pending[key]
+            return not pending, num_polled
+
+        return self._poll(poll_once, timeout, name)
+
+    @property
+    def stats(self) -> Dict[str, WaitStats]:
+        """
+        Statistics of the waits of this poller, by name (e.g. "wait_until_job_is_paused", "qm_session").
+        """
+        with self._lock:
+            return {name: dataclasses.replace(stats) for name, stats in self._stats.items()}
+
+    @property
+    def total_stats(self) -> WaitStats:
+        """
+        Statistics of all the waits of this poller.
+        """
+        total = WaitStats()
+        for stats in self.stats.values():
+            total.waits += stats.waits
+            total.polls += stats.polls
+            total.timeouts += stats.timeouts
+            total.waited_time += stats.waited_time
+        return total
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def _as_dict(conditions: Conditions) -> Dict[Hashable, Callable[[], bool]]:
+    if isinstance(conditions, Mapping):
+        return dict(conditions)
+    return dict(enumerate(conditions))
+
+
+default_poller = Poller()
+"""Poller used by default by the tools of the package (e.g. wait_until_job_is_paused, qm_session)."""
+
+
+def wait_until(condition: Callable[[], bool], timeout: Optional[float] = None, name: str = "wait_until") -> bool:
+    """
+    Waits until a condition is met, with the default Poller. See Poller.wait_until.
+    """
+    return default_poller.wait_until(condition, timeout, name)
+
+
+def wait_for_any(conditions: Conditions, timeout: Optional[float] = None, name: str = "wait_for_any") -> List:
+    """
+    Waits until at least one of several conditions is met, with the default Poller. See Poller.wait_for_any.
+    """
+    return default_poller.wait_for_any(conditions, timeout, name)
+
+
+def wait_for_all(conditions: Conditions, timeout: Optional[float] = None, name: str = "wait_for_all") -> bool:
+    """
+    Waits until all of several conditions are met, with the default Poller. See Poller.wait_for_all.
+    """
+    return default_poller.wait_for_all(conditions, timeout, name)
+
+
+def job_is_paused(job) -> Callable[[], bool]:
+    """
+    Returns a condition met when the job reaches a pause statement.
+    """
+    return job.is_paused
+
+
+def job_is_done(job) -> Callable[[], bool]:
+    """
+    Returns a condition met when the job is done processing its results.
+    """
+    return lambda: not job.result_handles.is_processing()
@@ -475,3 +475,192 @@ def test_delete_samples_within_baking(config):
         assert b4._qe_dict["qe2"]["time"] == 600
         assert b4._qe_dict["qe3"]["time"] == 600
     assert b4.get_op_length() == 600
+
+
+def test_play_with_frame_rotation_and_amp_matrix(config):
+    cfg = deepcopy(config)
+    I = np.array(gauss(0.2, 0, 15, 80))
+    amp = (0.5, 0.1, -0.2, 0.9)
+    with baking(cfg) as b:
+        b.set_detuning("qe2", 10e6)
+        b.frame_rotation(0.4, "qe2")
+        b.play("gaussOp", "qe2", amp=amp)
+        b.play_at("gaussOp", "qe2", t=40)
+    phase = 10e6 * np.arange(80) * 1e-9 + 0.4
+    expected_I = np.cos(phase) * amp[0] * I - np.sin(phase) * amp[2] * I
+    expected_Q = np.sin(phase) * amp[0] * I + np.cos(phase) * amp[2] * I
+    expected_I[40:] += np.cos(phase[40:]) * I[:40]
+    expected_Q[40:] += np.sin(phase[40:]) * I[:40]
+    overflow_phase = 10e6 * np.arange(40, 80) * 1e-9 + 0.4
+    expected_I = np.concatenate((expected_I, np.cos(overflow_phase) * I[40:]))
+    expected_Q = np.concatenate((expected_Q, np.sin(overflow_phase) * I[40:]))
+
+    assert isinstance(cfg["waveforms"]["qe2_baked_wf_I_0"]["samples"], list)
+    assert np.allclose(cfg["waveforms"]["qe2_baked_wf_I_0"]["samples"], expected_I)
+    assert np.allclose(cfg["waveforms"]["qe2_baked_wf_Q_0"]["samples"], expected_Q)
+
+
+def test_deduplicate_waveforms(config):
+    from qualang_tools.bakery.bakery import get_waveform_registry
+
+    cfg = deepcopy(config)
+    bakings = []
+    for _ in range(3):
+        with baking(cfg, deduplicate_waveforms=True) as b:
+            b.play("gaussOp", "qe2")
+            b.play("a_pulse", "qe1")
+        bakings.append(b)
+    with baking(cfg, deduplicate_waveforms=True) as b_other:
+        b_other.play("gaussOp", "qe2", amp=0.5)
+
+    baked_wfs = [wf for wf in cfg["waveforms"] if wf.startswith("baked_wf")]
+    assert len(baked_wfs) == 4
+    assert cfg["pulses"]["qe2_baked_pulse_0"]["waveforms"] == cfg["pulses"]["qe2_baked_pulse_2"]["waveforms"]
+    assert cfg["pulses"]["qe2_baked_pulse_0"]["waveforms"] != cfg["pulses"]["qe2_baked_pulse_3"]["waveforms"]
+    assert bakings[1].get_op_length("qe2") == 80
+    stats = get_waveform_registry(cfg).stats
+    # The Q waveform of the last baking is identical (all zeros) to the one of the first three
+    assert stats["saved_waveforms"] == 7
+    assert stats["saved_bytes"] == (2 * (2 * 80 + 100) + 80) * 8
+
+    single_wf = cfg["pulses"]["qe1_baked_pulse_0"]["waveforms"]["single"]
+    bakings[0].delete_baked_op()
+    bakings[1].delete_baked_op()
+    assert single_wf in cfg["waveforms"]
+    bakings[2].delete_baked_op()
+    assert single_wf not in cfg["waveforms"]
+    assert len([wf for wf in cfg["waveforms"] if wf.startswith("baked_wf")]) == 2
+
+
+def test_deduplicate_waveforms_keeps_unregistered_waveforms(config):
+    cfg = deepcopy(config)
+    with baking(cfg, deduplicate_waveforms=True) as b:
+        b.play("a_pulse", "qe1")
+    # The copy has its own registry, in which the waveform already in the config is not registered
+    cfg_copy = deepcopy(cfg)
+    single_wf = cfg_copy["pulses"]["qe1_baked_pulse_0"]["waveforms"]["single"]
+    bakings = []
+    for _ in range(2):
+        with baking(cfg_copy, deduplicate_waveforms=True) as b:
+            b.play("a_pulse", "qe1")
+        bakings.append(b)
+    assert cfg_copy["pulses"]["qe1_baked_pulse_2"]["waveforms"]["single"] == single_wf
+    for b in bakings:
+        b.delete_baked_op()
+    assert single_wf in cfg_copy["waveforms"]
+
+
+def test_deduplicate_waveforms_survives_many_configs(config):
+    from qualang_tools.bakery.bakery import get_waveform_registry
+
+    cfg = deepcopy(config)
+    bakings = []
+    for _ in range(2):
+        with baking(cfg, deduplicate_waveforms=True) as b:
+            b.play("a_pulse", "qe1")
+        bakings.append(b)
+    # Baking into many other configs must not drop the usage counts of the waveforms of cfg
+    other_configs = [deepcopy(config) for _ in range(40)]
+    for other_config in other_configs:
+        with baking(other_config) as b:
+            b.play("a_pulse", "qe1")
+    with baking(cfg, deduplicate_waveforms=True) as b:
+        b.play("a_pulse", "qe1")
+    bakings.append(b)
+    single_wf = cfg["pulses"]["qe1_baked_pulse_2"]["waveforms"]["single"]
+    assert get_waveform_registry(cfg).stats["saved_waveforms"] == 2
+    for b in bakings[:2]:
+        b.delete_baked_op()
+    assert single_wf in cfg["waveforms"]
+    bakings[2].delete_baked_op()
+    assert single_wf not in cfg["waveforms"]
+
+
+def test_baking_index_allocation(config):
+    cfg = deepcopy(config)
+    for i in range(12):
+        with baking(cfg) as b:
+            b.add_op("Op", "qe1", [0.2] * (20 + 4 * i))
+            b.play("Op", "qe1")
+        assert b.get_baking_index() == i
+    # Length constraint is retrieved for the exact index (and not for indices sharing the same prefix)
+    with baking(cfg, baking_index=1) as b_constrained:
+        b_constrained.wait(4, "qe1")
+    assert b_constrained.get_op_length("qe1") == 24
+
+    b.delete_baked_op()
+    with baking(cfg) as b:
+        b.play("playOp", "qe1")
+    assert b.get_baking_index() == 11
+
+    # A copy of the config is indexed from its content
+    cfg_copy = deepcopy(cfg)
+    with baking(cfg_copy) as b:
+        b.play("playOp", "qe1")
+    assert b.get_baking_index() == 12
+
+
+def test_local_config_does_not_copy_config(config):
+    cfg = deepcopy(config)
+    cfg_before = deepcopy(cfg)
+    with baking(cfg) as b:
+        assert b._local_config["waveforms"]["gauss_wf"]["samples"] is cfg["waveforms"]["gauss_wf"]["samples"]
+        b.add_digital_waveform("dig_wf", [(1, 0)])
+        b.add_op("Op", "qe1", [0.1] * 20, digital_marker="dig_wf")
+        b.play("Op", "qe1")
+        b.play("gaussOp", "qe2")
+    # Operations added locally do not leak into the config, only the baked operations are added
+    assert "Op" not in cfg["elements"]["qe1"]["operations"]
+    assert "dig_wf" not in cfg["digital_waveforms"]
+    assert not [pulse for pulse in cfg["pulses"] if "baked_pulse_b" in pulse]
+    assert set(cfg["waveforms"]) - set(cfg_before["waveforms"]) == {
+        "qe1_baked_wf_0",
+        "qe2_baked_wf_I_0",
+        "qe2_baked_wf_Q_0",
+    }
+
+
+def test_rb_one_qubit_shared_cliffords(config):
+    from qm.qua import program, declare
+
+    from qualang_tools.bakery.randomized_benchmark import RBOneQubit
+
+    ops = {op: "gauss_pulse" for op in ["I", "X", "Y", "X/2", "-X/2", "Y/2", "-Y/2"]}
+    config["elements"]["qe2"]["operations"].update(ops)
+    num_waveforms = len(config["waveforms"])
+
+    rb = RBOneQubit(config, d_max=20, K=50, qubit="qe2", shared_cliffords=True)
+    assert rb.sequences == rb.baked_sequences == []
+    assert rb.clifford_sequences.shape == rb.clifford_inverse_ops.shape == (50, 20)
+    assert len(config["waveforms"]) == num_waveforms + 2 * len(c1_ops)
+    assert {b.get_op_length("qe2") for b in rb.baked_cliffords} == {3 * 80}
+
+    for k in range(len(rb.clifford_sequences)):
+        for depth in [1, 7, 20]:
+            state = 0
+            for i in rb.get_sequence(k, depth):
+                state = c1_table[state][i]
+            assert state == 0
+
+    with program():
+        sequence = declare(int, value=rb.get_sequence(0, 20))
+        rb.play_sequence(sequence, 21)
+
+
+def test_rb_one_qubit_generate_sequences():
+    from qualang_tools.bakery.randomized_benchmark import c1_inverse, find_revert_op, generate_sequences
+
+    for state in range(len(c1_ops)):
+        assert c1_table[state][find_revert_op(state)] == 0
+        assert c1_table[c1_inverse[state]][state] == 0
+
+    sequences, inverse_ops = generate_sequences(100, 30, seed=1)
+    assert sequences.shape == inverse_ops.shape == (100, 30)
+    for sequence, inverses in zip(sequences, inverse_ops):
+        state = 0
+        for i, inverse in zip(sequence, inverses):
+            state = c1_table[state][i]
+            assert c1_table[state][inverse] == 0
+
+    same_sequences, same_inverse_ops = generate_sequences(100, 30, seed=1)
+    assert (same_sequences == sequences).all() and (same_inverse_ops == inverse_ops).all()
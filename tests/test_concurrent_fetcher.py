@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from qualang_tools.results import ConcurrentFetcher
+
+
+class _Stream:
+    def __init__(self, value, latency):
+        self.value = value
+        self.latency = latency
+
+    def fetch_all(self):
+        time.sleep(self.latency)
+        return self.value
+
+
+class _ResultHandles:
+    def __init__(self, streams, processing=True):
+        self.streams = streams
+        self.processing = processing
+
+    def get(self, name):
+        return self.streams[name]
+
+    def is_processing(self):
+        return self.processing
+
+
+class _Job:
+    def __init__(self, streams, processing=True):
+        self.result_handles = _ResultHandles(streams, processing)
+
+
+def test_fetch_all_jobs_concurrently():
+    latency = 0.1
+    names = [f"stream_{i}" for i in range(10)]
+    jobs = {
+        qm: _Job({name: _Stream((qm, name), latency) for name in names}, processing=qm == "qm2")
+        for qm in ["qm1", "qm2"]
+    }
+    with ConcurrentFetcher(jobs, names) as fetcher:
+        snapshot = fetcher.fetch_all()
+        assert fetcher.is_processing()
+
+        assert snapshot.results == {qm: {name: (qm, name) for name in names} for qm in jobs}
+        assert snapshot["qm1"]["stream_3"] == ("qm1", "stream_3")
+        assert set(snapshot.latencies) == {(qm, name) for qm in jobs for name in names}
+        assert all(latency <= t for t in snapshot.latencies.values())
+        # 20 fetches of 0.1 s each
+        assert snapshot.duration < 10 * latency
+
+        fetcher.fetch_all()
+        stats = fetcher.latency_stats[("qm2", "stream_0")]
+        assert stats["count"] == 2 and latency <= stats["mean"] <= stats["max"]
+
+
+def test_fetch_with_data_list_per_job():
+    jobs = [_Job({"I": _Stream(1, 0), "Q": _Stream(2, 0)}), _Job({"adc": _Stream(3, 0)}, processing=False)]
+    with ConcurrentFetcher(jobs, {0: ["I", "Q"], 1: ["adc"]}, max_workers=1) as fetcher:
+        assert fetcher.fetch_all().results == {0: {"I": 1, "Q": 2}, 1: {"adc": 3}}
+
+
+def test_fetch_errors_are_raised():
+    class _FailingStream:
+        def fetch_all(self):
+            raise RuntimeError("fetch failed")
+
+    class _SlowStream(_Stream):
+        done = False
+
+        def fetch_all(self):
+            value = super().fetch_all()
+            self.done = True
+            return value
+
+    slow = _SlowStream(1, 0.1)
+    with ConcurrentFetcher(_Job({"Q": _FailingStream(), "I": slow}), ["Q", "I"]) as fetcher:
+        with pytest.raises(RuntimeError, match="fetch failed"):
+            fetcher.fetch_all()
+        # The error is only raised once the other fetches are done
+        assert slow.done
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import qm
+
+from qualang_tools.results import fetching_tool
+
+if not hasattr(qm, "SingleStreamMultipleResultFetcher"):
+    pytest.skip("Requires the result fetchers of qm-qua >= 1.2", allow_module_level=True)
+
+
+class _SaveAllStream(qm.SingleStreamMultipleResultFetcher):
+    """Stream saved with save_all(), whose values are revealed a few at a time"""
+
+    def __init__(self, values):
+        self.values = values
+        self.available = 0
+        self.fetched_items = []
+
+    @property
+    def expected_count(self):
+        return len(self.values)
+
+    def fetch(self, item, **kwargs):
+        self.fetched_items.append(item)
+        start = 0 if item.start is None else item.start
+        return self.values[start : self.available]
+
+    def wait_for_values(self, count=1, timeout=None):
+        pass
+
+
+class _SaveStream:
+    """Stream saved with save(), e.g. an averaged stream, which is updated in place"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def fetch(self, item, **kwargs):
+        assert item == slice(None)
+        return self.value
+
+    def wait_for_values(self, count=1, timeout=None):
+        pass
+
+
+class _ResultHandles:
+    def __init__(self, streams):
+        self.streams = streams
+
+    def __getattr__(self, name):
+        return self.streams[name]
+
+    def get(self, name):
+        return self.streams[name]
+
+    def is_processing(self):
+        return True
+
+    def fetch_results(self, wait_until_done=True, stream_names=None):
+        if not isinstance(stream_names, dict):
+            stream_names = {name: slice(None) for name in stream_names}
+        return {name: self.streams[name].fetch(item) for name, item in stream_names.items()}
+
+
+class _Job:
+    def __init__(self, streams):
+        self.result_handles = _ResultHandles(streams)
+
+
+def test_incremental_fetch_only_new_values():
+    values = np.arange(100.0).reshape(50, 2)
+    raw = _SaveAllStream(values)
+    average = _SaveStream(np.zeros(2))
+    results = fetching_tool(_Job({"raw": raw, "avg": average}), ["raw", "avg"], mode="live", incremental=True)
+
+    fetched = []
+    for available in [0, 3, 3, 20, 50]:
+        raw.available = available
+        average.value = values[:available].mean(axis=0) if available else np.zeros(2)
+        raw_values, avg = results.fetch_all()
+        if available == 0:
+            assert raw_values is None
+        else:
+            assert np.array_equal(raw_values, values[:available])
+        assert np.array_equal(avg, average.value)
+        fetched.append(raw.fetched_items[-1].start)
+
+    assert fetched == [0, 0, 3, 3, 20]
+    # The buffer is allocated once, for the expected number of values
+    assert results._buffers["raw"].shape == values.shape
+
+
+def test_incremental_fetch_requires_live_mode():
+    with pytest.raises(Exception):
+        fetching_tool(_Job({"raw": _SaveAllStream(np.arange(3))}), ["raw"], incremental=True)
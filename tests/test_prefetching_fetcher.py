@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+import pytest
+
+from qualang_tools.results import PrefetchingFetcher
+
+
+class _Fetcher:
+    """Live fetcher whose data grows by one value per fetch until num_values, with a slow fetch"""
+
+    def __init__(self, num_values, latency=0.0):
+        self.num_values = num_values
+        self.latency = latency
+        self.count = 0
+        self.done = False
+
+    def is_processing(self):
+        return not self.done
+
+    def fetch_all(self):
+        time.sleep(self.latency)
+        if self.count < self.num_values:
+            self.count += 1
+        return [np.arange(self.count), "constant"]
+
+
+def test_fetch_all_returns_latest_results_without_waiting():
+    fetcher = _Fetcher(num_values=1000, latency=0.05)
+    with PrefetchingFetcher(fetcher, min_interval=0) as prefetcher:
+        I, label = prefetcher.fetch_all(timeout=5)
+        assert label == "constant" and len(I) >= 1
+        start = time.perf_counter()
+        for _ in range(10):
+            I, _ = prefetcher.fetch_all()
+        assert time.perf_counter() - start < fetcher.latency
+        time.sleep(0.3)
+        assert len(prefetcher.fetch_all()[0]) > len(I)
+
+
+def test_backoff_when_results_do_not_change():
+    fetcher = _Fetcher(num_values=2)
+    with PrefetchingFetcher(fetcher, min_interval=0.01, max_interval=0.08) as prefetcher:
+        time.sleep(0.5)
+        stats = prefetcher.stats
+        assert stats["interval"] == 0.08
+        assert stats["num_unchanged_fetches"] >= 2
+        # With the backoff, much fewer fetches than 0.5 s / min_interval
+        assert stats["num_fetches"] < 20
+
+
+def test_final_results_after_the_job_is_done():
+    fetcher = _Fetcher(num_values=5)
+    prefetcher = PrefetchingFetcher(fetcher, min_interval=0.01)
+    while len(prefetcher.fetch_all(timeout=5)[0]) < 3:
+        time.sleep(0.01)
+    fetcher.num_values = 10
+    fetcher.done = True
+    iterations = 0
+    while prefetcher.is_processing():
+        iterations += 1
+        I, _ = prefetcher.fetch_all()
+    assert iterations >= 1
+    assert len(I) >= 4 and len(I) == len(prefetcher.fetch_all()[0])
+    assert not prefetcher.is_processing()
+
+
+def test_fetch_errors_are_raised():
+    class _FailingFetcher(_Fetcher):
+        def fetch_all(self):
+            raise RuntimeError("fetch failed")
+
+    prefetcher = PrefetchingFetcher(_FailingFetcher(1))
+    with pytest.raises(RuntimeError, match="fetch failed"):
+        prefetcher.fetch_all(timeout=5)
@@ -0,0 +1,117 @@
+import time
+
+import pytest
+
+from qualang_tools.multi_user import qm_session
+from qualang_tools.results import Poller, wait_until_job_is_paused
+from qualang_tools.results.wait_tools import job_is_done
+
+
+class _Condition:
+    """Condition met from its n-th poll"""
+
+    def __init__(self, n):
+        self.n = n
+        self.polls = 0
+
+    def __call__(self):
+        self.polls += 1
+        return self.polls >= self.n
+
+
+def test_wait_until_backs_off():
+    poller = Poller(min_interval=0.01, max_interval=0.04, backoff=2, jitter=0)
+    start = time.perf_counter()
+    assert poller.wait_until(_Condition(5), name="test")
+    # Intervals of 0.01, 0.02, 0.04 and 0.04 s
+    assert 0.11 <= time.perf_counter() - start < 0.5
+    stats = poller.stats["test"]
+    assert (stats.waits, stats.polls, stats.timeouts) == (1, 5, 0)
+    assert stats.waited_time >= 0.11
+
+
+def test_wait_until_timeout():
+    poller = Poller(min_interval=0.01, max_interval=0.05)
+    start = time.perf_counter()
+    assert not poller.wait_until(lambda: False, timeout=0.2)
+    assert 0.2 <= time.perf_counter() - start < 0.3
+    assert poller.total_stats.timeouts == 1
+
+
+def test_wait_for_any_and_all():
+    poller = Poller(min_interval=0.001, max_interval=0.001)
+    assert poller.wait_for_any({"a": _Condition(3), "b": _Condition(2), "c": _Condition(5)}) == ["b"]
+    assert poller.wait_for_any([lambda: False], timeout=0.01) == []
+
+    conditions = [_Condition(3), _Condition(1), _Condition(6)]
+    assert poller.wait_for_all(conditions)
+    # Conditions are not polled anymore once they are met
+    assert [c.polls for c in conditions] == [3, 1, 6]
+    assert poller.stats["wait_for_all"].polls == 10
+    assert not poller.wait_for_all([lambda: True, lambda: False], timeout=0.01)
+
+
+class _Job:
+    def __init__(self, pause_after):
+        self.is_paused = _Condition(pause_after)
+        self.result_handles = self
+
+    def is_processing(self):
+        return not self.is_paused()
+
+
+def test_wait_until_job_is_paused():
+    poller = Poller(min_interval=0.001, max_interval=0.001)
+    assert wait_until_job_is_paused(_Job(3), timeout=1, poller=poller)
+    assert poller.stats["wait_until_job_is_paused"].polls == 3
+    with pytest.raises(TimeoutError):
+        wait_until_job_is_paused(_Job(1000), timeout=0.05, poller=poller)
+    with pytest.warns(UserWarning):
+        wait_until_job_is_paused(_Job(1000), timeout=0.05, strict_timeout=False, poller=poller)
+    assert Poller().wait_for_all([job_is_done(_Job(2)), job_is_done(_Job(4))], timeout=1)
+
+
+class _QuantumMachine:
+    def __init__(self):
+        self.closed = False
+        self.running_jobs = [_Condition(3)]
+
+    def get_running_job(self):
+        return None if self.running_jobs[0]() else self.running_jobs[0]
+
+    def close(self):
+        self.closed = True
+
+
+class _Capabilities:
+    def supports(self, capability):
+        return False
+
+
+class _QuantumMachinesManager:
+    capabilities = _Capabilities()
+
+    def __init__(self, busy_attempts):
+        self.busy_attempts = busy_attempts
+        self.attempts = 0
+
+    def open_qm(self, config, close_other_machines):
+        self.attempts += 1
+        if self.attempts <= self.busy_attempts:
+            raise Exception("Element q1 cannot be used because it isn't shareable in other QM.")
+        return _QuantumMachine()
+
+
+def test_qm_session_waits_for_resources():
+    poller = Poller(min_interval=0.001, max_interval=0.001)
+    qmm = _QuantumMachinesManager(busy_attempts=4)
+    with qm_session(qmm, {}, timeout=1, poller=poller) as qm:
+        assert not qm.closed
+    assert qm.closed
+    assert qmm.attempts == 5
+    assert poller.stats["qm_session"].polls == 5
+    assert poller.stats["qm_session_jobs"].polls == 3
+
+    with pytest.raises(TimeoutError):
+        with qm_session(_QuantumMachinesManager(busy_attempts=10**6), {}, timeout=0.05, poller=poller):
+            pass
@@ -17,6 +17,7 @@ if not qua_iterables_supported():
         "test_fetch_xarray_averaging.py",
         "test_fetch_xarray_edge_cases.py",
         "test_fetch_xarray_zip.py",
+        "test_fetch_xarray_native_assembly.py",
     ]
 
 HOST_IP = "localhost"
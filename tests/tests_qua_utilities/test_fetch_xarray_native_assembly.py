@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from qm.qua import program, declare_with_stream, assign, fixed, STREAM_NAME_SEPARATOR
+from qm.qua.extensions.qua_iterators import QuaIterable, PythonIterable, QuaIterableRange, QuaProduct
+
+from qualang_tools.results import fetch_xarray_data
+from qualang_tools.results.qua_iterables_processing.qua_iterable_postprocess import (
+    _build_suffix_index,
+    _find_stream_name_from_full_stream_name,
+)
+
+qubits = ["q1", "q2", "q3"]
+flux = [0.1, 0.2]
+frequencies = np.linspace(1, 2, 5)
+
+
+class _ResultHandles:
+    def __init__(self, results):
+        self.results = results
+
+    def fetch_results(self, wait_until_done=False):
+        return self.results
+
+
+class _Job:
+    def __init__(self, results):
+        self.result_handles = _ResultHandles(results)
+
+
+def make_product(average_axes, qubits=qubits, flux=flux):
+    prod = QuaProduct(
+        [
+            QuaIterableRange("shot", 4),
+            PythonIterable("qubit", qubits),
+            QuaIterable("frequency", frequencies),
+            PythonIterable("flux", flux),
+        ]
+    )
+    with program():
+        for _ in prod:
+            x = declare_with_stream(fixed, "x__st", average_axes=average_axes)
+            assign(x, 1.0)
+    return prod
+
+
+def stream_name(i, j):
+    return f"x__st{STREAM_NAME_SEPARATOR}{i}{STREAM_NAME_SEPARATOR}{j}"
+
+
+def test_native_values_containing_the_separator():
+    qubit_names = ["a", f"a{STREAM_NAME_SEPARATOR}b", "b"]
+    prod = make_product(["shot", "frequency"], qubits=qubit_names)
+    results = {stream_name(i, j): np.float64(10 * i + j) for i in range(len(qubit_names)) for j in range(len(flux))}
+    ds = fetch_xarray_data(_Job(results), prod)
+
+    assert list(ds.data_vars) == ["x__st"]
+    assert list(ds["qubit"].values) == qubit_names
+    assert np.array_equal(ds["x__st"], [[10 * i + j for j in range(len(flux))] for i in range(len(qubit_names))])
+
+
+def test_stream_suffixes_containing_the_separator():
+    # "x__st__a__b__0" could also be read as the suffix ("b", "0") of a stream "x__st__a"
+    suffix_index = _build_suffix_index([["a", f"a{STREAM_NAME_SEPARATOR}b", "b"], [0, 1]])
+    name = f"x__st{STREAM_NAME_SEPARATOR}a{STREAM_NAME_SEPARATOR}b{STREAM_NAME_SEPARATOR}0"
+    assert _find_stream_name_from_full_stream_name(name, suffix_index, 2, STREAM_NAME_SEPARATOR, False) == (
+        "x__st",
+        (1, 0),
+    )
+    # The fast path falls back to matching the suffixes when the split suffix is not a grid point
+    name = f"x__st{STREAM_NAME_SEPARATOR}a{STREAM_NAME_SEPARATOR}b{STREAM_NAME_SEPARATOR}1"
+    suffix_index = _build_suffix_index([[f"a{STREAM_NAME_SEPARATOR}b"], [1]])
+    assert _find_stream_name_from_full_stream_name(name, suffix_index, 2, STREAM_NAME_SEPARATOR) == ("x__st", (0, 0))
+
+
+def test_many_native_streams():
+    many_flux = np.round(np.linspace(0, 1, 20), 2).tolist()
+    prod = make_product(["shot", "frequency"], flux=many_flux)
+    # More streams than the 32 arguments np.result_type accepts on NumPy 1.x, with mixed dtypes
+    results = {
+        stream_name(i, j): np.int64(i) if j else np.float64(i)
+        for i in range(len(qubits))
+        for j in range(len(many_flux))
+    }
+    ds = fetch_xarray_data(_Job(results), prod)
+
+    assert ds["x__st"].shape == (len(qubits), len(many_flux)) and ds["x__st"].dtype == np.float64
+
+
+def test_native_streams_written_in_iteration_order():
+    prod = make_product(["shot"])
+    # Value of each frequency point encodes the native grid point of the stream
+    results = {
+        stream_name(i, j): 100 * i + 10 * j + np.arange(len(frequencies))
+        for i in range(len(qubits))
+        for j in range(len(flux))
+    }
+    ds = fetch_xarray_data(_Job(results), prod)
+
+    assert ds["x__st"].dims == ("qubit", "frequency", "flux")
+    for i, qubit in enumerate(qubits):
+        for j, f in enumerate(flux):
+            expected = 100 * i + 10 * j + np.arange(len(frequencies))
+            assert np.array_equal(ds["x__st"].sel(qubit=qubit, flux=f), expected)
+
+
+def test_fully_averaged_qua_iterables():
+    prod = make_product(["shot", "frequency"])
+    results = {stream_name(i, j): np.float64(10 * i + j) for i in range(len(qubits)) for j in range(len(flux))}
+    ds = fetch_xarray_data(_Job(results), prod)
+
+    assert ds["x__st"].dims == ("qubit", "flux")
+    assert np.array_equal(ds["x__st"], [[10 * i + j for j in range(len(flux))] for i in range(len(qubits))])
+
+
+def test_unmatched_or_missing_streams_raise():
+    prod = make_product(["shot"])
+    results = {stream_name(i, j): np.zeros(len(frequencies)) for i in range(len(qubits)) for j in range(len(flux))}
+
+    with pytest.raises(ValueError, match="No native iterator match"):
+        fetch_xarray_data(_Job({**results, stream_name(len(qubits), 0): np.zeros(len(frequencies))}), prod)
+    del results[stream_name(0, 0)]
+    with pytest.raises(ValueError):
+        fetch_xarray_data(_Job(results), prod)
+    with pytest.raises(ValueError, match="Expected qua iterators shape"):
+        fetch_xarray_data(_Job({name: np.zeros(2) for name in results} | {stream_name(0, 0): np.zeros(2)}), prod)
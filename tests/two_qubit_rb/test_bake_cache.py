@@ -0,0 +1,63 @@
+import pytest
+
+cirq = pytest.importorskip("cirq")
+
+from qualang_tools.bakery.bakery import Baking
+from qualang_tools.characterization.two_qubit_rb import TwoQubitRb
+
+calls = {"single": 0, "cz": 0}
+
+
+def bake_phased_xz(baker: Baking, q, x, z, a):
+    calls["single"] += 1
+    element = f"q{q}_xy"
+    baker.frame_rotation_2pi(a / 2, element)
+    baker.play("x180", element, amp=x)
+    baker.frame_rotation_2pi(-(a + z) / 2, element)
+
+
+def bake_cz(baker: Baking, q1, q2):
+    calls["cz"] += 1
+    baker.play("cz", "q1_z")
+    baker.align()
+    baker.frame_rotation_2pi(0.23, "q1_xy")
+    baker.align()
+
+
+def make_rb(config, cache_dir, **kwargs):
+    return TwoQubitRb(
+        config, bake_phased_xz, {"CZ": bake_cz}, lambda: None, lambda: None, bake_cache_dir=cache_dir, **kwargs
+    )
+
+
+def test_warm_start_skips_baking(config, tmp_path):
+    cold = make_rb(config, tmp_path)
+    assert not cold._rb_baker.loaded_from_cache
+    assert calls["single"] > 0 and calls["cz"] > 0
+
+    calls["single"] = calls["cz"] = 0
+    warm = make_rb(config, tmp_path)
+    assert warm._rb_baker.loaded_from_cache
+    assert calls == {"single": 0, "cz": 0}
+
+    assert warm._config == cold._config
+    assert warm._rb_baker.cmd_to_op == cold._rb_baker.cmd_to_op
+    assert warm._rb_baker._op_to_baking == cold._rb_baker._op_to_baking
+    assert warm._rb_baker.all_elements == cold._rb_baker.all_elements
+    assert warm._command_registry.commands == cold._command_registry.commands
+    assert warm._command_registry.is_finished()
+
+
+def test_cache_key_and_invalidation(config, tmp_path):
+    rb = make_rb(config, tmp_path)
+    interleaved = make_rb(config, tmp_path, interleaving_gate=[cirq.CZ(cirq.LineQubit(0), cirq.LineQubit(1))])
+    assert not interleaved._rb_baker.loaded_from_cache
+    assert interleaved._rb_baker.bake_cache_key != rb._rb_baker.bake_cache_key
+
+    config["waveforms"]["cz_wf"]["sample"] /= 2
+    assert not make_rb(config, tmp_path)._rb_baker.loaded_from_cache
+    config["waveforms"]["cz_wf"]["sample"] *= 2
+
+    assert rb.invalidate_bake_cache() == 1
+    assert not make_rb(config, tmp_path)._rb_baker.loaded_from_cache
+    assert rb.invalidate_bake_cache(all_entries=True) == 3
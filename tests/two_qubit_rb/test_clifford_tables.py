@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+import pytest
+
+cirq = pytest.importorskip("cirq")
+
+from qualang_tools.bakery.bakery import Baking
+from qualang_tools.characterization.two_qubit_rb import TwoQubitRb
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb import clifford_tables, gate_db
+
+
+def test_tables_match_simple_tableau():
+    rng = random.Random(1234)
+    tableaus = gate_db.tableaus
+    for _ in range(500):
+        first = rng.choice(tableaus).then(rng.choice(tableaus))
+        second = rng.choice(tableaus)
+        first_id, second_id = clifford_tables.clifford_id(first), clifford_tables.clifford_id(second)
+
+        assert clifford_tables.clifford_tableau(first_id) == first
+        assert clifford_tables.clifford_tableau(clifford_tables.compose(first_id, second_id)) == first.then(second)
+        assert clifford_tables.clifford_tableau(clifford_tables.inverse(first_id)) == first.inverse()
+        assert clifford_tables.compose(first_id, clifford_tables.inverse(first_id)) == clifford_tables.identity()
+
+
+def test_encoding_is_a_bijection():
+    tableaus = {clifford_tables.clifford_tableau(c) for c in range(0, clifford_tables.NUM_CLIFFORDS, 7)}
+    assert len(tableaus) == len(range(0, clifford_tables.NUM_CLIFFORDS, 7))
+    with pytest.raises(ValueError):
+        clifford_tables.clifford_id(clifford_tables.SimpleTableau(np.eye(2), [0, 0]))
+
+
+def test_generated_sequences_are_verified(config):
+    def bake_phased_xz(baker: Baking, q, x, z, a):
+        pass
+
+    def bake_cz(baker: Baking, q1, q2):
+        pass
+
+    interleaving_gate = [cirq.CZ(*cirq.LineQubit.range(1, 3))]
+    rb = TwoQubitRb(
+        config,
+        bake_phased_xz,
+        {"CZ": bake_cz},
+        lambda: None,
+        lambda: None,
+        verify_generation=True,
+        interleaving_gate=interleaving_gate,
+    )
+    for depth in [1, 5, 20]:
+        rb._gen_rb_sequence(depth)
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+cirq = pytest.importorskip("cirq")
+
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb import SimpleTableau, gate_db
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb.gates import (
+    _COMPILATION_PKL_PATH,
+    _GateDatabase,
+    save_compilation_npz,
+)
+
+
+def test_find_gate_ids_by_tableau():
+    symplectic_start, symplectic_end = gate_db._symplectic_range
+    pauli_start, pauli_end = gate_db._pauli_range
+    for gate_id in range(symplectic_start, symplectic_end):
+        tableau = gate_db.get_tableau(gate_id)
+        assert gate_db.find_symplectic_gate_id_by_tableau_g(tableau) == gate_id
+        # only g is used to find symplectic gates
+        assert gate_db.find_symplectic_gate_id_by_tableau_g(SimpleTableau(tableau.g, [1, 0, 1, 1])) == gate_id
+    for gate_id in range(pauli_start, pauli_end):
+        tableau = gate_db.get_tableau(gate_id)
+        assert gate_db.find_pauli_gate_id_by_tableau_alpha(tableau) == gate_id
+        # only alpha is used to find Pauli gates
+        other_g = gate_db.get_tableau(symplectic_end - 1).g
+        assert gate_db.find_pauli_gate_id_by_tableau_alpha(SimpleTableau(other_g, tableau.alpha)) == gate_id
+
+
+def test_gate_db_is_loaded_on_first_use():
+    code = (
+        "from qualang_tools.characterization.two_qubit_rb.two_qubit_rb import gate_db\n"
+        "assert '_data' not in vars(gate_db)\n"
+        "gate_db.get_command(0)\n"
+        "assert '_data' in vars(gate_db) and not gate_db._tableaus\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parents[2])
+
+
+def test_npz_compilation_matches_pkl(tmp_path):
+    save_compilation_npz(npz_path=tmp_path / "compilation.npz")
+    from_npz = _GateDatabase(tmp_path / "compilation.npz")
+    # Without .npz file, the compilation is read from the .pkl file next to it
+    from_pkl = _GateDatabase(_COMPILATION_PKL_PATH.with_suffix(".npz_missing"))
+
+    assert from_npz.commands == from_pkl.commands == gate_db.commands
+    assert from_npz.tableaus == from_pkl.tableaus == gate_db.tableaus
+    assert from_npz._pauli_range == from_pkl._pauli_range == gate_db._pauli_range
@@ -0,0 +1,86 @@
+import time
+from collections import defaultdict
+
+import pytest
+
+cirq = pytest.importorskip("cirq")
+
+from qualang_tools.bakery.bakery import Baking
+from qualang_tools.characterization.two_qubit_rb import TwoQubitRb
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb.input_stream_feeder import InputStreamFeeder
+
+
+class FakeJob:
+    def __init__(self):
+        self.input_streams = defaultdict(list)
+        self.insertions = defaultdict(int)
+
+    def insert_input_stream(self, name, data):
+        self.input_streams[name].extend(data)
+        self.insertions[name] += 1
+
+
+def test_feeder_inserts_all_items_in_order():
+    batches = []
+    feeder = InputStreamFeeder(range(100), batches.append, max_queue_size=4, batch_size=8).start()
+    feeder.join()
+
+    assert [item for batch in batches for item in batch] == list(range(100))
+    assert all(len(batch) <= 8 for batch in batches)
+    stats = feeder.stats
+    assert stats.generated == stats.inserted == 100
+    assert stats.batches == len(batches)
+    assert 1 <= stats.max_queue_depth <= 5
+    assert stats.sequences_per_second > 0
+
+
+def test_feeder_records_stall_time_of_slow_generation():
+    def slow_items():
+        for i in range(5):
+            time.sleep(0.02)
+            yield i
+
+    feeder = InputStreamFeeder(slow_items(), lambda batch: None).start()
+    feeder.join()
+    assert feeder.stats.inserted == 5
+    assert feeder.stats.stall_time >= 0.08
+
+
+def test_feeder_raises_errors_on_join():
+    def failing_items():
+        yield 1
+        raise ValueError("generation failed")
+
+    with pytest.raises(ValueError, match="generation failed"):
+        InputStreamFeeder(failing_items(), lambda batch: None).start().join()
+
+    def failing_insert(batch):
+        raise ConnectionError("insertion failed")
+
+    feeder = InputStreamFeeder(iter(range(1000)), failing_insert, max_queue_size=2).start()
+    with pytest.raises(ConnectionError, match="insertion failed"):
+        feeder.join(timeout=5)
+    assert not feeder.is_alive()
+    assert feeder.stats.generated < 1000
+
+
+def test_rb_sequences_are_inserted_in_input_streams(config):
+    def bake_phased_xz(baker: Baking, q, x, z, a):
+        baker.play("x180", f"q{q}_xy")
+
+    def bake_cz(baker: Baking, q1, q2):
+        baker.play("cz", "q1_z")
+
+    rb = TwoQubitRb(config, bake_phased_xz, {"CZ": bake_cz}, lambda: None, lambda: None)
+    job = FakeJob()
+    sequences = []
+    rb._insert_all_input_stream(job, [1, 3, 5], 4, sequences.append, max_queue_size=3, batch_size=5).join()
+
+    assert [len(sequence) for sequence in sequences] == [2 * (depth + 1) for depth in [1, 3, 5]] * 4
+    assert job.input_streams["__gates_len_is__"] == [len(sequence) for sequence in sequences]
+    for qe in rb._rb_baker.all_elements:
+        decoded = [op for seq in sequences for op in rb._decode_sequence_for_element(qe, seq)]
+        assert job.input_streams[f"{qe}_is"] == decoded
+    assert rb.input_stream_stats.inserted == 12
+    # Every batch is inserted with a single call per input stream
+    assert set(job.insertions.values()) == {rb.input_stream_stats.batches}
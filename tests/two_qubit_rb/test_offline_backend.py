@@ -0,0 +1,97 @@
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+cirq = pytest.importorskip("cirq")
+
+from qualang_tools.bakery.bakery import Baking
+from qualang_tools.characterization.two_qubit_rb import TwoQubitRb
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb import clifford_tables, gate_db
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb.offline_backend import (
+    OfflineRBBackend,
+    simulate_noisy_sequence,
+)
+from qm.qua import declare
+
+
+def bake_phased_xz(baker: Baking, q, x, z, a):
+    element = f"q{q}_xy"
+    baker.frame_rotation_2pi(a / 2, element)
+    baker.play("x180", element, amp=x)
+    baker.frame_rotation_2pi(-(a + z) / 2, element)
+
+
+def bake_cz(baker: Baking, q1, q2):
+    baker.play("cz", "q1_z")
+    baker.align()
+    baker.frame_rotation_2pi(0.23, "q1_xy")
+    baker.frame_rotation_2pi(0.12, "q2_xy")
+    baker.align()
+
+
+def meas():
+    return declare(bool), declare(bool)
+
+
+@pytest.fixture
+def rb(config):
+    return TwoQubitRb(config, bake_phased_xz, {"CZ": bake_cz}, lambda: None, meas)
+
+
+def test_noiseless_run_recovers_ground_state(rb):
+    backend = OfflineRBBackend(seed=0)
+    result = backend.run(rb, [1, 3, 10], 4, 5, progress_callback=lambda p: None)
+    assert result.state.shape == (4, 3, 5)
+    assert np.all(result.state == 0)
+    assert rb.progress.completed == 12
+
+    counts = backend.run(rb, [1, 3, 10], 4, 5, save_state_counts=True, input_stream_batch_size=4)
+    assert counts.state is None
+    assert np.all(counts.state_counts[..., 0] == 5)
+
+
+def test_noisy_run_decays(rb):
+    result = OfflineRBBackend(depolarizing_probability=0.02, seed=1).run(rb, [1, 20, 60], 4, 200)
+    decay = result.get_decay_curve().data
+    assert decay[0] > decay[1] > decay[2] > 0.25
+
+
+def test_simulated_errors():
+    rng = np.random.default_rng(0)
+    identity = np.array([clifford_tables.identity()])
+    assert np.all(simulate_noisy_sequence(identity, 100, 0, 0, rng) == 0)
+    x_on_second_qubit = identity + 8
+    assert np.all(simulate_noisy_sequence(x_on_second_qubit, 100, 0, 0, rng) == 2)
+    readout = simulate_noisy_sequence(identity, 20000, 0, 0.1, rng)
+    assert np.mean(readout & 1) == pytest.approx(0.1, abs=0.01)
+    # a fully depolarized pair of qubits ends up in each state with the same probability
+    depolarized = simulate_noisy_sequence(identity, 20000, 1, 0, rng)
+    assert np.bincount(depolarized, minlength=4) / 20000 == pytest.approx([0.25] * 4, abs=0.02)
+
+
+@pytest.mark.parametrize("circuit_depths, num_circuits_per_depth", [([1, 10, 100], 10), ([1, 50, 200, 500], 4)])
+def test_end_to_end_throughput(rb, circuit_depths, num_circuits_per_depth):
+    """
+    Reports (run with -s to see it) the throughput of a whole run: program generation, sequence generation, insertion,
+    simulation, fetching and fit. It includes up to one progress-fetch interval of latency at the end of the run.
+    """
+    gate_db.clifford_ids  # builds the Clifford tables, once per process
+    backend = OfflineRBBackend(depolarizing_probability=0.005, seed=2)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = backend.run(rb, circuit_depths, num_circuits_per_depth, 100, save_state_counts=True)
+    result.fit_exponential()
+    elapsed = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    num_sequences = len(circuit_depths) * num_circuits_per_depth
+    stats = rb.input_stream_stats
+    print(
+        f"\ndepths={circuit_depths} circuits={num_circuits_per_depth}: end-to-end {num_sequences / elapsed:.1f} "
+        f"sequences/s, insertion {stats.sequences_per_second:.1f} sequences/s "
+        f"({stats.stall_time:.2f} s waiting for generation), peak memory {peak_memory / 2**20:.1f} MiB"
+    )
+    assert result.state_counts.sum() == num_sequences * 100
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("cirq")
+
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb.input_stream_feeder import InputStreamFeeder
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb.progress import RBProgress
+
+
+class FakeCounter:
+    """Counter of started sequences of a program consuming a sequence every `period` seconds once inserted."""
+
+    def __init__(self, progress: RBProgress, period: float):
+        self.progress = progress
+        self.period = period
+        self.fetches = 0
+        self.start = time.perf_counter()
+
+    def __call__(self):
+        self.fetches += 1
+        started = int((time.perf_counter() - self.start) / self.period) + 1
+        return min(started, self.progress._inserted + 1)
+
+
+def test_progress_is_fed_by_insertions():
+    total = 20
+    progress = RBProgress(total, shots_per_sequence=100, min_fetch_interval=0.01, max_fetch_interval=0.05)
+    counter = FakeCounter(progress, period=0.005)
+    progress._fetch_completed = counter
+
+    def slow_items():
+        for i in range(total):
+            time.sleep(0.01)
+            yield i
+
+    feeder = InputStreamFeeder(slow_items(), lambda batch: None, on_inserted=progress.on_inserted).start()
+    snapshots = []
+    last = progress.wait(show_bar=False, callback=snapshots.append)
+    feeder.join()
+
+    assert last.completed == last.total == total
+    assert last.inserted >= total - 1  # the last sequence is started before being inserted
+    assert progress.snapshot().inserted == total
+    assert last.shots_per_second == pytest.approx(last.sequences_per_second * 100)
+    assert last.eta == 0
+    assert [s.completed for s in snapshots] == sorted(s.completed for s in snapshots)
+    # the counter is not fetched while the program waits for the next insertion
+    assert counter.fetches <= 2 * total + 1
+
+
+def test_fetch_interval_backs_off_without_progress():
+    progress = RBProgress(10, fetch_completed=lambda: None, min_fetch_interval=0.1, max_fetch_interval=0.5)
+    progress.on_inserted(10)
+    intervals = []
+    for _ in range(5):
+        progress.fetch()
+        intervals.append(progress._fetch_interval)
+    assert intervals == pytest.approx([0.2, 0.4, 0.5, 0.5, 0.5])
+    assert progress.snapshot().eta is None
+
+    progress._fetch_completed = lambda: 4
+    progress.fetch()
+    assert progress._fetch_interval == 0.1
+    snapshot = progress.snapshot()
+    assert snapshot.completed == 4 and snapshot.eta > 0
+
+
+def test_wait_stops_when_not_running():
+    progress = RBProgress(10, fetch_completed=lambda: 1, min_fetch_interval=0.01, max_fetch_interval=0.02)
+    stop = threading.Event()
+    threading.Timer(0.1, stop.set).start()
+    assert progress.wait(is_running=lambda: not stop.is_set(), show_bar=False).completed == 1
@@ -0,0 +1,57 @@
+import pytest
+
+cirq = pytest.importorskip("cirq")
+
+from qualang_tools.bakery.bakery import Baking
+from qualang_tools.characterization.two_qubit_rb import TwoQubitRb
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb import RBBaker
+
+
+def bake_phased_xz(baker: Baking, q, x, z, a):
+    element = f"q{q}_xy"
+    baker.frame_rotation_2pi(a / 2, element)
+    baker.play("x180", element, amp=x)
+    baker.frame_rotation_2pi(-(a + z) / 2, element)
+
+
+def bake_cz(baker: Baking, q1, q2):
+    baker.play("cz", "q1_z")
+    baker.align()
+    baker.frame_rotation_2pi(0.23, "q1_xy")
+    baker.align()
+
+
+def test_parallel_baking_matches_serial_baking(config):
+    interleaving_gate = [cirq.CZ(cirq.LineQubit(0), cirq.LineQubit(1))]
+    serial = TwoQubitRb(
+        config, bake_phased_xz, {"CZ": bake_cz}, lambda: None, lambda: None, interleaving_gate=interleaving_gate
+    )
+    parallel = TwoQubitRb(
+        config,
+        bake_phased_xz,
+        {"CZ": bake_cz},
+        lambda: None,
+        lambda: None,
+        interleaving_gate=interleaving_gate,
+        max_workers=2,
+    )
+
+    assert parallel._config == serial._config
+    assert parallel._rb_baker.cmd_to_op == serial._rb_baker.cmd_to_op
+    assert parallel._rb_baker._op_to_baking == serial._rb_baker._op_to_baking
+    assert parallel._rb_baker.all_elements == serial._rb_baker.all_elements
+    assert parallel._command_registry.commands == serial._command_registry.commands
+
+
+def test_waveform_identifier_collisions_are_resolved(config, monkeypatch):
+    rb = TwoQubitRb(config, bake_phased_xz, {"CZ": bake_cz}, lambda: None, lambda: None)
+    stats = rb.get_baking_dedup_stats()
+    assert set(stats) == {"q1_xy", "q2_xy", "q1_z"}
+    for qe, qe_stats in stats.items():
+        assert qe_stats["commands"] == 736
+        assert 1 < qe_stats["unique_waveforms"] == len(set(rb._rb_baker.cmd_to_op[qe].values()))
+
+    monkeypatch.setattr(RBBaker, "_unique_baker_identifier_for_qe", staticmethod(lambda qe_state: b""))
+    colliding = TwoQubitRb(config, bake_phased_xz, {"CZ": bake_cz}, lambda: None, lambda: None)
+    assert colliding._config == rb._config
+    assert colliding._rb_baker.cmd_to_op == rb._rb_baker.cmd_to_op
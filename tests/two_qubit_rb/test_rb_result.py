@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cirq")
+
+from qm import generate_qua_script
+from qm.qua import declare
+
+from qualang_tools.characterization.two_qubit_rb import IncrementalRBFit, RBResult, TwoQubitRb
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb.RBResult import count_states
+
+
+@pytest.fixture
+def state():
+    rng = np.random.default_rng(0)
+    depths = np.array([1, 5, 20, 50])
+    p00 = 0.75 * 0.97**depths + 0.25
+    probabilities = np.stack([p00, *(np.broadcast_to((1 - p00) / 3, (3, len(depths))))], axis=-1)
+    return np.stack([[rng.choice(4, size=200, p=p) for p in probabilities] for _ in range(6)])
+
+
+def test_state_counts_give_the_same_analysis(state):
+    depths = [1, 5, 20, 50]
+    counts = count_states(state)
+    assert counts.shape == (6, 4, 4)
+    assert np.all(counts.sum(axis=-1) == 200)
+    assert counts[2, 1, 3] == np.count_nonzero(state[2, 1] == 3)
+
+    raw = RBResult(depths, 6, 200, state)
+    compact = RBResult(circuit_depths=depths, num_repeats=6, num_averages=200, state_counts=counts)
+    assert np.array_equal(raw.state_counts, counts)
+    assert "state" not in compact.data
+    assert np.allclose(raw.get_decay_curve(), (state == 0).sum((0, 2)) / (6 * 200))
+    assert np.allclose(compact.get_decay_curve(), raw.get_decay_curve())
+    assert np.allclose(compact.fit_exponential(), raw.fit_exponential())
+    assert compact.fit_exponential()[1] == pytest.approx(0.97, abs=0.02)
+
+
+def test_state_or_state_counts_is_required():
+    with pytest.raises(ValueError):
+        RBResult([1, 2], 1, 10)
+
+
+def test_program_saves_state_counts(config):
+    rb = TwoQubitRb(
+        config,
+        lambda *args: None,
+        {"CZ": lambda *args: None},
+        lambda: None,
+        lambda: (declare(bool), declare(bool)),
+    )
+    script = generate_qua_script(rb._gen_qua_program([1, 2], 3, 100, False, save_state_counts=True))
+    assert 'save("state_counts")' in script
+    assert "buffer(3, 2, 4)" in script
+
+
+def test_bootstrap_fit(state):
+    result = RBResult([1, 5, 20, 50], 6, 200, state)
+    A, alpha, B = result.fit_exponential()
+    samples = result.bootstrap_fit(2000, seed=1)
+    assert samples.shape == (2000, 3)
+    assert np.all(samples[:, 2] == B)
+    assert np.median(samples[:, 1]) == pytest.approx(alpha, abs=0.005)
+    assert 0 < np.std(samples[:, 1]) < 0.01
+    assert np.array_equal(samples, result.bootstrap_fit(2000, seed=1))
+
+    # without any spread between the circuits, all the samples are the same
+    uniform = RBResult([1, 5, 20, 50], 6, 200, np.broadcast_to(state[:1], state.shape))
+    assert np.allclose(uniform.bootstrap_fit(10, seed=1), uniform.bootstrap_fit(10, seed=1)[0])
+
+
+def test_incremental_fit_matches_full_fit(state):
+    depths = [1, 5, 20, 50]
+    result = RBResult(depths, 6, 200, state)
+    counts = count_states(state)
+
+    fit = IncrementalRBFit()
+    assert fit.update(depths[0], counts[:, 0]) is None
+    assert fit.update(depths[3], counts[:, 3]) is None
+    assert fit.get_fidelity() is None
+    assert fit.update(depths[1], counts[:3, 1]) is not None
+    fit.update(depths[1], counts[3:, 1])
+    params = fit.update(depths[2], counts[:, 2])
+
+    assert np.allclose(fit.get_decay_curve()[1], result.get_decay_curve())
+    assert np.allclose(params, result.fit_exponential())
+    assert fit.get_fidelity() == pytest.approx(result.get_fidelity(params[1]))
+
+
+def test_incremental_fit_failure_keeps_previous_parameters():
+    def counts(p00):
+        return np.array([1000 * p00, 0, 0, 1000 * (1 - p00)]).round()
+
+    fit = IncrementalRBFit()
+    for depth, p00 in [(1, 0.1), (5, 0.5), (20, 0.99)]:
+        params = fit.update(depth, counts(p00))
+    # A rising curve is not a decay
+    assert params is None and fit.params is None
+    assert fit.last_fit_failed and fit.num_failed_fits == 1
+
+    fit = IncrementalRBFit()
+    for depth in [1, 5, 20]:
+        params = fit.update(depth, counts(0.75 * 0.97**depth + 0.25))
+    assert params is not None and not fit.last_fit_failed
+    assert fit.update(50, counts(1.0)) is None
+    assert fit.last_fit_failed and fit.params == params
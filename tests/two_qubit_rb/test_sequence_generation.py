@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+cirq = pytest.importorskip("cirq")
+
+from qualang_tools.characterization.two_qubit_rb import TwoQubitRb
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb import clifford_tables, gate_db
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb.sequence_generation import (
+    PADDING_GATE_ID,
+    compose_sequences,
+    generate_sequences,
+)
+
+
+def compose_sequence(sequence, interleaving_clifford=None):
+    clifford = clifford_tables.identity()
+    for gate_id in sequence:
+        if gate_id == gate_db.get_interleaving_gate():
+            gate_clifford = interleaving_clifford
+        else:
+            gate_clifford = gate_db.get_clifford_id(gate_id)
+        clifford = clifford_tables.compose(clifford, gate_clifford)
+    return clifford
+
+
+@pytest.mark.parametrize("interleaved", [False, True])
+def test_sequences_invert_to_identity(interleaved):
+    interleaving_clifford = clifford_tables.clifford_id(gate_db.get_tableau(0)) if interleaved else None
+    gates_per_clifford = 3 if interleaved else 2
+    depths = [0, 1, 7, 30]
+    sequences, lengths = generate_sequences(depths, 5, seed=1234, interleaving_clifford=interleaving_clifford)
+
+    assert sequences.shape == (20, 30 * gates_per_clifford + 2)
+    assert lengths.tolist() == [depth * gates_per_clifford + 2 for depth in depths for _ in range(5)]
+    for sequence, length in zip(sequences, lengths):
+        assert np.all(sequence[length:] == PADDING_GATE_ID)
+        assert np.all(sequence[:length] >= 0)
+        if interleaved:
+            assert np.all(sequence[2 : length - 2 : 3] == gate_db.get_interleaving_gate())
+        assert compose_sequence(sequence[:length], interleaving_clifford) == clifford_tables.identity()
+
+
+def test_sequences_are_deterministic_per_seed():
+    first, first_lengths = generate_sequences([3, 10], 4, seed=7)
+    second, second_lengths = generate_sequences([3, 10], 4, seed=np.random.default_rng(7))
+    assert np.array_equal(first, second) and np.array_equal(first_lengths, second_lengths)
+    assert not np.array_equal(first, generate_sequences([3, 10], 4, seed=8)[0])
+
+    shards = [generate_sequences([3, 10], 2, seed=s)[0] for s in np.random.SeedSequence(7).spawn(2)]
+    assert not np.array_equal(shards[0], shards[1])
+
+
+def test_two_qubit_rb_generate_sequences(config):
+    rb = TwoQubitRb(
+        config,
+        lambda *args: None,
+        {"CZ": lambda *args: None},
+        lambda: None,
+        lambda: None,
+        interleaving_gate=[cirq.CZ(*cirq.LineQubit.range(1, 3))],
+        verify_generation=True,
+    )
+    sequences, lengths = rb.generate_sequences([2, 5], 3, seed=0)
+    for sequence, length in zip(sequences, lengths):
+        sequence = sequence[:length].tolist()
+        assert compose_sequence(sequence, rb._interleaving_clifford) == clifford_tables.identity()
+        rb._verify_rb_sequence(sequence, clifford_tables.clifford_tableau(clifford_tables.identity()))
+
+
+def make_rb(config, verify_generation):
+    return TwoQubitRb(
+        config,
+        lambda *args: None,
+        {"CZ": lambda *args: None},
+        lambda: None,
+        lambda: None,
+        verify_generation=verify_generation,
+    )
+
+
+def test_tableau_verification(config, monkeypatch):
+    rb = make_rb(config, "tableau")
+    for depth in [0, 1, 50]:
+        rb._gen_rb_sequence(depth)
+
+    # a wrong inverting gate is detected without computing any unitary
+    monkeypatch.setattr(gate_db, "find_pauli_gate_id_by_tableau_alpha", lambda tableau: gate_db._pauli_range[0] + 1)
+    monkeypatch.setattr(rb, "_verify_rb_sequence", None)
+    with pytest.raises(RuntimeError, match="Verification of RB sequence failed"):
+        for _ in range(20):
+            rb._gen_rb_sequence(3)
+
+
+def test_compose_sequences_detects_invalid_sequences():
+    sequences, lengths = generate_sequences([4, 9], 10, seed=3)
+    assert np.all(compose_sequences(sequences, lengths) == clifford_tables.identity())
+    sequences[5, lengths[5] - 1] = gate_db._pauli_range[0] + (sequences[5, lengths[5] - 1] + 1 - 720) % 16
+    assert np.flatnonzero(compose_sequences(sequences, lengths) != clifford_tables.identity()).tolist() == [5]
+
+
+def test_invalid_verify_generation(config):
+    with pytest.raises(ValueError):
+        make_rb(config, "fast")
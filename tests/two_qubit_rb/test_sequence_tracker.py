@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cirq")
+
+from qualang_tools.characterization.two_qubit_rb.two_qubit_rb.verification import CommandRegistry, SequenceTracker
+
+
+@pytest.fixture
+def tracker():
+    registry = CommandRegistry()
+    commands = [
+        lambda: registry.register_phase_xz(1, 0.5, 0, 0),  # sqrt(X) on qubit 1
+        lambda: registry.register_phase_xz(2, 0.5, 0.5, 0.25),
+        lambda: (registry.register_cz(), registry.register_phase_xz(1, 1, 0, 0.5)),
+        lambda: (registry.register_cnot(1), registry.register_cnot(2), registry.register_cnot(1)),  # SWAP
+    ]
+    for command_id, register in enumerate(commands):
+        registry.set_current_command_id(command_id)
+        register()
+    registry.finish()
+    return SequenceTracker(registry)
+
+
+def test_bulk_states_match_sequential_simulation(tracker):
+    rng = np.random.default_rng(0)
+    for length in [0, 1, 5, 5, 40, 17]:
+        tracker.make_sequence(rng.integers(0, 4, size=length).tolist())
+
+    states = tracker.calculate_resultant_states()
+    assert states.shape == (6, 4, 4)
+    for state, sequence in zip(states, tracker._sequences_as_gates):
+        assert np.allclose(state, tracker.calculate_resultant_state(sequence))
+
+
+def test_failed_sequences_are_reported(tracker):
+    tracker.make_sequence([0, 0, 0, 0])  # X^2
+    tracker.make_sequence([0, 0])  # X
+    tracker.make_sequence([3, 3])
+    tracker.make_sequence([0, 3, 0])
+    assert tracker.find_failed_sequences() == [1, 3]
+    with pytest.raises(
+        AssertionError, match=r"2 of 4 sequence\(s\) failed to recover to \|00>: sequence\(s\) \[1, 3\]"
+    ):
+        tracker.verify_sequences()
@@ -1,6 +1,3 @@
-import os
-from pathlib import Path
-
 import numpy as np
 import pytest
 from qm.qua import declare
@@ -12,7 +9,7 @@ from qualang_tools.characterization.two_qubit_rb import TwoQubitRb, TwoQubitRbDe
 from qualang_tools.characterization.two_qubit_rb.two_qubit_rb.TwoQubitRBDebugger import phased_xz_command_sequences
 
 
-def test_all_verification(config):
+def test_all_verification(config, tmp_path):
     """
     Tests that a variety of random sequences are tracked, successfully verified
     by unitary-based simulation, and output to file. Tests that mapping from
@@ -53,16 +50,14 @@ def test_all_verification(config):
 
         rb._sequence_tracker.verify_sequences()
 
-        parent_dir = Path(os.path.dirname(os.path.abspath(__file__)))
-
-        rb.save_command_mapping_to_file(parent_dir / "commands.txt")
-        rb.save_sequences_to_file(parent_dir / "sequences.txt")
+        rb.save_command_mapping_to_file(tmp_path / "commands.txt")
+        rb.save_sequences_to_file(tmp_path / "sequences.txt")
         rb.print_command_mapping()
         rb.print_sequences()
         rb.verify_sequences()
 
 
-def test_debugger_bell_state_circuit(config):
+def test_debugger_bell_state_circuit(config, tmp_path):
     def bake_phased_xz(baker: Baking, q, x, z, a):
         pass
 
@@ -84,8 +79,7 @@ def test_debugger_bell_state_circuit(config):
         config, bake_phased_xz, cz_generator, prep, meas, verify_generation=False, interleaving_gate=None
     )
 
-    parent_dir = Path(os.path.dirname(os.path.abspath(__file__)))
-    rb.save_command_mapping_to_file(parent_dir / "commands.txt")
+    rb.save_command_mapping_to_file(tmp_path / "commands.txt")
 
     bell_state_circuit_string = r"(\frac{Y}{2} \otimes -\frac{Y}{2}), \text {CZ}, (I \otimes \frac{Y}{2}) \Rightarrow |\Phi^+\rangle_{Bell}"
     bell_state = (1 / np.sqrt(2)) * (
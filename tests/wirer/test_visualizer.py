@@ -3,6 +3,13 @@ import pytest
 from qualang_tools.wirer import Connectivity, lf_fem_spec, allocate_wiring, Instruments, qdac2_spec
 from qualang_tools.wirer.visualizer.web_visualizer import visualize
 
+
+@pytest.fixture(autouse=True)
+def html_output_dir(tmp_path, monkeypatch):
+    # The visualizer writes its HTML report to the working directory
+    monkeypatch.chdir(tmp_path)
+
+
 @pytest.mark.skip(reason="plotting")
 def test_6q_allocation_visualization(instruments_2lf_2mw):
     qubits = [1, 2, 3, 4, 5, 6]